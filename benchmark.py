@@ -0,0 +1,268 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+import pandas as pd
+import events
+import import_csv
+import create_visualizations
+import chart_data
+import db
+from config import DATABASE_BACKEND, IMPORT_CONFIG, QUERY_CACHE_CONFIG, SNAPSHOT_CONFIG
+from db import database_connection
+from generate_data import GENERATOR_VERSION, generate_event_data
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BENCHMARK_DATA_DIR = 'data/benchmark'
+BENCHMARK_RESULTS_DIR = 'results/benchmarks'
+
+# Every benchmarked row is imported as this event, which is deleted afterwards,
+# so the other events in the configured database are never replaced
+BENCHMARK_EVENT = '__benchmark__'
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, in MB (None if unavailable)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS and kilobytes on Linux
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+def git_commit():
+    """Short hash of the checked-out commit, with '-dirty' for uncommitted changes"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{commit}-dirty" if dirty else commit
+
+class Benchmark:
+    """Collects timed stages with row throughput and peak memory"""
+
+    def __init__(self):
+        self.stages = []
+
+    def run(self, stage, func, rows=None):
+        """
+        Time func() as one stage
+
+        Args:
+            stage (str): Stage name
+            func (callable): Work to time; its return value is passed through
+            rows (int or callable): Rows processed, or a function of the result
+                returning it (for stages that only know their row count afterwards)
+        """
+        started = time.perf_counter()
+        result = func()
+        seconds = time.perf_counter() - started
+        if callable(rows):
+            rows = rows(result)
+        self.stages.append({
+            'stage': stage,
+            'seconds': round(seconds, 4),
+            'rows': rows,
+            'rows_per_s': round(rows / seconds) if rows and seconds > 0 else None,
+            'peak_rss_mb': peak_rss_mb(),
+        })
+        return result
+
+    def print_summary(self, baseline=None):
+        """Print the stage table, with the change against a previous run if given"""
+        previous = {stage['stage']: stage for stage in (baseline or {}).get('stages', [])}
+        print(f"\n{'stage':<48} {'seconds':>9} {'rows/s':>12} {'peak MB':>9}  change")
+        for stage in self.stages:
+            rate = f"{stage['rows_per_s']:,}" if stage['rows_per_s'] else '-'
+            peak = f"{stage['peak_rss_mb']:.0f}" if stage['peak_rss_mb'] is not None else '-'
+            change = ''
+            before = previous.get(stage['stage'])
+            if before and before['seconds']:
+                change = f"{(stage['seconds'] / before['seconds'] - 1) * 100:+.0f}%"
+            print(f"{stage['stage']:<48} {stage['seconds']:9.3f} {rate:>12} {peak:>9}  {change}")
+
+def benchmark_import(bench, csv_path, method, batch_size, chunksize, compact):
+    """Time each import stage separately, then the end-to-end import; returns the rows read"""
+    chunks = bench.run('csv parse', lambda: list(import_csv.read_csv_chunks(csv_path, chunksize, compact)),
+                       rows=lambda result: sum(len(chunk) for chunk in result))
+    stats = {'read': 0, 'removed': 0, 'inserted': 0, 'checkins': 0,
+             'mode': 'replace', 'started': time.perf_counter()}
+    cleaned = bench.run('clean', lambda: list(import_csv.clean_records(
+        import_csv.filter_invalid_records(import_csv.rename_columns(chunks), stats))),
+        rows=lambda result: sum(len(chunk) for chunk in result))
+    del chunks
+
+    def assign():
+        with database_connection() as connection:
+            cursor = connection.cursor()
+            domains = import_csv.load_university_domains(cursor)
+            tagged = import_csv.tag_event(cleaned, BENCHMARK_EVENT, overwrite=True)
+            assigned = list(import_csv.assign_universities(
+                import_csv.assign_event_ids(tagged, cursor, events.load_events(cursor), set()), domains, []))
+            connection.commit()
+            cursor.close()
+        return assigned
+    assigned = bench.run('event + university lookup', assign, rows=lambda result: sum(len(chunk) for chunk in result))
+    del cleaned
+
+    def insert():
+        overrides = {'allow_local_infile': True} if method == 'load_data' else {}
+        with database_connection(**overrides) as connection:
+            cursor = connection.cursor()
+            cleared = set()
+            sql = import_csv.attendee_insert_sql('replace')
+            stats['started'] = time.perf_counter()
+            for chunk in assigned:
+                import_csv.clear_events(cursor, [int(event_id) for event_id in chunk['event_id'].unique()], cleared)
+                import_csv.insert_dataframe(connection, cursor, sql, chunk, method, batch_size, stats)
+                import_csv.insert_checkins(connection, cursor, chunk, batch_size, stats)
+            cursor.close()
+        return stats['inserted']
+    bench.run(f'insert ({method})', insert, rows=lambda inserted: inserted)
+    del assigned
+
+    # Leaves the database fully loaded (rollups included) for the chart stages
+    ok = bench.run('import (end to end)', lambda: import_csv.import_event_data(
+        csv_path, method=method, batch_size=batch_size, chunksize=chunksize, mode='replace',
+        compact=compact, event=BENCHMARK_EVENT),
+        rows=stats['read'])
+    if not ok:
+        raise RuntimeError("End-to-end import failed")
+    return stats['read']
+
+def benchmark_charts(bench, event_id):
+    """
+    Time the chart data queries, then each chart's own query + render and its render in every profile
+
+    The charts are drawn into a temporary directory, so the benchmark data never
+    replaces the real charts (whose render cache would otherwise still match).
+    """
+    data = bench.run('chart data (rollups)', lambda: chart_data.compute_chart_data(
+        create_visualizations.load_rollups(False, event_id=event_id),
+        create_visualizations.load_checkpoint_counts(False, event_id)))
+    chart_dir = create_visualizations.CHART_DIR
+    with tempfile.TemporaryDirectory(prefix='benchmark_charts_') as directory:
+        create_visualizations.CHART_DIR = directory
+        try:
+            for _, (name, key, _) in sorted(create_visualizations.CHARTS.items()):
+                chart = getattr(create_visualizations, name)
+                bench.run(f'{name} (query + render)', lambda: chart(event_id=event_id, event_name=BENCHMARK_EVENT))
+                for profile in create_visualizations.RENDER_PROFILES:
+                    bench.run(f'{name} (render, {profile})',
+                              lambda: chart(data[key].copy(), profile, event_name=BENCHMARK_EVENT))
+        finally:
+            create_visualizations.CHART_DIR = chart_dir
+
+def remove_benchmark_event():
+    """Delete the benchmark event and its rows, if a run left any"""
+    with database_connection() as connection:
+        cursor = connection.cursor()
+        event_id = events.load_events(cursor).get(BENCHMARK_EVENT)
+        if event_id is not None:
+            events.delete_event(cursor, event_id)
+            cursor.execute(db.adapt_sql("DELETE FROM events WHERE event_id = %s"), (event_id,))
+            db.bump_data_version(cursor)
+            connection.commit()
+        cursor.close()
+
+def main(rows=10000, csv_path=None, method=None, batch_size=None, chunksize=None, compact=None,
+         seed=0, charts=True, compare=None, output_dir=BENCHMARK_RESULTS_DIR):
+    """
+    Run the end-to-end benchmark and save the results as JSON
+
+    Args:
+        rows (int): Size of the generated dataset (ignored with csv_path)
+        csv_path (str): Benchmark an existing export instead of generated data
+        method, batch_size, chunksize, compact: Import settings, defaulting to IMPORT_CONFIG
+        seed (int): Random seed for the generated dataset
+        charts (bool): Also benchmark chart queries and rendering
+        compare (str): Previous results file to compare stage times against
+        output_dir (str): Directory the results JSON is written to
+
+    Returns:
+        str: Path of the results file
+    """
+    method = method or IMPORT_CONFIG['method']
+    batch_size = batch_size or IMPORT_CONFIG['batch_size']
+    if chunksize is None:
+        chunksize = IMPORT_CONFIG['chunksize']
+    if compact is None:
+        compact = IMPORT_CONFIG['compact']
+    # Measure the database, not the on-disk query cache
+    QUERY_CACHE_CONFIG['enabled'] = False
+
+    bench = Benchmark()
+    if csv_path is None:
+        csv_path = os.path.join(BENCHMARK_DATA_DIR, f'event_data_v{GENERATOR_VERSION}_{rows}_{seed}.csv')
+        if not os.path.exists(csv_path):
+            bench.run('generate', lambda: generate_event_data(rows, csv_path, seed), rows=rows)
+
+    print(f"Benchmarking against the configured {DATABASE_BACKEND} database as event '{BENCHMARK_EVENT}' "
+          f"(deleted afterwards; other events are not touched)")
+    snapshot_dir = SNAPSHOT_CONFIG['directory']
+    with tempfile.TemporaryDirectory(prefix='benchmark_snapshot_') as directory:
+        # The import's snapshot export goes here instead of replacing the real snapshot
+        SNAPSHOT_CONFIG['directory'] = os.path.join(directory, 'snapshot')
+        try:
+            rows = benchmark_import(bench, csv_path, method, batch_size, chunksize, compact)
+            if charts:
+                event_id, _ = events.current_event(BENCHMARK_EVENT)
+                benchmark_charts(bench, event_id)
+        finally:
+            SNAPSHOT_CONFIG['directory'] = snapshot_dir
+            remove_benchmark_event()
+
+    baseline = None
+    if compare:
+        with open(compare) as f:
+            baseline = json.load(f)
+    bench.print_summary(baseline)
+
+    commit = git_commit()
+    results = {
+        'commit': commit,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'csv': csv_path,
+        'rows': rows,
+        'backend': DATABASE_BACKEND,
+        'settings': {'method': method, 'batch_size': batch_size, 'chunksize': chunksize, 'compact': compact},
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'stages': bench.stages,
+    }
+    os.makedirs(output_dir, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    path = os.path.join(output_dir, f"benchmark_{stamp}_{commit or 'nogit'}.json")
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n📁 Results saved to {path}")
+    return path
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the import and chart pipeline end to end")
+    parser.add_argument('--rows', type=int, default=10000, help="generated dataset size (default 10000)")
+    parser.add_argument('--csv', help="benchmark an existing CSV export instead of generated data")
+    parser.add_argument('--seed', type=int, default=0, help="random seed for generated data (default 0)")
+    parser.add_argument('--method', choices=import_csv.INSERT_METHODS, help="insert method (default IMPORT_METHOD)")
+    parser.add_argument('--batch-size', type=int, help="rows per insert batch (default IMPORT_BATCH_SIZE)")
+    parser.add_argument('--chunksize', type=int, help="CSV rows per chunk, 0 = whole file (default IMPORT_CHUNKSIZE)")
+    parser.add_argument('--no-compact', action='store_true', help="read every CSV column as text")
+    parser.add_argument('--no-charts', action='store_true', help="skip the chart query and render stages")
+    parser.add_argument('--compare', help="previous results JSON to compare stage times against")
+    parser.add_argument('--output-dir', default=BENCHMARK_RESULTS_DIR,
+                        help=f"directory for the results JSON (default {BENCHMARK_RESULTS_DIR})")
+    args = parser.parse_args()
+    main(args.rows, args.csv, args.method, args.batch_size, args.chunksize,
+         False if args.no_compact else None, args.seed,
+         charts=not args.no_charts, compare=args.compare, output_dir=args.output_dir)
@@ -0,0 +1,355 @@
+import numpy as np
+import pandas as pd
+from config import EVENT_CONFIG, TIMELINE_CONFIG
+from rollups import ENGAGEMENT_TIERS
+import timeseries
+
+# Pre-aggregated chart inputs maintained by the importer (see rollups.py).
+# Each is a few hundred rows at most, whatever the number of attendees, and
+# reads only one event's rows (every key leads with event_id; see input_queries).
+ROLLUP_QUERIES = {
+    'daily': """
+SELECT registration_date, registrations, cumulative
+FROM rollup_daily_registrations
+WHERE event_id = {event_id}
+ORDER BY registration_date;
+""",
+    'domains': """
+SELECT r.email_domain,
+       COALESCE(d.university, 'Non-University') AS university,
+       COALESCE(d.school_type, 'General Public') AS school_type,
+       COALESCE(d.region, 'General Public') AS region,
+       r.attendees, r.total_checkins, r.venue_checkins, r.revenue
+FROM rollup_university_domains r
+LEFT JOIN university_domains d ON d.email_domain = r.email_domain
+WHERE r.event_id = {event_id};
+""",
+    'tiers': """
+SELECT engagement_level, participants, total_checkins, priced_participants, total_price
+FROM rollup_engagement_tiers
+WHERE event_id = {event_id};
+""",
+}
+
+# Inputs each chart dataset is computed from: ROLLUP_QUERIES names, plus
+# 'checkpoints' for the CHECKPOINT_QUERY counts, 'registrations' for the
+# REGISTRATIONS_QUERY times (only read for sub-day timeline buckets) and
+# 'seasons' for the SEASONS_QUERY totals of every event
+DATASET_INPUTS = {
+    'university_breakdown': ['domains'],
+    'engagement_distribution': ['tiers'],
+    'registration_timeline': ['daily'] if timeseries.whole_days(TIMELINE_CONFIG['granularity']) else ['registrations'],
+    'geographic_analysis': ['domains'],
+    'meal_analysis': ['domains', 'checkpoints'],
+    'top_schools': ['domains'],
+    'executive_metrics': ['domains'],
+    'season_comparison': ['seasons'],
+}
+
+# Check-ins per checkpoint, answered from the attendee_checkins (event_id, checkpoint) index
+CHECKPOINT_QUERY = """
+SELECT checkpoint, COUNT(*) AS attended
+FROM attendee_checkins
+WHERE event_id = {event_id}
+GROUP BY checkpoint;
+"""
+
+# Individual registration times, for timeline buckets finer than the daily rollup
+REGISTRATIONS_QUERY = """
+SELECT ticket_created_date
+FROM attendees
+WHERE event_id = {event_id} AND ticket_created_date IS NOT NULL;
+"""
+
+# Headline totals of every event, side by side and in season order: one grouped
+# query over the rollups
+SEASONS_QUERY = """
+SELECT e.name AS event, e.event_date, t.first_registration,
+       SUM(r.attendees) AS attendees, SUM(r.venue_checkins) AS venue_checkins,
+       SUM(r.total_checkins) AS total_checkins, SUM(r.revenue) AS revenue,
+       COUNT(DISTINCT COALESCE(d.university, 'Non-University')) AS universities
+FROM events e
+JOIN rollup_university_domains r ON r.event_id = e.event_id
+LEFT JOIN university_domains d ON d.email_domain = r.email_domain
+LEFT JOIN (SELECT event_id, MIN(registration_date) AS first_registration
+           FROM rollup_daily_registrations GROUP BY event_id) t ON t.event_id = e.event_id
+GROUP BY e.event_id, e.name, e.event_date, t.first_registration
+ORDER BY t.first_registration, e.event_id;
+"""
+
+def input_queries(names, event_id):
+    """SQL for each of the named chart inputs (see DATASET_INPUTS), scoped to one event"""
+    queries = {**ROLLUP_QUERIES, 'checkpoints': CHECKPOINT_QUERY, 'registrations': REGISTRATIONS_QUERY,
+               'seasons': SEASONS_QUERY}
+    return {name: query.format(event_id=int(event_id)) for name, query in queries.items() if name in names}
+
+NUMERIC_COLUMNS = ['registrations', 'cumulative', 'attendees', 'total_checkins', 'venue_checkins',
+                   'revenue', 'participants', 'priced_participants', 'total_price']
+
+def sql_round(values, decimals):
+    """Round half away from zero like MySQL's ROUND (pandas rounds half to even)"""
+    factor = 10 ** decimals
+    values = np.asarray(values, dtype=float)
+    return np.sign(values) * np.floor(np.abs(values) * factor + 0.5 + 1e-9) / factor
+
+def prepare_rollups(rollups):
+    """Normalize dtypes of the raw rollup frames (DECIMAL sums, DATE keys)"""
+    prepared = {}
+    for name, df in rollups.items():
+        df = df.copy()
+        for col in NUMERIC_COLUMNS:
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col], errors='coerce').astype(float)
+        if 'registration_date' in df.columns:
+            df['registration_date'] = pd.to_datetime(df['registration_date'], errors='coerce')
+        prepared[name] = df
+    return prepared
+
+def _group_summary(domains, key, count_name, avg_name):
+    """SUM(attendees) and the rounded check-ins per attendee for each key, largest groups first"""
+    grouped = domains.groupby(key, sort=False)[['attendees', 'total_checkins']].sum()
+    df = pd.DataFrame({
+        count_name: grouped['attendees'].astype(int),
+        avg_name: sql_round(grouped['total_checkins'] / grouped['attendees'], 2),
+    }).reset_index()
+    return df.sort_values(count_name, ascending=False, kind='stable').reset_index(drop=True)
+
+def university_breakdown(rollups):
+    """Attendees and engagement per school type (chart 1)"""
+    return _group_summary(rollups['domains'], 'school_type', 'attendees', 'avg_engagement')
+
+def engagement_distribution(rollups):
+    """Participants and average price per engagement tier (chart 2)"""
+    tiers = rollups['tiers']
+    priced = tiers['priced_participants'].where(tiers['priced_participants'] > 0)
+    df = pd.DataFrame({
+        'engagement_level': tiers['engagement_level'],
+        'participants': tiers['participants'].astype(int),
+        'avg_price': sql_round(tiers['total_price'] / priced, 2),
+        'avg_checkins': tiers['total_checkins'] / tiers['participants'],
+    })
+    df = df.sort_values('avg_checkins', ascending=False, kind='stable')
+    return df.drop(columns='avg_checkins').reset_index(drop=True)
+
+def registration_timeline(rollups, granularity=None, window=None):
+    """
+    Registrations per time bucket, cumulative and rolling average (chart 3)
+    
+    Whole-day buckets are summed from the daily rollup; finer ones need the
+    individual times ('registrations' input).
+    
+    Args:
+        granularity: Bucket size, e.g. '15min', '1h', '1d'. Defaults to TIMELINE_CONFIG.
+        window: Rolling average span. Defaults to TIMELINE_CONFIG.
+    """
+    granularity = granularity or TIMELINE_CONFIG['granularity']
+    window = window or TIMELINE_CONFIG['window']
+    if 'registrations' in rollups:
+        epochs = timeseries.to_epoch(rollups['registrations']['ticket_created_date'])
+        return timeseries.registration_curve(epochs, granularity, window)
+    daily = rollups['daily']
+    return timeseries.registration_curve(timeseries.to_epoch(daily['registration_date']), granularity, window,
+                                         weights=daily['registrations'].to_numpy())
+
+def geographic_analysis(rollups):
+    """Attendees and engagement per region (chart 4)"""
+    return _group_summary(rollups['domains'], 'region', 'attendees', 'engagement')
+
+def meal_analysis(checkpoint_counts, total, meals=None):
+    """
+    Attendance, waste and attendance rate per meal (chart 5)
+    
+    Args:
+        checkpoint_counts (DataFrame): checkpoint/attended rows from CHECKPOINT_QUERY
+        total (int): Number of registered attendees (portions planned per meal)
+        meals (list): Checkpoints to report, in order. Defaults to EVENT_CONFIG['meals'].
+    """
+    meals = meals or EVENT_CONFIG['meals']
+    counts = checkpoint_counts.set_index('checkpoint')['attended']
+    attended = counts.reindex(meals, fill_value=0).to_numpy(dtype=float)
+    return pd.DataFrame({
+        'meal': meals,
+        'attended': attended,
+        'waste': total - attended,
+        'rate': sql_round(attended * 100.0 / total, 1) if total else np.zeros(len(meals)),
+    })
+
+def top_schools(rollups, min_attendees=8, limit=12):
+    """Largest universities with engagement and revenue (chart 6)"""
+    domains = rollups['domains']
+    schools = domains[domains['university'] != 'Non-University']
+    grouped = schools.groupby('university', sort=False)[['attendees', 'total_checkins', 'revenue']].sum()
+    df = pd.DataFrame({
+        'attendees': grouped['attendees'].astype(int),
+        'engagement': sql_round(grouped['total_checkins'] / grouped['attendees'], 2),
+        'revenue': grouped['revenue'],
+    }).reset_index()
+    df = df[df['attendees'] >= min_attendees]
+    df = df.sort_values('attendees', ascending=False, kind='stable').head(limit)
+    return df.reset_index(drop=True)
+
+def total_attendees(rollups):
+    """Number of registered attendees"""
+    return int(rollups['domains']['attendees'].sum())
+
+def executive_metrics(rollups):
+    """Headline metrics for the dashboard (chart 7), as a single-row frame"""
+    domains = rollups['domains']
+    total = total_attendees(rollups)
+    attendance = domains['venue_checkins'].sum()
+    return pd.DataFrame([{
+        'total_reg': total,
+        'attendance': int(attendance),
+        'attend_rate': float(sql_round(attendance * 100.0 / total, 1)) if total else 0.0,
+        'revenue': domains['revenue'].sum(),
+        'universities': domains['university'].nunique(),
+        'avg_engagement': float(sql_round(domains['total_checkins'].sum() / total, 2)) if total else 0.0,
+    }])
+
+def season_comparison(seasons):
+    """Registrations, attendance, revenue and engagement per event, in season order (chart 8)"""
+    attendees = seasons['attendees'].to_numpy(dtype=float)
+    return pd.DataFrame({
+        'event': seasons['event'],
+        'total_reg': attendees.astype(int),
+        'attendance': seasons['venue_checkins'].astype(int),
+        'attend_rate': sql_round(seasons['venue_checkins'] * 100.0 / attendees, 1),
+        'revenue': seasons['revenue'],
+        'universities': seasons['universities'].astype(int),
+        'avg_engagement': sql_round(seasons['total_checkins'] / attendees, 2),
+    })
+
+def _snapshot_daily(snapshot, event_id):
+    """Registrations per day (the rollup_daily_registrations rows) from the snapshot"""
+    days = snapshot.column('ticket_created_date', event_id=event_id).astype('datetime64[D]')
+    days = days[~np.isnat(days)].view('int64')
+    if not len(days):
+        return pd.DataFrame(columns=['registration_date', 'registrations', 'cumulative'])
+    first = days.min()
+    counts = np.bincount(days - first)
+    present = np.flatnonzero(counts)
+    return pd.DataFrame({
+        'registration_date': (present + first).astype('datetime64[D]'),
+        'registrations': counts[present],
+        'cumulative': np.cumsum(counts[present]),
+    })
+
+def _snapshot_domains(snapshot, event_id):
+    """Per email domain sums with their groupings (the 'domains' query) from the snapshot"""
+    # Code 0 is a missing domain, stored under '' like the rollup does
+    codes = snapshot.column('email_domain', event_id=event_id).astype(np.int64) + 1
+    domains = [''] + snapshot.dictionary('email_domain')
+    size = len(domains)
+    attendees = np.bincount(codes, minlength=size)
+    present = np.flatnonzero(attendees)
+    lookup = snapshot.manifest['domains']
+    
+    def grouping(attribute, default):
+        values = [None] + lookup[attribute]
+        return [values[code] or default for code in present]
+    
+    return pd.DataFrame({
+        'email_domain': [domains[code] for code in present],
+        'university': grouping('university', 'Non-University'),
+        'school_type': grouping('school_type', 'General Public'),
+        'region': grouping('region', 'General Public'),
+        'attendees': attendees[present],
+        'total_checkins': np.bincount(codes, weights=snapshot.column('total_checkins', event_id=event_id),
+                                      minlength=size)[present],
+        'venue_checkins': np.bincount(codes, weights=snapshot.column('venue_checkin', event_id=event_id),
+                                      minlength=size)[present],
+        'revenue': np.bincount(codes, weights=np.nan_to_num(snapshot.column('price', event_id=event_id)),
+                               minlength=size)[present].round(2),
+    })
+
+def _snapshot_tiers(snapshot, event_id):
+    """Per engagement tier counts (the 'tiers' query) from the snapshot"""
+    checkins = snapshot.column('total_checkins', event_id=event_id)
+    price = snapshot.column('price', event_id=event_id)
+    tiers = np.select([checkins >= minimum for minimum, _ in ENGAGEMENT_TIERS[:-1]],
+                      range(len(ENGAGEMENT_TIERS) - 1), default=len(ENGAGEMENT_TIERS) - 1)
+    size = len(ENGAGEMENT_TIERS)
+    participants = np.bincount(tiers, minlength=size)
+    present = np.flatnonzero(participants)
+    return pd.DataFrame({
+        'engagement_level': [ENGAGEMENT_TIERS[tier][1] for tier in present],
+        'participants': participants[present],
+        'total_checkins': np.bincount(tiers, weights=checkins, minlength=size)[present],
+        'priced_participants': np.bincount(tiers, weights=~np.isnan(price), minlength=size)[present],
+        'total_price': np.bincount(tiers, weights=np.nan_to_num(price), minlength=size)[present].round(2),
+    })
+
+def _snapshot_registrations(snapshot, event_id):
+    """Registration times (REGISTRATIONS_QUERY) from the snapshot, without copying them"""
+    return pd.DataFrame({'ticket_created_date': snapshot.column('ticket_created_date', event_id=event_id)},
+                        copy=False)
+
+def _snapshot_checkpoints(snapshot, event_id):
+    """Check-ins per checkpoint (CHECKPOINT_QUERY) from the snapshot"""
+    codes = snapshot.column('checkpoint', 'attendee_checkins', event_id=event_id)
+    checkpoints = snapshot.dictionary('checkpoint', 'attendee_checkins')
+    counts = np.bincount(codes[codes >= 0], minlength=len(checkpoints))
+    present = np.flatnonzero(counts)
+    return pd.DataFrame({'checkpoint': [checkpoints[code] for code in present], 'attended': counts[present]})
+
+def _snapshot_seasons(snapshot, event_id=None):
+    """Totals of every event with data (SEASONS_QUERY) from the snapshot's event partitions"""
+    rows = []
+    for event in snapshot.events():
+        if not snapshot.rows('attendees', event['event_id']):
+            continue
+        domains = _snapshot_domains(snapshot, event['event_id'])
+        daily = _snapshot_daily(snapshot, event['event_id'])
+        rows.append({
+            'event': event['name'],
+            'event_date': event['event_date'],
+            'first_registration': daily['registration_date'].min() if len(daily) else None,
+            'attendees': domains['attendees'].sum(),
+            'venue_checkins': domains['venue_checkins'].sum(),
+            'total_checkins': domains['total_checkins'].sum(),
+            'revenue': domains['revenue'].sum(),
+            'universities': domains['university'].nunique(),
+        })
+    seasons = pd.DataFrame(rows, columns=['event', 'event_date', 'first_registration', 'attendees',
+                                          'venue_checkins', 'total_checkins', 'revenue', 'universities'])
+    return seasons.sort_values('first_registration', kind='stable', na_position='first').reset_index(drop=True)
+
+def snapshot_inputs(snapshot, names, event_id):
+    """
+    Compute chart inputs from a columnar snapshot (see snapshot.py) instead of the database
+    
+    Returns the frames input_queries(names, event_id) would, reading only the
+    event's slice of the memory-mapped columns each input needs.
+    """
+    builders = {
+        'daily': _snapshot_daily,
+        'domains': _snapshot_domains,
+        'tiers': _snapshot_tiers,
+        'checkpoints': _snapshot_checkpoints,
+        'registrations': _snapshot_registrations,
+        'seasons': _snapshot_seasons,
+    }
+    return {name: builders[name](snapshot, event_id) for name in names}
+
+def compute_chart_data(rollups, checkpoint_counts=None, datasets=None):
+    """
+    Compute chart dataframes from the rollup frames and the checkpoint counts
+    
+    Args:
+        rollups (dict): ROLLUP_QUERIES name (or 'registrations', 'seasons') -> raw result frame
+        checkpoint_counts (DataFrame): CHECKPOINT_QUERY result (needed for meal_analysis)
+        datasets (list): Datasets to compute (DATASET_INPUTS keys). Defaults to all;
+            only the inputs they list need to be present.
+    """
+    rollups = prepare_rollups(rollups)
+    builders = {
+        'university_breakdown': lambda: university_breakdown(rollups),
+        'engagement_distribution': lambda: engagement_distribution(rollups),
+        'registration_timeline': lambda: registration_timeline(rollups),
+        'geographic_analysis': lambda: geographic_analysis(rollups),
+        'meal_analysis': lambda: meal_analysis(checkpoint_counts, total_attendees(rollups)),
+        'top_schools': lambda: top_schools(rollups),
+        'executive_metrics': lambda: executive_metrics(rollups),
+        'season_comparison': lambda: season_comparison(rollups['seasons']),
+    }
+    return {name: builders[name]() for name in datasets or builders}
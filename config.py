@@ -4,6 +4,10 @@ from dotenv import load_dotenv
 # Load environment variables from .env file
 load_dotenv()
 
+# Database backend: 'mysql' (server) or 'sqlite' (embedded, no server required)
+DATABASE_BACKEND = os.getenv('DB_BACKEND', 'mysql')
+SQLITE_DATABASE = os.getenv('SQLITE_DATABASE', 'data/event_analytics.db')
+
 # Database configuration using environment variables
 DATABASE_CONFIG = {
     'host': os.getenv('DB_HOST', 'localhost'),
@@ -12,17 +16,63 @@ DATABASE_CONFIG = {
     'password': os.getenv('DB_PASSWORD', '')
 }
 
-# Chart output configuration
-CHART_OUTPUT_DIR = 'results/charts'
-CHART_DPI = 300
+# Connections kept open and shared by the import and chart scripts
+DATABASE_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+
+# On-disk cache of chart query results, invalidated when the data version changes
+QUERY_CACHE_CONFIG = {
+    'enabled': os.getenv('QUERY_CACHE', '1') != '0',
+    'directory': os.getenv('QUERY_CACHE_DIR', 'results/.cache/queries'),
+    'max_bytes': int(os.getenv('QUERY_CACHE_MAX_MB', '256')) * 1024 * 1024
+}
+
+# Stage timing and profiling: INSTRUMENT=summary|jsonl|both, PROFILE=cprofile|tracemalloc|both
+INSTRUMENTATION_CONFIG = {
+    'output': os.getenv('INSTRUMENT', ''),
+    'log_path': os.getenv('INSTRUMENT_LOG', 'results/instrumentation.jsonl'),
+    'profile': os.getenv('PROFILE', ''),
+    'profile_dir': 'results/profiles'
+}
+
+# Columnar snapshot of the attendee tables, exported after each import and
+# memory-mapped by create_visualizations.py --snapshot (SNAPSHOT=0 to skip the export)
+SNAPSHOT_CONFIG = {
+    'enabled': os.getenv('SNAPSHOT', '1') != '0',
+    'directory': os.getenv('SNAPSHOT_DIR', 'data/snapshot')
+}
+
+# Chart output configuration. CHART_PROFILE picks the default render profile:
+# 'draft' (quick low-resolution previews), 'final' (CHART_DPI PNGs) or 'vector' (SVG + PDF)
+CHART_OUTPUT_DIR = os.getenv('CHART_OUTPUT_DIR', 'results/charts')
+CHART_DPI = int(os.getenv('CHART_DPI', '300'))
+CHART_PROFILE = os.getenv('CHART_PROFILE', 'final')
+
+# Registration timeline (chart 3 and timeseries.py): bucket size and rolling
+# average span, e.g. 15min, 1h, 1d. Sub-day buckets read the registration times
+# instead of the daily rollup.
+TIMELINE_CONFIG = {
+    'granularity': os.getenv('TIMELINE_GRANULARITY', '1d'),
+    'window': os.getenv('TIMELINE_WINDOW', '7d')
+}
 
-# Event configuration (customize for your event)
+# Event configuration (customize for your event). Imported rows with a blank
+# Event column belong to event_name; charts and reports default to the event
+# with the latest registrations.
 EVENT_CONFIG = {
-    'event_name': 'Your Event 2025',
-    'event_date': '2025-01-25',  # Reference date for timing calculations
+    'event_name': os.getenv('EVENT_NAME', 'Your Event 2025'),
+    'event_date': os.getenv('EVENT_DATE', '2025-01-25'),  # Reference date for timing calculations
     'meals': [
         'Saturday Lunch',
         'Saturday Dinner', 
         'Sunday Brunch'
     ]
 }
+
+# Import configuration
+IMPORT_CONFIG = {
+    'mode': os.getenv('IMPORT_MODE', 'replace'),  # 'replace' or 'incremental'
+    'method': os.getenv('IMPORT_METHOD', 'batch'),  # 'batch', 'load_data' or 'row'
+    'batch_size': int(os.getenv('IMPORT_BATCH_SIZE', '5000')),
+    'chunksize': int(os.getenv('IMPORT_CHUNKSIZE', '0')),  # CSV rows per chunk, 0 = whole file
+    'compact': os.getenv('IMPORT_COMPACT', '1') != '0'  # Imported columns only, compact dtypes
+}
@@ -1,58 +1,182 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import mysql.connector
-import numpy as np
+import os
+import json
+import time
+import inspect
+import argparse
 import warnings
+from importlib import metadata
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 warnings.filterwarnings('ignore')
-from config import DATABASE_CONFIG
+from config import (QUERY_CACHE_CONFIG, INSTRUMENTATION_CONFIG, DATABASE_POOL_SIZE,
+                    CHART_OUTPUT_DIR, CHART_DPI, CHART_PROFILE)
+import instrumentation
+import render_cache
 
-# Non-interactive backend
-import matplotlib
-matplotlib.use('Agg')
+CHART_DIR = CHART_OUTPUT_DIR
 
-# Database connection
-from config import DATABASE_CONFIG
-config = DATABASE_CONFIG
+# Render profiles: output formats, savefig options and whether value labels and
+# insight boxes are drawn. The profile used is part of each chart's render signature.
+RENDER_PROFILES = {
+    # Quick previews: screen resolution and no tight-bbox pass (which draws the figure twice)
+    'draft': {'formats': ['png'], 'savefig': {'dpi': 72}, 'annotate': False},
+    'final': {'formats': ['png'], 'savefig': {'dpi': CHART_DPI, 'bbox_inches': 'tight'}, 'annotate': True},
+    'vector': {'formats': ['svg', 'pdf'], 'savefig': {'bbox_inches': 'tight'}, 'annotate': True},
+}
 
-def get_data(query):
-    connection = mysql.connector.connect(**config)
-    df = pd.read_sql(query, connection)
-    connection.close()
+# Files written by save_chart during the current render
+_saved_files = []
+
+# Open PdfPages while render_pdf is collecting every chart into one file
+_pdf_pages = None
+
+# pandas, matplotlib and the database driver are imported on first use, so
+# --list and single-chart refreshes don't pay for libraries they don't need
+
+def pyplot():
+    """Import matplotlib with the non-interactive backend"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+def get_data(query, use_cache=None):
+    import pandas as pd
+    import query_cache
+    from db import database_connection
+    
+    # Pooled connection, released even if the query fails
+    if use_cache is None:
+        use_cache = QUERY_CACHE_CONFIG['enabled']
+    with database_connection() as connection, \
+            instrumentation.span(instrumentation.statement_name(query), cached=use_cache) as details:
+        if use_cache:
+            df = query_cache.cached_read_sql(query, connection)
+        else:
+            df = pd.read_sql(query, connection)
+        details['rows'] = len(df)
     return df
 
-def save_chart(filename, title="Chart"):
+def fetch_concurrently(queries, use_cache=None, workers=None):
+    """
+    Run queries in parallel threads, each on its own pooled connection
+    
+    The driver waits on the server without holding the GIL, so the round-trips
+    overlap and the batch takes about as long as its slowest query. Results are
+    yielded as (name, dataframe) in completion order so callers can start on
+    the first ones while the rest are in flight.
+    
+    Args:
+        queries (dict): Name -> SQL
+        use_cache (bool): Passed to get_data
+        workers (int): Concurrent queries. Defaults to DATABASE_POOL_SIZE so
+            the connection pool is never exhausted.
+    """
+    workers = min(workers or DATABASE_POOL_SIZE, len(queries))
+    if workers <= 1:
+        for name, query in queries.items():
+            yield name, get_data(query, use_cache)
+        return
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='query') as executor:
+        futures = {executor.submit(get_data, query, use_cache): name for name, query in queries.items()}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+def load_rollups(use_cache=None, names=None, event_id=None):
+    """
+    Fetch one event's rows of the pre-aggregated rollup tables the importer
+    maintains, plus the registration times if the timeline needs them and the
+    totals of every season (or only the `names` inputs; checkpoint counts
+    come from load_checkpoint_counts). Defaults to the current event
+    (events.current_event).
+    """
+    import chart_data
+    import events
+    if event_id is None:
+        event_id, _ = events.current_event()
+    if names is None:
+        names = list(chart_data.ROLLUP_QUERIES)
+        names += [name for inputs in chart_data.DATASET_INPUTS.values() for name in inputs
+                  if name not in names and name != 'checkpoints']
+    frames = dict(fetch_concurrently(chart_data.input_queries(names, event_id), use_cache))
+    return {name: frames[name] for name in names}
+
+def chart_input(dataset, event_id=None):
+    """Query and compute one chart dataset on its own (for a chart called without data)"""
+    import chart_data
+    frames = load_rollups(names=chart_data.DATASET_INPUTS[dataset], event_id=event_id)
+    checkpoints = frames.pop('checkpoints', None)
+    return chart_data.compute_chart_data(frames, checkpoints, [dataset])[dataset]
+
+def open_current_snapshot():
+    """The exported columnar snapshot if it matches the database, else None (with a warning)"""
+    import snapshot
+    from db import database_connection
+    current = snapshot.open_snapshot()
+    if current is None:
+        print("⚠️  No snapshot found (run python snapshot.py); querying the database instead")
+        return None
+    with database_connection() as connection:
+        if not current.is_current(connection):
+            print("⚠️  Snapshot is older than the database (run python snapshot.py); querying the database instead")
+            return None
+    return current
+
+def load_checkpoint_counts(use_cache=None, event_id=None):
+    """Fetch an event's check-in counts for every checkpoint in one indexed GROUP BY (current event by default)"""
+    import chart_data
+    import events
+    if event_id is None:
+        event_id, _ = events.current_event()
+    return get_data(chart_data.input_queries(['checkpoints'], event_id)['checkpoints'], use_cache)
+
+def render_profile(profile=None):
+    """Settings of a render profile (CHART_PROFILE if not given)"""
+    return RENDER_PROFILES[profile or CHART_PROFILE]
+
+def save_chart(filename, title="Chart", profile=None):
+    """Save the current figure in the profile's formats, or as the next page of render_pdf's file"""
+    plt = pyplot()
+    settings = render_profile(profile)
     plt.tight_layout()
-    plt.savefig(f'results/charts/{filename}', dpi=300, bbox_inches='tight')
+    if _pdf_pages is not None:
+        _pdf_pages.savefig(**settings['savefig'])
+    else:
+        base = os.path.splitext(filename)[0]
+        for extension in settings['formats']:
+            path = os.path.join(CHART_DIR, f"{base}.{extension}")
+            plt.savefig(path, **settings['savefig'])
+            _saved_files.append(path)
     plt.close()
     print(f"✓ {title} saved")
 
-def chart1_university_breakdown():
+def event_title(title, event_name=None):
+    """Chart title prefixed with the event it shows (unchanged without one)"""
+    return f"{event_name}: {title}" if event_name else title
+
+# Chart registry: number -> (function name, chart_data dataset, description)
+CHARTS = {}
+
+def register_chart(number, dataset):
+    """Add a chart function to CHARTS under its number"""
+    def decorator(func):
+        CHARTS[number] = (func.__name__, dataset, (func.__doc__ or '').strip())
+        return func
+    return decorator
+
+@register_chart(1, 'university_breakdown')
+def chart1_university_breakdown(df=None, profile=None, event_id=None, event_name=None):
     """University participation analysis"""
-    query = """
-    SELECT 
-        CASE 
-            WHEN university = 'UC Davis' THEN 'UC Davis'
-            WHEN university LIKE '%uc%' OR university LIKE 'UC %' THEN 'Other UC Schools'
-            WHEN university = 'sjsu.edu' THEN 'San Jose State'
-            WHEN university LIKE '%csu%' OR university IN ('sfsu.edu', 'csus.edu') THEN 'Other CSU Schools'
-            WHEN university = 'Stanford' THEN 'Stanford'
-            WHEN university = 'Non-University' THEN 'General Public'
-            ELSE 'Other Universities'
-        END as school_type,
-        COUNT(*) as attendees,
-        ROUND(AVG(total_checkins), 2) as avg_engagement
-    FROM attendees GROUP BY school_type ORDER BY attendees DESC;
-    """
-    
-    df = get_data(query)
+    if df is None:
+        df = chart_input('university_breakdown', event_id)
+    plt = pyplot()
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 8))
     
     # Pie chart
     colors = ['#2E8B57', '#4682B4', '#DAA520', '#CD5C5C', '#9370DB', '#FF6347', '#20B2AA']
     ax1.pie(df['attendees'], labels=df['school_type'], autopct='%1.1f%%', 
            colors=colors, startangle=90)
-    ax1.set_title('University Participation (n=1,171)', fontsize=14, fontweight='bold')
+    ax1.set_title(event_title(f"University Participation (n={int(df['attendees'].sum()):,})", event_name),
+                  fontsize=14, fontweight='bold')
     
     # Engagement bars
     bars = ax2.bar(df['school_type'], df['avg_engagement'], color=colors)
@@ -60,32 +184,22 @@ def chart1_university_breakdown():
     ax2.set_ylabel('Avg Check-ins')
     ax2.tick_params(axis='x', rotation=45)
     
-    for bar in bars:
-        height = bar.get_height()
-        ax2.text(bar.get_x() + bar.get_width()/2., height + 0.05,
-                f'{height:.1f}', ha='center', va='bottom', fontweight='bold')
+    if render_profile(profile)['annotate']:
+        for bar in bars:
+            height = bar.get_height()
+            ax2.text(bar.get_x() + bar.get_width()/2., height + 0.05,
+                    f'{height:.1f}', ha='center', va='bottom', fontweight='bold')
     
-    save_chart('1_university_breakdown.png', 'University breakdown')
+    save_chart('1_university_breakdown.png', 'University breakdown', profile)
 
-def chart2_engagement_distribution():
+@register_chart(2, 'engagement_distribution')
+def chart2_engagement_distribution(df=None, profile=None, event_id=None, event_name=None):
     """Engagement tier analysis - IMPROVED VERSION"""
-    query = """
-    SELECT 
-        CASE 
-            WHEN total_checkins >= 4 THEN 'High (4+ meals)'
-            WHEN total_checkins >= 2 THEN 'Medium (2-3 meals)'
-            WHEN total_checkins = 1 THEN 'Low (1 meal)'
-            ELSE 'None (0 meals)'
-        END as engagement_level,
-        COUNT(*) as participants,
-        ROUND(AVG(price), 2) as avg_price
-    FROM attendees GROUP BY engagement_level
-    ORDER BY AVG(total_checkins) DESC;
-    """
-    
-    df = get_data(query)
+    if df is None:
+        df = chart_input('engagement_distribution', event_id)
     
     # SINGLE HORIZONTAL CHART - better aspect ratio
+    plt = pyplot()
     fig, ax = plt.subplots(1, 1, figsize=(14, 8))  # Better proportions
     fig.patch.set_facecolor('white')
     ax.set_facecolor('white')
@@ -98,25 +212,27 @@ def chart2_engagement_distribution():
                    color=colors[:len(df)], height=0.6, alpha=0.8)
     
     # Large, readable title and labels
-    ax.set_title('HackDavis 2025: Participant Engagement Distribution', 
+    ax.set_title(event_title('Participant Engagement Distribution', event_name), 
                  fontsize=18, fontweight='bold', pad=25, color='black')
     ax.set_xlabel('Number of Participants', fontsize=14, fontweight='bold', color='black')
     
     # Add data labels
+    annotate = render_profile(profile)['annotate']
     total = df['participants'].sum()
-    for i, (bar, count, price) in enumerate(zip(bars, df['participants'], df['avg_price'])):
-        width = bar.get_width()
-        percentage = count / total * 100
+    if annotate:
+        for i, (bar, count, price) in enumerate(zip(bars, df['participants'], df['avg_price'])):
+            width = bar.get_width()
+            percentage = count / total * 100
         
-        # Count inside bar (white text)
-        ax.text(width/2, bar.get_y() + bar.get_height()/2.,
-                f'{count:,}', ha='center', va='center', 
-                fontsize=14, fontweight='bold', color='white')
+            # Count inside bar (white text)
+            ax.text(width/2, bar.get_y() + bar.get_height()/2.,
+                    f'{count:,}', ha='center', va='center', 
+                    fontsize=14, fontweight='bold', color='white')
         
-        # Percentage and price outside bar (black text)
-        ax.text(width + 30, bar.get_y() + bar.get_height()/2.,
-                f'{percentage:.1f}% (Avg: ${price:.0f})', ha='left', va='center', 
-                fontsize=12, fontweight='bold', color='black')
+            # Percentage and price outside bar (black text)
+            ax.text(width + 30, bar.get_y() + bar.get_height()/2.,
+                    f'{percentage:.1f}% (Avg: ${price:.0f})', ha='left', va='center', 
+                    fontsize=12, fontweight='bold', color='black')
     
     # Style improvements
     ax.set_xlim(0, max(df['participants']) * 1.3)
@@ -136,67 +252,62 @@ def chart2_engagement_distribution():
     high_medium = df['participants'].head(2).sum()
     engagement_rate = high_medium / total * 100
     
-    ax.text(0.98, 0.02, f'Key Insight: {engagement_rate:.1f}% show medium-high engagement', 
-            transform=ax.transAxes, fontsize=11, ha='right', va='bottom',
-            bbox=dict(boxstyle="round,pad=0.4", facecolor="lightblue", alpha=0.8),
-            fontweight='bold')
+    if annotate:
+        ax.text(0.98, 0.02, f'Key Insight: {engagement_rate:.1f}% show medium-high engagement', 
+                transform=ax.transAxes, fontsize=11, ha='right', va='bottom',
+                bbox=dict(boxstyle="round,pad=0.4", facecolor="lightblue", alpha=0.8),
+                fontweight='bold')
     
-    save_chart('2_engagement_distribution.png', 'Engagement distribution')
+    save_chart('2_engagement_distribution.png', 'Engagement distribution', profile)
 
-def chart3_registration_timeline():
+@register_chart(3, 'registration_timeline')
+def chart3_registration_timeline(df=None, profile=None, event_id=None, event_name=None):
     """Registration pattern over time"""
-    query = """
-    SELECT 
-        DATE(ticket_created_date) as date,
-        COUNT(*) as daily_regs,
-        SUM(COUNT(*)) OVER (ORDER BY DATE(ticket_created_date)) as cumulative
-    FROM attendees 
-    WHERE ticket_created_date IS NOT NULL
-    GROUP BY DATE(ticket_created_date) ORDER BY date;
-    """
-    
-    df = get_data(query)
-    df['date'] = pd.to_datetime(df['date'])
+    import timeseries
+    from config import TIMELINE_CONFIG
+    if df is None:
+        df = chart_input('registration_timeline', event_id)
+    granularity = TIMELINE_CONFIG['granularity']
     
+    plt = pyplot()
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(16, 10))
     
-    # Daily registrations
-    ax1.bar(df['date'], df['daily_regs'], color='skyblue', alpha=0.7)
-    ax1.set_title('Daily Registration Pattern', fontsize=14, fontweight='bold')
-    ax1.set_ylabel('Daily Registrations')
+    # Registrations per bucket, with the rolling average over them
+    # (a filled step curve when there are too many buckets to draw as bars)
+    if len(df) <= 200:
+        width = timeseries.parse_granularity(granularity) / 86400
+        ax1.bar(df['date'], df['registrations'], width=width * 0.8, align='edge', color='skyblue', alpha=0.7)
+    else:
+        ax1.fill_between(df['date'], df['registrations'], step='post', color='skyblue', alpha=0.7)
+    if 'rolling_avg' in df and render_profile(profile)['annotate']:
+        ax1.plot(df['date'], df['rolling_avg'], color='navy', linewidth=2,
+                 label=f"{TIMELINE_CONFIG['window']} rolling average")
+        ax1.legend()
+    ax1.set_title(event_title(f'Registrations per {granularity}', event_name), fontsize=14, fontweight='bold')
+    ax1.set_ylabel('Registrations')
     
     # Cumulative
-    ax2.plot(df['date'], df['cumulative'], color='darkgreen', linewidth=3, marker='o')
+    ax2.plot(df['date'], df['cumulative'], color='darkgreen', linewidth=3, marker='o' if len(df) <= 120 else None)
     ax2.fill_between(df['date'], df['cumulative'], alpha=0.3, color='lightgreen')
     ax2.set_title('Cumulative Registration Growth', fontsize=14, fontweight='bold')
     ax2.set_ylabel('Total Registrations')
     ax2.grid(True, alpha=0.3)
     
-    save_chart('3_registration_timeline.png', 'Registration timeline')
+    save_chart('3_registration_timeline.png', 'Registration timeline', profile)
 
-def chart4_geographic_analysis():
+@register_chart(4, 'geographic_analysis')
+def chart4_geographic_analysis(df=None, profile=None, event_id=None, event_name=None):
     """Geographic distribution"""
-    query = """
-    SELECT 
-        CASE 
-            WHEN university IN ('UC Davis', 'UC Berkeley', 'sjsu.edu', 'Stanford') THEN 'Bay Area/Sac'
-            WHEN university LIKE '%uc%' OR university LIKE '%csu%' THEN 'Other California'
-            WHEN university LIKE '%.edu' THEN 'Out-of-State'
-            ELSE 'General Public'
-        END as region,
-        COUNT(*) as attendees,
-        ROUND(AVG(total_checkins), 2) as engagement
-    FROM attendees GROUP BY region ORDER BY attendees DESC;
-    """
-    
-    df = get_data(query)
+    if df is None:
+        df = chart_input('geographic_analysis', event_id)
+    plt = pyplot()
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 8))
     
     # Regional distribution
     colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4']
     ax1.pie(df['attendees'], labels=df['region'], autopct='%1.1f%%', 
            colors=colors, startangle=90)
-    ax1.set_title('Geographic Distribution', fontsize=14, fontweight='bold')
+    ax1.set_title(event_title('Geographic Distribution', event_name), fontsize=14, fontweight='bold')
     
     # Engagement by region
     bars = ax2.bar(df['region'], df['engagement'], color=colors)
@@ -204,45 +315,35 @@ def chart4_geographic_analysis():
     ax2.set_ylabel('Avg Check-ins')
     ax2.tick_params(axis='x', rotation=45)
     
-    for bar in bars:
-        height = bar.get_height()
-        ax2.text(bar.get_x() + bar.get_width()/2., height + 0.05,
-                f'{height:.2f}', ha='center', va='bottom', fontweight='bold')
+    if render_profile(profile)['annotate']:
+        for bar in bars:
+            height = bar.get_height()
+            ax2.text(bar.get_x() + bar.get_width()/2., height + 0.05,
+                    f'{height:.2f}', ha='center', va='bottom', fontweight='bold')
     
-    save_chart('4_geographic_analysis.png', 'Geographic analysis')
+    save_chart('4_geographic_analysis.png', 'Geographic analysis', profile)
 
-def chart5_meal_analysis():
+@register_chart(5, 'meal_analysis')
+def chart5_meal_analysis(df=None, profile=None, event_id=None, event_name=None):
     """Meal attendance and waste analysis"""
-    query = """
-    SELECT 
-        'Sat Lunch' as meal, SUM(saturday_lunch_checkin) as attended,
-        COUNT(*) - SUM(saturday_lunch_checkin) as waste,
-        ROUND(SUM(saturday_lunch_checkin) * 100.0 / COUNT(*), 1) as rate
-    FROM attendees
-    UNION ALL
-    SELECT 'Sat Dinner', SUM(saturday_dinner_checkin), 
-           COUNT(*) - SUM(saturday_dinner_checkin),
-           ROUND(SUM(saturday_dinner_checkin) * 100.0 / COUNT(*), 1) FROM attendees
-    UNION ALL
-    SELECT 'Sun Brunch', SUM(sunday_brunch_checkin),
-           COUNT(*) - SUM(sunday_brunch_checkin),
-           ROUND(SUM(sunday_brunch_checkin) * 100.0 / COUNT(*), 1) FROM attendees;
-    """
-    
-    df = get_data(query)
+    import numpy as np
+    if df is None:
+        df = chart_input('meal_analysis', event_id)
+    plt = pyplot()
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 8))
     
     # Attendance rates
     colors = ['#FF9999', '#66B2FF', '#99FF99']
     bars1 = ax1.bar(df['meal'], df['rate'], color=colors)
-    ax1.set_title('Meal Attendance Rates', fontsize=14, fontweight='bold')
+    ax1.set_title(event_title('Meal Attendance Rates', event_name), fontsize=14, fontweight='bold')
     ax1.set_ylabel('Attendance Rate (%)')
     ax1.set_ylim(0, 100)
     
-    for bar, rate in zip(bars1, df['rate']):
-        height = bar.get_height()
-        ax1.text(bar.get_x() + bar.get_width()/2., height + 2,
-                f'{rate}%', ha='center', va='bottom', fontweight='bold')
+    if render_profile(profile)['annotate']:
+        for bar, rate in zip(bars1, df['rate']):
+            height = bar.get_height()
+            ax1.text(bar.get_x() + bar.get_width()/2., height + 2,
+                    f'{rate}%', ha='center', va='bottom', fontweight='bold')
     
     # Waste analysis
     x = np.arange(len(df))
@@ -255,34 +356,29 @@ def chart5_meal_analysis():
     ax2.set_xticklabels(df['meal'])
     ax2.legend()
     
-    save_chart('5_meal_analysis.png', 'Meal analysis')
+    save_chart('5_meal_analysis.png', 'Meal analysis', profile)
 
-def chart6_top_schools():
+@register_chart(6, 'top_schools')
+def chart6_top_schools(df=None, profile=None, event_id=None, event_name=None):
     """Top performing schools"""
-    query = """
-    SELECT university, COUNT(*) as attendees, 
-           ROUND(AVG(total_checkins), 2) as engagement,
-           SUM(price) as revenue
-    FROM attendees 
-    WHERE university != 'Non-University'
-    GROUP BY university HAVING attendees >= 8
-    ORDER BY attendees DESC LIMIT 12;
-    """
-    
-    df = get_data(query)
-    df['short_name'] = df['university'].str.replace('.edu', '').str.replace('csu', 'CSU').str.title()
+    if df is None:
+        df = chart_input('top_schools', event_id)
+    df = df.assign(short_name=df['university'].str.replace('.edu', '').str.replace('csu', 'CSU').str.title())
     
+    plt = pyplot()
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(18, 8))
     
     # Top schools by attendance
     bars1 = ax1.barh(df['short_name'], df['attendees'], color='lightblue')
-    ax1.set_title('Top Schools by Attendance', fontsize=14, fontweight='bold')
+    ax1.set_title(event_title('Top Schools by Attendance', event_name), fontsize=14, fontweight='bold')
     ax1.set_xlabel('Number of Attendees')
     
-    for i, bar in enumerate(bars1):
-        width = bar.get_width()
-        ax1.text(width + 2, bar.get_y() + bar.get_height()/2.,
-                f'{int(width)}', ha='left', va='center', fontweight='bold')
+    annotate = render_profile(profile)['annotate']
+    if annotate:
+        for i, bar in enumerate(bars1):
+            width = bar.get_width()
+            ax1.text(width + 2, bar.get_y() + bar.get_height()/2.,
+                    f'{int(width)}', ha='left', va='center', fontweight='bold')
     
     # Performance matrix
     ax2.scatter(df['attendees'], df['engagement'], s=df['revenue']/20, 
@@ -292,26 +388,23 @@ def chart6_top_schools():
     ax2.set_ylabel('Avg Engagement')
     ax2.grid(True, alpha=0.3)
     
-    for i, name in enumerate(df['short_name']):
-        ax2.annotate(name[:8], (df['attendees'].iloc[i], df['engagement'].iloc[i]),
-                    xytext=(5, 5), textcoords='offset points', fontsize=9)
+    if annotate:
+        for i, name in enumerate(df['short_name']):
+            ax2.annotate(name[:8], (df['attendees'].iloc[i], df['engagement'].iloc[i]),
+                        xytext=(5, 5), textcoords='offset points', fontsize=9)
     
-    save_chart('6_top_schools.png', 'Top schools analysis')
+    save_chart('6_top_schools.png', 'Top schools analysis', profile)
 
-def chart7_executive_dashboard():
+@register_chart(7, 'executive_metrics')
+def chart7_executive_dashboard(df=None, profile=None, event_id=None, event_name=None):
     """Key metrics dashboard"""
-    query = """
-    SELECT COUNT(*) as total_reg, SUM(venue_checkin) as attendance,
-           ROUND(SUM(venue_checkin) * 100.0 / COUNT(*), 1) as attend_rate,
-           SUM(price) as revenue, COUNT(DISTINCT university) as universities,
-           ROUND(AVG(total_checkins), 2) as avg_engagement
-    FROM attendees;
-    """
-    
-    metrics = get_data(query).iloc[0]
+    if df is None:
+        df = chart_input('executive_metrics', event_id)
+    metrics = df.iloc[0]
     
+    plt = pyplot()
     fig, axes = plt.subplots(2, 3, figsize=(18, 12))
-    fig.suptitle('HackDavis 2025 Executive Dashboard', fontsize=20, fontweight='bold')
+    fig.suptitle(event_title('Executive Dashboard', event_name), fontsize=20, fontweight='bold')
     
     # Flatten axes for easier indexing
     axes = axes.flatten()
@@ -339,25 +432,278 @@ def chart7_executive_dashboard():
         ax.text(0.5, 0.15, label, ha='center', va='center', 
                fontsize=12, fontweight='bold')
     
-    save_chart('7_executive_dashboard.png', 'Executive dashboard')
+    save_chart('7_executive_dashboard.png', 'Executive dashboard', profile)
 
-def main():
-    print("🎨 Creating HackDavis Analytics - All 7 Charts")
-    print("=" * 50)
+@register_chart(8, 'season_comparison')
+def chart8_season_comparison(df=None, profile=None, event_id=None, event_name=None):
+    """Season-over-season comparison of every imported event"""
+    import numpy as np
+    if df is None:
+        df = chart_input('season_comparison', event_id)
+    plt = pyplot()
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(18, 8))
+    
+    # Registrations vs attendance per season
+    x = np.arange(len(df))
+    width = 0.35
+    ax1.bar(x - width/2, df['total_reg'], width, label='Registrations', color='#4682B4')
+    bars = ax1.bar(x + width/2, df['attendance'], width, label='Attendance', color='#2E8B57')
+    ax1.set_title('Registrations and Attendance by Season', fontsize=14, fontweight='bold')
+    ax1.set_ylabel('Participants')
+    ax1.set_xticks(x)
+    ax1.set_xticklabels(df['event'], rotation=30, ha='right')
+    ax1.legend()
+    
+    # Attendance rate and engagement trend
+    ax2.plot(df['event'], df['attend_rate'], color='#DAA520', linewidth=3, marker='o', label='Attendance rate (%)')
+    ax2.set_title('Attendance Rate and Engagement by Season', fontsize=14, fontweight='bold')
+    ax2.set_ylabel('Attendance Rate (%)')
+    ax2.set_ylim(0, 100)
+    ax2.tick_params(axis='x', rotation=30)
+    engagement = ax2.twinx()
+    engagement.plot(df['event'], df['avg_engagement'], color='#CD5C5C', linewidth=3, marker='s',
+                    label='Avg check-ins')
+    engagement.set_ylabel('Avg Check-ins')
+    engagement.set_ylim(0, max(df['avg_engagement'].max() * 1.3, 1))
+    lines = ax2.get_lines() + engagement.get_lines()
+    ax2.legend(lines, [line.get_label() for line in lines], loc='lower right')
+    
+    if render_profile(profile)['annotate']:
+        for bar, rate in zip(bars, df['attend_rate']):
+            ax1.text(bar.get_x() + bar.get_width()/2., bar.get_height(),
+                    f'{rate}%', ha='center', va='bottom', fontweight='bold')
+        for i, revenue in enumerate(df['revenue']):
+            ax2.annotate(f'${revenue:,.0f}', (i, df['attend_rate'].iloc[i]),
+                        xytext=(0, 10), textcoords='offset points', ha='center', fontsize=10)
+    
+    save_chart('8_season_comparison.png', 'Season comparison', profile)
+
+def chart_signature(name, df, profile=None, event_name=None):
+    """Render cache key: the chart's data, its function's source, the render profile and the event named in titles"""
+    return render_cache.signature(
+        df,
+        event_name,
+        inspect.getsource(globals()[name]),
+        inspect.getsource(save_chart),
+        json.dumps(render_profile(profile), sort_keys=True),
+        metadata.version('matplotlib'),
+    )
+
+def render_chart(name, df, key=None, profile=None, event_name=None):
+    """
+    Render one chart, isolating failures
     
-    import os
-    os.makedirs('results/charts', exist_ok=True)
+    Runs in worker processes (matplotlib is not thread-safe), so it is a
+    module-level function taking the chart name rather than the function.
+    With a render cache `key`, the files written are recorded against it.
     
-    chart1_university_breakdown()
-    chart2_engagement_distribution()
-    chart3_registration_timeline()
-    chart4_geographic_analysis()
-    chart5_meal_analysis()
-    chart6_top_schools()
-    chart7_executive_dashboard()
+    Returns:
+        tuple: (chart name, wall time in seconds, error message or None)
+    """
+    started = time.perf_counter()
+    _saved_files.clear()
+    try:
+        globals()[name](df, profile, event_name=event_name)
+        error = None
+        if key:
+            render_cache.store(name, key, list(_saved_files), CHART_DIR)
+    except Exception as e:
+        pyplot().close('all')
+        render_cache.invalidate(name, CHART_DIR)
+        error = f"{type(e).__name__}: {e}"
+    return name, time.perf_counter() - started, error
+
+def render_pdf(path, charts, profile=None, event_name=None):
+    """
+    Render charts as the pages of one PDF, in order
+    
+    Args:
+        path (str): PDF file to write
+        charts (list): (chart name, dataframe) pairs
+        profile (str): Render profile (resolution and annotations)
+        event_name (str): Event named in the chart titles
+    
+    Returns:
+        list: render_chart results
+    """
+    global _pdf_pages
+    pyplot()
+    from matplotlib.backends.backend_pdf import PdfPages
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with PdfPages(path) as pages:
+        _pdf_pages = pages
+        try:
+            return [render_chart(name, df, profile=profile, event_name=event_name) for name, df in charts]
+        finally:
+            _pdf_pages = None
+
+def print_render_summary(results, total_seconds, cached=(), profile=None):
+    """Print per-chart wall time and any failures"""
+    print(f"\n⏱  Render times ({profile or CHART_PROFILE} profile)")
+    for name, seconds, error in results:
+        status = "failed" if error else "unchanged, skipped" if name in cached else "ok"
+        print(f"  {name:<32} {seconds:6.2f}s  {status}")
+        if error:
+            print(f"    {error}")
+    print(f"  {'total (wall)':<32} {total_seconds:6.2f}s")
+
+def list_charts():
+    """Print the chart registry"""
+    for number, (name, dataset, description) in sorted(CHARTS.items()):
+        print(f"  {number}  {name:<32} {description}")
+
+def parse_chart_numbers(value):
+    """Parse a --charts value like '3,5' into registered chart numbers"""
+    try:
+        numbers = [int(part) for part in value.split(',') if part.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated chart numbers, got '{value}'")
+    unknown = [number for number in numbers if number not in CHARTS]
+    if unknown or not numbers:
+        raise argparse.ArgumentTypeError(
+            f"unknown chart {', '.join(map(str, unknown)) or value!r} (see --list)")
+    return numbers
+
+@instrumentation.run('charts')
+def main(jobs=1, use_cache=None, charts=None, force=False, snapshot=False, profile=None, pdf=None, event=None):
+    """
+    Render the selected charts for one event
+    
+    Args:
+        jobs (int): Charts rendered in parallel worker processes; 1 renders
+            sequentially in this process, 0 uses one worker per CPU.
+        use_cache (bool): Read query results from the on-disk cache when the
+            data hasn't changed. Defaults to QUERY_CACHE_CONFIG['enabled'].
+        charts (list): Chart numbers from CHARTS to render. Defaults to all.
+        force (bool): Re-render charts whose data, code and settings are
+            unchanged since their last render (skipped by default).
+        snapshot (bool): Compute the chart inputs from the memory-mapped
+            snapshot (see snapshot.py) when it is current, instead of querying.
+        profile (str): Render profile from RENDER_PROFILES. Defaults to CHART_PROFILE.
+        pdf (str): Render the charts as the pages of this one PDF instead of
+            separate files (always redrawn, in chart order, in this process).
+        event (str): Event to chart. Defaults to the event with the latest registrations;
+            the season comparison chart always covers every event.
+    
+    Raises:
+        ValueError: If the event is unknown or nothing has been imported
+    """
+    profile = profile or CHART_PROFILE
+    import chart_data
+    import events
+    event_id, event_name = events.current_event(event)
+    charts = sorted(charts or CHARTS)
+    selected = [CHARTS[number] for number in charts]
+    print(f"🎨 Creating {event_name} Analytics - {len(charts)} of {len(CHARTS)} Charts")
+    print("=" * 50)
     
-    print("\n🎉 All 7 charts completed!")
-    print("📁 Saved in: results/charts/")
+    os.makedirs(CHART_DIR, exist_ok=True)
+    
+    # Every chart is computed from the event's rows of the small rollup tables,
+    # not the attendees table (except sub-day timelines, which read the event's
+    # registration times); only the inputs of the selected charts are queried, all at once
+    datasets = [dataset for _, dataset, _ in selected]
+    inputs = {name for dataset in datasets for name in chart_data.DATASET_INPUTS[dataset]}
+    queries = chart_data.input_queries(inputs, event_id)
+    
+    started = time.perf_counter()
+    jobs = jobs or os.cpu_count() or 1
+    pool = None
+    if jobs > 1 and len(selected) > 1 and not pdf:
+        pool = ProcessPoolExecutor(max_workers=min(jobs, len(selected)))
+        # Start the workers before any query thread exists: under fork they are
+        # otherwise forked at the first submit, and a child forked while a query
+        # thread holds a driver, pool or import lock inherits it held forever
+        pool.submit(os.getpid).result()
+    frames, waiting, cached, rendered, pages = {}, list(selected), set(), [], {}
+    
+    def dispatch(name, dataset):
+        """Compute one chart's data and render it, unless its last render is current"""
+        rollup_frames = {key: frame for key, frame in frames.items() if key != 'checkpoints'}
+        with instrumentation.span('chart data'):
+            df = chart_data.compute_chart_data(rollup_frames, frames.get('checkpoints'), [dataset])[dataset]
+        if pdf:
+            pages[name] = df
+            return
+        key = chart_signature(name, df, profile, event_name)
+        if not force and render_cache.is_current(name, key, CHART_DIR):
+            cached.add(name)
+        elif pool:
+            rendered.append(pool.submit(render_chart, name, df, key, profile, event_name))
+        else:
+            rendered.append(render_chart(name, df, key, profile, event_name))
+    
+    # Each chart is drawn as soon as its inputs arrive, while the remaining
+    # queries are still running
+    source = open_current_snapshot() if snapshot else None
+    if source:
+        with instrumentation.span('snapshot inputs'):
+            inputs = chart_data.snapshot_inputs(source, queries, event_id).items()
+    else:
+        inputs = fetch_concurrently(queries, use_cache)
+    try:
+        for input_name, frame in inputs:
+            frames[input_name] = frame
+            for chart in [chart for chart in waiting
+                          if all(name in frames for name in chart_data.DATASET_INPUTS[chart[1]])]:
+                waiting.remove(chart)
+                dispatch(chart[0], chart[1])
+        if pool:
+            rendered = [future.result() for future in rendered]
+        if pdf:
+            rendered = render_pdf(pdf, [(name, pages[name]) for name, _, _ in selected], profile, event_name)
+    finally:
+        if pool:
+            pool.shutdown()
+    rendered = {result[0]: result for result in rendered}
+    results = [rendered.get(name, (name, 0.0, None)) for name, _, _ in selected]
+    print_render_summary(results, time.perf_counter() - started, cached, profile)
+    for name, seconds, error in results:
+        instrumentation.record(f'render {name}', seconds, error=error, cached=name in cached, profile=profile)
+    
+    failed = [name for name, _, error in results if error]
+    if failed:
+        print(f"\n⚠️  {len(selected) - len(failed)} of {len(selected)} charts completed ({len(failed)} failed)")
+    else:
+        print(f"\n🎉 {'All' if len(selected) == len(CHARTS) else len(selected)} charts completed!")
+    if cached:
+        print(f"♻️  {len(cached)} unchanged charts skipped (use --force to redraw)")
+    print(f"📁 Saved in: {pdf or CHART_DIR + '/'}")
+    return not failed
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Create event analytics charts")
+    parser.add_argument('--charts', type=parse_chart_numbers, metavar='N[,N...]',
+                        help="render only these charts, e.g. --charts 3,5 (default all)")
+    parser.add_argument('--list', action='store_true', help="list the available charts and exit")
+    parser.add_argument('--jobs', type=int, default=1,
+                        help="render charts in N worker processes (0 = one per CPU, default 1)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="bypass the query result cache")
+    parser.add_argument('--snapshot', action='store_true',
+                        help="read the memory-mapped snapshot instead of querying the database")
+    parser.add_argument('--render-profile', choices=sorted(RENDER_PROFILES),
+                        help=f"draft (fast previews), final (print-quality PNG) or vector (SVG + PDF); "
+                             f"default {CHART_PROFILE}")
+    parser.add_argument('--pdf', metavar='PATH',
+                        help="render the charts as the pages of one PDF instead of separate files")
+    parser.add_argument('--event', help="event to chart (default: the event with the latest registrations)")
+    parser.add_argument('--force', action='store_true',
+                        help="redraw charts even if their data and code are unchanged")
+    parser.add_argument('--instrument', choices=['summary', 'jsonl', 'both'],
+                        help="report per-stage and per-query timings (default INSTRUMENT)")
+    parser.add_argument('--profile', choices=['cprofile', 'tracemalloc', 'both'],
+                        help="profile the run (default PROFILE)")
+    args = parser.parse_args()
+    if args.list:
+        list_charts()
+        raise SystemExit(0)
+    if args.instrument:
+        INSTRUMENTATION_CONFIG['output'] = args.instrument
+    if args.profile:
+        INSTRUMENTATION_CONFIG['profile'] = args.profile
+    try:
+        main(jobs=args.jobs, use_cache=False if args.no_cache else None, charts=args.charts, force=args.force,
+             snapshot=args.snapshot, profile=args.render_profile, pdf=args.pdf, event=args.event)
+    except ValueError as e:
+        parser.error(str(e))
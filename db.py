@@ -0,0 +1,185 @@
+import os
+import re
+import sqlite3
+import threading
+from datetime import date
+from contextlib import contextmanager
+from config import DATABASE_BACKEND, DATABASE_CONFIG, DATABASE_POOL_SIZE, SQLITE_DATABASE
+
+BACKENDS = ('mysql', 'sqlite')
+
+SQLITE_SCHEMA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sql', 'sqlite', '01_schema.sql')
+
+# Errors raised by the database drivers; the MySQL driver is only imported
+# (and only needs to be installed) when it is the configured backend
+if DATABASE_BACKEND == 'mysql':
+    import mysql.connector
+    from mysql.connector import pooling
+    DatabaseError = (mysql.connector.Error, sqlite3.Error)
+else:
+    DatabaseError = (sqlite3.Error,)
+
+# Lazily created pool, rebuilt if we find ourselves in a forked child process.
+# The lock stops concurrent chart queries from each creating a pool.
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    """Return the shared MySQL connection pool, creating it on first use"""
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = pooling.MySQLConnectionPool(
+                pool_name=f"event_analytics_{os.getpid()}",
+                pool_size=DATABASE_POOL_SIZE,
+                pool_reset_session=True,
+                **DATABASE_CONFIG
+            )
+            _pool_pid = os.getpid()
+    return _pool
+
+def _substring_index(value, delimiter, count):
+    """Python implementation of MySQL's SUBSTRING_INDEX for SQLite"""
+    if value is None or delimiter is None or count is None:
+        return None
+    parts = str(value).split(delimiter)
+    if count >= 0:
+        return delimiter.join(parts[:count])
+    return delimiter.join(parts[count:])
+
+def _to_date(value):
+    """Date part of a stored DATE/DATETIME text value (None if unparseable)"""
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+def _datediff(end, start):
+    """MySQL's DATEDIFF for SQLite: whole days from start to end"""
+    end, start = _to_date(end), _to_date(start)
+    if end is None or start is None:
+        return None
+    return (end - start).days
+
+def _dayname(value):
+    """MySQL's DAYNAME for SQLite ('Saturday')"""
+    day = _to_date(value)
+    return day.strftime('%A') if day else None
+
+def _concat(*values):
+    """MySQL's CONCAT for SQLite: NULL if any argument is NULL"""
+    if any(value is None for value in values):
+        return None
+    return ''.join(str(value) for value in values)
+
+def connect_sqlite(path=None):
+    """Open the embedded database, creating the schema on first use"""
+    path = path or SQLITE_DATABASE
+    if path != ':memory:' and os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    connection = sqlite3.connect(path)
+    # MySQL functions used by the import and report queries
+    connection.create_function('SUBSTRING_INDEX', 3, _substring_index, deterministic=True)
+    connection.create_function('DATEDIFF', 2, _datediff, deterministic=True)
+    connection.create_function('DAYNAME', 1, _dayname, deterministic=True)
+    if sqlite3.sqlite_version_info < (3, 44):
+        connection.create_function('CONCAT', -1, _concat, deterministic=True)
+    
+    exists = connection.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'attendees'"
+    ).fetchone()
+    if not exists:
+        with open(SQLITE_SCHEMA, encoding='utf-8') as f:
+            connection.executescript(f.read())
+    return connection
+
+def get_connection(**overrides):
+    """
+    Get a database connection for the configured backend
+    
+    For MySQL without overrides the connection is borrowed from the pool and
+    calling close() returns it. Options the pool doesn't share (e.g.
+    allow_local_infile) get a dedicated connection instead. SQLite connections
+    are opened directly since they are in-process and cheap.
+    """
+    if DATABASE_BACKEND == 'sqlite':
+        return connect_sqlite()
+    if overrides:
+        return mysql.connector.connect(**DATABASE_CONFIG, **overrides)
+    return get_pool().get_connection()
+
+@contextmanager
+def database_connection(**overrides):
+    """Yield a connection and always release it, rolling back on errors"""
+    connection = get_connection(**overrides)
+    try:
+        yield connection
+    except Exception:
+        try:
+            connection.rollback()
+        except DatabaseError:
+            pass
+        raise
+    finally:
+        connection.close()
+
+def adapt_sql(sql):
+    """
+    Translate a MySQL-style parameterized statement for the configured backend
+    
+    Statements are written with %s placeholders (and %% for literal percent
+    signs), as mysql.connector expects; SQLite uses ? placeholders and spells
+    INSERT IGNORE as INSERT OR IGNORE.
+    """
+    if DATABASE_BACKEND == 'sqlite':
+        sql = re.sub(r'^(\s*)INSERT\s+IGNORE\b', r'\1INSERT OR IGNORE', sql, flags=re.IGNORECASE)
+        return re.sub(r'%([%s])', lambda m: '%' if m.group(1) == '%' else '?', sql)
+    return sql
+
+def truncate_sql(table, transactional=False):
+    """
+    Statement that empties a table
+    
+    MySQL's TRUNCATE commits implicitly; pass transactional=True when the
+    emptying must roll back with the rest of the transaction.
+    """
+    if DATABASE_BACKEND == 'sqlite' or transactional:
+        return f"DELETE FROM {table}"
+    return f"TRUNCATE TABLE {table}"
+
+def bump_data_version(cursor):
+    """
+    Record that the data changed
+
+    Call it before committing any write to the attendee, check-in, rollup or
+    lookup tables, so the new version becomes visible together with the data.
+    """
+    cursor.execute("UPDATE data_version SET version = version + 1 WHERE id = 1")
+
+def data_version(cursor):
+    """Current data version as 'database_id:version' (a primary key read, however large the tables are)"""
+    cursor.execute("SELECT database_id, version FROM data_version WHERE id = 1")
+    database_id, version = cursor.fetchone()
+    return f"{database_id}:{version}"
+
+def _key_columns(key):
+    return [key] if isinstance(key, str) else list(key)
+
+def upsert_clause(columns, key):
+    """Clause appended to an INSERT to update existing rows on a key (column or columns) conflict"""
+    keys = _key_columns(key)
+    if DATABASE_BACKEND == 'sqlite':
+        updates = ', '.join(f"{col} = excluded.{col}" for col in columns if col not in keys)
+        return f" ON CONFLICT({', '.join(keys)}) DO UPDATE SET {updates}"
+    updates = ', '.join(f"{col} = VALUES({col})" for col in columns if col not in keys)
+    return f" ON DUPLICATE KEY UPDATE {updates}"
+
+def accumulate_clause(columns, key):
+    """Clause appended to an INSERT to add the new values to an existing row's counters"""
+    keys = _key_columns(key)
+    if DATABASE_BACKEND == 'sqlite':
+        updates = ', '.join(f"{col} = {col} + excluded.{col}" for col in columns if col not in keys)
+        return f" ON CONFLICT({', '.join(keys)}) DO UPDATE SET {updates}"
+    updates = ', '.join(f"{col} = {col} + VALUES({col})" for col in columns if col not in keys)
+    return f" ON DUPLICATE KEY UPDATE {updates}"
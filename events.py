@@ -0,0 +1,150 @@
+import argparse
+from datetime import datetime
+import db
+import rollups
+from config import EVENT_CONFIG
+from db import database_connection
+
+def load_events(cursor):
+    """Return the event name -> event_id lookup"""
+    cursor.execute("SELECT name, event_id FROM events")
+    return dict(cursor.fetchall())
+
+def check_date(value):
+    """Normalize an event date to YYYY-MM-DD; raises ValueError for anything else"""
+    try:
+        return datetime.strptime(str(value).strip(), '%Y-%m-%d').strftime('%Y-%m-%d')
+    except ValueError:
+        raise ValueError(f"Invalid event date '{value}' (expected YYYY-MM-DD)") from None
+
+def register_events(cursor, names, event_ids, event_date=None):
+    """
+    Add events missing from the lookup to the events table (and to event_ids)
+
+    New events are stored with event_date, or failing that the configured
+    event (EVENT_CONFIG['event_name']) with EVENT_CONFIG['event_date'].
+    Events left without a date are reported, as the registration timing
+    reports leave them out until one is set with set_date().
+
+    Returns:
+        list: Names of the events added
+    """
+    new = [name for name in dict.fromkeys(names) if name not in event_ids]
+    if not new:
+        return []
+    event_date = check_date(event_date) if event_date else None
+    dates = {name: event_date or (EVENT_CONFIG['event_date'] if name == EVENT_CONFIG['event_name'] else None)
+             for name in new}
+    cursor.executemany(db.adapt_sql("INSERT INTO events (name, event_date) VALUES (%s, %s)"), list(dates.items()))
+    event_ids.update(load_events(cursor))
+    for name, date in dates.items():
+        if date is None:
+            print(f"⚠️  Event '{name}' has no event date, so the registration timing reports leave it out. "
+                  f"Set it with: python events.py --set-date '{name}' YYYY-MM-DD")
+    return new
+
+def set_date(cursor, event_id, event_date):
+    """Set an event's date (YYYY-MM-DD), which the registration timing reports count days to"""
+    cursor.execute(db.adapt_sql("UPDATE events SET event_date = %s WHERE event_id = %s"),
+                   (check_date(event_date), event_id))
+    db.bump_data_version(cursor)
+
+def resolve_event(cursor, name=None):
+    """
+    The named event, or by default the current one: the event with the most
+    recent registrations (so backfilling an older season doesn't change it)
+
+    Returns:
+        tuple: (event_id, name)
+
+    Raises:
+        ValueError: If the event is unknown or nothing has been imported
+    """
+    if name is None:
+        cursor.execute("SELECT e.event_id, e.name FROM events e "
+                       "JOIN rollup_daily_registrations r ON r.event_id = e.event_id "
+                       "GROUP BY e.event_id, e.name "
+                       "ORDER BY MAX(r.registration_date) DESC, e.event_id DESC LIMIT 1")
+    else:
+        cursor.execute(db.adapt_sql("SELECT event_id, name FROM events WHERE name = %s"), (name,))
+    row = cursor.fetchone()
+    if row is None:
+        raise ValueError(f"Unknown event '{name}'" if name else "No event has been imported yet")
+    return int(row[0]), row[1]
+
+def current_event(name=None):
+    """resolve_event on a pooled connection"""
+    with database_connection() as connection:
+        cursor = connection.cursor()
+        try:
+            return resolve_event(cursor, name)
+        finally:
+            cursor.close()
+
+def delete_event(cursor, event_id):
+    """
+    Delete an event's attendees, check-ins and rollup rows (the event itself is kept)
+
+    Every statement is an indexed range delete on the leading event_id key,
+    so other events are not touched.
+
+    Returns:
+        int: Attendee rows deleted
+    """
+    cursor.execute(db.adapt_sql("DELETE FROM attendee_checkins WHERE event_id = %s"), (event_id,))
+    rollups.clear(cursor, event_id=event_id)
+    cursor.execute(db.adapt_sql("DELETE FROM attendees WHERE event_id = %s"), (event_id,))
+    return cursor.rowcount
+
+def list_events(cursor):
+    """(event_id, name, event_date, attendees, revenue) per event, in one grouped query over the rollup"""
+    cursor.execute("""
+        SELECT e.event_id, e.name, e.event_date,
+               COALESCE(SUM(r.attendees), 0), COALESCE(SUM(r.revenue), 0)
+        FROM events e
+        LEFT JOIN rollup_university_domains r ON r.event_id = e.event_id
+        GROUP BY e.event_id, e.name, e.event_date
+        ORDER BY e.event_id
+    """)
+    return cursor.fetchall()
+
+def print_events(cursor):
+    """Print the events in the database with their attendee counts"""
+    rows = list_events(cursor)
+    if not rows:
+        print("No events imported yet")
+        return
+    print(f"{'id':>4}  {'event':<32} {'date':<10} {'attendees':>10} {'revenue':>12}")
+    for event_id, name, event_date, attendees, revenue in rows:
+        print(f"{event_id:>4}  {name[:32]:<32} {str(event_date or '-'):<10} {int(attendees):>10,} ${float(revenue):>11,.0f}")
+    if any(event_date is None for _, _, event_date, _, _ in rows):
+        print("Events without a date are left out of the registration timing reports "
+              "(python events.py --set-date NAME YYYY-MM-DD)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="List the imported events, set an event's date or delete one event's data")
+    parser.add_argument('--set-date', nargs=2, metavar=('NAME', 'DATE'),
+                        help="set an event's date (YYYY-MM-DD), used by the registration timing reports")
+    parser.add_argument('--delete', metavar='NAME', help="delete this event's attendees, check-ins and rollups")
+    args = parser.parse_args()
+    with database_connection() as connection:
+        cursor = connection.cursor()
+        if args.set_date:
+            try:
+                event_id, name = resolve_event(cursor, args.set_date[0])
+                set_date(cursor, event_id, args.set_date[1])
+            except ValueError as e:
+                parser.error(str(e))
+            connection.commit()
+            print(f"Set the date of event '{name}' to {check_date(args.set_date[1])}")
+        if args.delete:
+            try:
+                event_id, name = resolve_event(cursor, args.delete)
+            except ValueError as e:
+                parser.error(str(e))
+            removed = delete_event(cursor, event_id)
+            db.bump_data_version(cursor)
+            connection.commit()
+            print(f"Deleted {removed} records of event '{name}'")
+        print_events(cursor)
+        cursor.close()
@@ -0,0 +1,189 @@
+import argparse
+import os
+import time
+import numpy as np
+import pandas as pd
+from import_csv import COLUMN_MAPPING
+
+DEFAULT_OUTPUT = 'data/sample/sample_event_data.csv'
+
+# Bumped when the generated data changes, so cached benchmark files are regenerated
+GENERATOR_VERSION = 2
+
+# Rows generated and written per pass, so 10M-row files don't need 10M rows in memory
+CHUNK_ROWS = 100_000
+
+# Vendor columns that are not in COLUMN_MAPPING; the importer must tolerate them
+EXTRA_COLUMNS = ['Check-ins: Hardware Lab Check-in', 'Ticket T-Shirt Size', 'Order Billing Country']
+
+DATE_SUFFIX = ' -0700'
+
+# Email domains and their share of registrations
+EMAIL_DOMAINS = {
+    'ucdavis.edu': 0.30, 'berkeley.edu': 0.07, 'stanford.edu': 0.05, 'sjsu.edu': 0.05,
+    'csus.edu': 0.04, 'ucsc.edu': 0.03, 'ucla.edu': 0.03, 'ucsd.edu': 0.02, 'usc.edu': 0.02,
+    'calpoly.edu': 0.02, 'sfsu.edu': 0.02, 'cs.ucdavis.edu': 0.01, 'mit.edu': 0.01,
+    'gmail.com': 0.25, 'yahoo.com': 0.03, 'outlook.com': 0.03, 'icloud.com': 0.02,
+}
+
+# Ticket types: (share, price choices)
+TICKETS = {
+    'Hacker': (0.80, [0.0, 10.0, 15.0]),
+    'Mentor': (0.08, [0.0]),
+    'Volunteer': (0.08, [0.0]),
+    'Judge': (0.04, [0.0]),
+}
+
+# Share of checked-in attendees seen at each meal
+MEAL_RATES = {
+    'Check-ins: Saturday Lunch Check-in': 0.85,
+    'Check-ins: Saturday Dinner Check-in': 0.75,
+    'Check-ins: Sunday Midnight Snack Check-in': 0.35,
+    'Check-ins: Sunday Brunch Check-in': 0.60,
+    'Check-ins: Hardware Lab Check-in': 0.15,
+}
+
+FIRST_NAMES = ['Alex', 'Jordan', 'Taylor', 'Morgan', 'Casey', 'Riley', 'Avery', 'Jamie',
+               'Priya', 'Wei', 'Carlos', 'Fatima', 'Minh', 'Aisha', 'Diego', 'Hana']
+LAST_NAMES = ['Nguyen', 'Garcia', 'Smith', 'Patel', 'Kim', 'Chen', 'Lopez', 'Johnson',
+              'Singh', 'Brown', 'Tran', 'Martinez', 'Lee', 'Wong', 'Davis', 'Ali']
+
+def _format_dates(dates):
+    """Vendor datetime strings with the timezone suffix"""
+    return pd.Series(dates.strftime('%Y-%m-%d %H:%M:%S') + DATE_SUFFIX, dtype=object)
+
+def _checkins(rng, present, rate):
+    """1.0 for a check-in, blank otherwise (the vendor exports floats)"""
+    return np.where(present & (rng.random(len(present)) < rate), 1.0, np.nan)
+
+def generate_chunk(rng, start, rows, event_date, event='HackDavis 2025'):
+    """
+    Build one chunk of synthetic registrations in the vendor CSV layout
+
+    Args:
+        rng (Generator): Random source
+        start (int): Ticket number of the first row
+        rows (int): Number of rows
+        event_date (Timestamp): Event day; registrations ramp up towards it
+        event (str): Value of the Event column
+
+    Returns:
+        DataFrame: Vendor columns (COLUMN_MAPPING keys plus EXTRA_COLUMNS)
+    """
+    numbers = np.arange(start, start + rows)
+    first = rng.choice(FIRST_NAMES, rows)
+    last = rng.choice(LAST_NAMES, rows)
+    shares = np.array(list(EMAIL_DOMAINS.values()))
+    domains = rng.choice(list(EMAIL_DOMAINS), rows, p=shares / shares.sum())
+    emails = pd.Series(np.char.lower(first.astype(str)) + '.' + np.char.lower(last.astype(str))
+                       + numbers.astype(str) + '@' + domains, dtype=object)
+    emails[rng.random(rows) < 0.03] = np.nan
+
+    tickets = rng.choice(list(TICKETS), rows, p=[share for share, _ in TICKETS.values()])
+    prices = np.zeros(rows)
+    for ticket, (_, choices) in TICKETS.items():
+        mask = tickets == ticket
+        prices[mask] = rng.choice(choices, mask.sum())
+
+    # Registrations open 90 days out and accelerate towards the event
+    days_before = rng.beta(1.2, 3.0, rows) * 90
+    created = event_date - pd.to_timedelta(days_before * 86400, unit='s').round('s')
+    updated = created + pd.to_timedelta(rng.exponential(2 * 86400, rows), unit='s').round('s')
+    updated = updated.where(updated < event_date, created)
+
+    # Most orders complete within a minute of checkout; a few wait hours for payment
+    lag = rng.lognormal(np.log(40), 1.0, rows)
+    slow = rng.random(rows) < 0.05
+    lag[slow] = rng.exponential(6 * 3600, slow.sum())
+    completed = created + pd.to_timedelta(lag, unit='s').round('s')
+
+    venue = rng.random(rows) < 0.72
+    void = rng.random(rows) < 0.02
+    created_text = _format_dates(created)
+
+    df = pd.DataFrame({
+        'Number': numbers,
+        'Ticket Created Date (-07:00 Pacific Time (US & Canada))': created_text,
+        'Ticket Last Updated Date (-07:00 Pacific Time (US & Canada))': _format_dates(updated),
+        'Ticket': tickets,
+        'Ticket Full Name': pd.Series(first, dtype=object) + ' ' + last,
+        'Ticket First Name': first,
+        'Ticket Last Name': last,
+        'Ticket Email': emails,
+        'Ticket Company Name': np.where(np.char.endswith(domains.astype(str), '.com') & (rng.random(rows) < 0.3),
+                                        'Acme Corp', None),
+        'Ticket Job Title': None,
+        'Ticket Phone Number': None,
+        'Event': event,
+        # Valid tickets have a blank Void Status in the vendor export
+        'Void Status': np.where(void, 'Void', None),
+        'Price': prices,
+        'Discount Status': np.where(prices == 0, 'Discounted', 'Not Discounted'),
+        'Ticket Reference': pd.Series(numbers).map('TKT-{:08d}'.format),
+        'Tags': None,
+        'Unique Ticket URL': pd.Series(numbers).map('https://tickets.example.com/t/{:08d}'.format),
+        'Unique Order URL': pd.Series(numbers).map('https://tickets.example.com/o/{:08d}'.format),
+        'Order Reference': pd.Series(numbers).map('ORD-{:08d}'.format),
+        'Order Name': pd.Series(first, dtype=object) + ' ' + last,
+        'Order Email': emails,
+        'Order Phone Number': None,
+        'Order Discount Code': np.where(prices == 0, 'STUDENT', None),
+        'Order IP': None,
+        'Order Created Date (-07:00 Pacific Time (US & Canada))': created_text,
+        'Order Completed Date (-07:00 Pacific Time (US & Canada))': _format_dates(completed),
+        'Source': 'Web',
+        'Source Type': 'Direct',
+        'Check-ins: Venue Check-In List': np.where(venue, 1.0, np.nan),
+        'Check-ins: Mentor Check in': _checkins(rng, venue & (tickets == 'Mentor'), 0.9),
+        'Check-ins: Volunteer Check in List': _checkins(rng, venue & (tickets == 'Volunteer'), 0.9),
+        'Ticket T-Shirt Size': rng.choice(['XS', 'S', 'M', 'L', 'XL'], rows),
+        'Order Billing Country': 'United States',
+    })
+    for column, rate in MEAL_RATES.items():
+        df[column] = _checkins(rng, venue, rate)
+    return df[list(COLUMN_MAPPING) + EXTRA_COLUMNS]
+
+def generate_event_data(rows=1000, output_path=DEFAULT_OUTPUT, seed=0, event_date='2025-04-19',
+                        event='HackDavis 2025'):
+    """
+    Write a synthetic ticketing export
+
+    The file has the exact vendor layout import_csv expects: timezone-suffixed
+    dates, float check-ins, ~3% missing emails, ~2% voided tickets (blank Void
+    Status otherwise), orders completing seconds to hours after they are created
+    and a mix of .edu and other domains. Rows are generated and appended in chunks of CHUNK_ROWS.
+
+    Args:
+        rows (int): Number of registrations to generate
+        output_path (str): CSV file to write
+        seed (int): Random seed, so the same arguments give the same file
+        event_date (str): Event day registrations lead up to
+        event (str): Event name written in every row, so several seasons can
+            be generated and imported side by side
+
+    Returns:
+        str: Path of the written file
+    """
+    rng = np.random.default_rng(seed)
+    event_date = pd.Timestamp(event_date) + pd.Timedelta(hours=9)
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    started = time.perf_counter()
+    for start in range(0, rows, CHUNK_ROWS):
+        chunk = generate_chunk(rng, start + 1, min(CHUNK_ROWS, rows - start), event_date, event)
+        chunk.to_csv(output_path, mode='w' if start == 0 else 'a', header=start == 0, index=False)
+    elapsed = time.perf_counter() - started
+    print(f"Generated {rows:,} rows in {output_path} ({elapsed:.2f}s)")
+    return output_path
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic event registration CSV")
+    parser.add_argument('--rows', type=int, default=1000, help="number of registrations (default 1000)")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help=f"CSV file to write (default {DEFAULT_OUTPUT})")
+    parser.add_argument('--seed', type=int, default=0, help="random seed (default 0)")
+    parser.add_argument('--event', default='HackDavis 2025', help="event name (default 'HackDavis 2025')")
+    parser.add_argument('--event-date', default='2025-04-19', help="event day (default 2025-04-19)")
+    args = parser.parse_args()
+    generate_event_data(args.rows, args.output, args.seed, args.event_date, args.event)
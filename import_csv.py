@@ -1,10 +1,99 @@
+import numpy as np
 import pandas as pd
-import mysql.connector
-from mysql.connector import Error
 from datetime import datetime
 import re
 import os
-from config import DATABASE_CONFIG
+import glob
+import time
+import argparse
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from config import IMPORT_CONFIG, SNAPSHOT_CONFIG, EVENT_CONFIG
+import db
+import events
+import rollups
+import snapshot
+import instrumentation
+from config import DATABASE_BACKEND
+from db import get_connection
+
+# Supported strategies for loading rows into the database
+INSERT_METHODS = ('batch', 'load_data', 'row')
+
+# 'replace' deletes and reloads the imported events' rows, 'incremental' upserts changed rows
+IMPORT_MODES = ('replace', 'incremental')
+
+# Map CSV columns to database columns
+COLUMN_MAPPING = {
+    'Number': 'number',
+    'Ticket Created Date (-07:00 Pacific Time (US & Canada))': 'ticket_created_date',
+    'Ticket Last Updated Date (-07:00 Pacific Time (US & Canada))': 'ticket_last_updated_date',
+    'Ticket': 'ticket',
+    'Ticket Full Name': 'ticket_full_name',
+    'Ticket First Name': 'ticket_first_name',
+    'Ticket Last Name': 'ticket_last_name',
+    'Ticket Email': 'ticket_email',
+    'Ticket Company Name': 'ticket_company_name',
+    'Ticket Job Title': 'ticket_job_title',
+    'Ticket Phone Number': 'ticket_phone_number',
+    'Event': 'event',
+    'Void Status': 'void_status',
+    'Price': 'price',
+    'Discount Status': 'discount_status',
+    'Ticket Reference': 'ticket_reference',
+    'Tags': 'tags',
+    'Unique Ticket URL': 'unique_ticket_url',
+    'Unique Order URL': 'unique_order_url',
+    'Order Reference': 'order_reference',
+    'Order Name': 'order_name',
+    'Order Email': 'order_email',
+    'Order Phone Number': 'order_phone_number',
+    'Order Discount Code': 'order_discount_code',
+    'Order IP': 'order_ip',
+    'Order Created Date (-07:00 Pacific Time (US & Canada))': 'order_created_date',
+    'Order Completed Date (-07:00 Pacific Time (US & Canada))': 'order_completed_date',
+    'Source': 'source',
+    'Source Type': 'source_type',
+    'Check-ins: Venue Check-In List': 'venue_checkin',
+    'Check-ins: Saturday Lunch Check-in': 'saturday_lunch_checkin',
+    'Check-ins: Sunday Brunch Check-in': 'sunday_brunch_checkin',
+    'Check-ins: Saturday Dinner Check-in': 'saturday_dinner_checkin',
+    'Check-ins: Sunday Midnight Snack Check-in': 'sunday_midnight_snack_checkin',
+    'Check-ins: Mentor Check in': 'mentor_checkin',
+    'Check-ins: Volunteer Check in List': 'volunteer_checkin'
+}
+
+# Columns inserted into the attendees table, in order
+DB_COLUMNS = [
+    'event_id', 'number', 'ticket_created_date', 'ticket_last_updated_date', 'ticket',
+    'ticket_full_name', 'ticket_first_name', 'ticket_last_name', 'ticket_email',
+    'ticket_company_name', 'ticket_job_title', 'ticket_phone_number', 'event',
+    'void_status', 'price', 'discount_status', 'ticket_reference', 'tags',
+    'unique_ticket_url', 'unique_order_url', 'order_reference', 'order_name',
+    'order_email', 'order_phone_number', 'order_discount_code', 'order_ip',
+    'order_created_date', 'order_completed_date', 'source', 'source_type',
+    'venue_checkin', 'saturday_lunch_checkin', 'sunday_brunch_checkin',
+    'saturday_dinner_checkin', 'sunday_midnight_snack_checkin',
+    'mentor_checkin', 'volunteer_checkin', 'email_domain'
+]
+
+DATE_COLUMNS = ['ticket_created_date', 'ticket_last_updated_date', 'order_created_date', 'order_completed_date']
+
+# Repetitive text columns, loaded as categoricals (a small integer code per row)
+CATEGORY_COLUMNS = ['ticket', 'event', 'void_status', 'discount_status', 'tags', 'order_discount_code',
+                    'source', 'source_type', 'ticket_company_name', 'ticket_job_title']
+
+CHECKIN_COLUMNS = ['venue_checkin', 'saturday_lunch_checkin', 'sunday_brunch_checkin', 
+                   'saturday_dinner_checkin', 'mentor_checkin', 'volunteer_checkin']
+
+# Every column with this prefix is a checkpoint, including ones not in COLUMN_MAPPING
+CHECKIN_PREFIX = 'Check-ins: '
+
+# Timestamp layout used by the ticketing export (after the UTC offset is stripped)
+# and by MySQL DATETIME columns
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+TIMEZONE_OFFSET = r'\s*-\d{4}$'
 
 def clean_datetime(date_str):
     """Convert datetime string to MySQL format"""
@@ -12,12 +101,12 @@ def clean_datetime(date_str):
         return None
     
     # Remove timezone info (-0800, -0700, etc.)
-    cleaned = re.sub(r'\s*-\d{4}$', '', str(date_str))
+    cleaned = re.sub(TIMEZONE_OFFSET, '', str(date_str))
     
     try:
         # Parse and format for MySQL
         dt = pd.to_datetime(cleaned)
-        return dt.strftime('%Y-%m-%d %H:%M:%S')
+        return dt.strftime(DATETIME_FORMAT)
     except:
         return None
 
@@ -30,177 +119,633 @@ def clean_numeric(value):
         return int(value)
     return value
 
-def import_event_data(csv_file_path='data/sample/sample_event_data.csv'):
+def clean_datetime_column(series, input_format=DATETIME_FORMAT):
+    """
+    Vectorized equivalent of clean_datetime for a whole column
+    
+    Offsets are stripped with one string operation and the column is parsed once
+    with an explicit format. Values that don't match fall back to format inference,
+    and only values that still fail are parsed one by one; unparseable values become NaT.
+    The result stays datetime64 (8 bytes per value) and is only formatted as
+    DATETIME_FORMAT text when rows are sent to the database.
+    """
+    text = series.astype('string').str.replace(TIMEZONE_OFFSET, '', regex=True)
+    parsed = pd.to_datetime(text, format=input_format, errors='coerce')
+    
+    retry = parsed.isna() & text.notna() & (text != '')
+    if retry.any():
+        parsed[retry] = pd.to_datetime(text[retry], errors='coerce')
+        retry = parsed.isna() & text.notna() & (text != '')
+        if retry.any():
+            parsed[retry] = pd.to_datetime(text[retry].map(_parse_datetime))
+    return parsed
+
+def _parse_datetime(value):
+    """Parse a single timestamp, returning NaT instead of raising"""
+    try:
+        dt = pd.to_datetime(value)
+        return dt.tz_localize(None) if dt.tzinfo is not None else dt
+    except (ValueError, TypeError, OverflowError):
+        return pd.NaT
+
+def clean_checkin_column(series):
+    """
+    Vectorized equivalent of clean_numeric for a check-in column
+    
+    Whole-number check-in flags (1.0, 0.0) are converted to a nullable integer
+    column in one step (Int8 when the values fit, one byte per row); columns
+    with other values keep the per-value behaviour.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Convert the handful of categories rather than every row
+        # A trailing NaN for code -1 (missing), which also covers an all-blank column
+        values = np.append(pd.to_numeric(pd.Series(series.cat.categories), errors='coerce').to_numpy(dtype=float),
+                           np.nan)
+        numeric = pd.Series(values[series.cat.codes.to_numpy()], index=series.index)
+    else:
+        numeric = pd.to_numeric(series, errors='coerce')
+    present = series.notna() & (series != '')
+    if (numeric.notna() == present).all() and (numeric.dropna() % 1 == 0).all():
+        fits_int8 = numeric.dropna().between(-128, 127).all()
+        return numeric.astype('Int8' if fits_int8 else 'Int64')
+    return series.apply(clean_numeric)
+
+def dataframe_to_rows(df, columns):
+    """Convert a dataframe to a list of row tuples, mapping NaN/NaT and '' to NULL"""
+    frame = df.reindex(columns=columns)
+    for col in frame.select_dtypes(include='datetime').columns:
+        frame[col] = frame[col].dt.strftime(DATETIME_FORMAT)
+    frame = frame.astype(object)
+    frame = frame.where(frame.notna() & (frame != ''), None)
+    return [tuple(row) for row in frame.to_numpy().tolist()]
+
+def report_throughput(count, started):
+    """Print the number of inserted rows and the insert rate"""
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    print(f"Inserted {count} records in {elapsed:.2f}s ({count / elapsed:,.0f} rows/s)")
+
+def compact_read_options():
+    """
+    read_csv options that load only the imported columns, with compact dtypes
+    
+    Unmapped vendor columns are skipped, except check-in columns (they become
+    checkpoints). Repetitive text and check-in flags are read as categoricals,
+    whose per-row cost is a one-byte code instead of a Python string.
+    """
+    headers = {db_col: header for header, db_col in COLUMN_MAPPING.items()}
+    dtype = {headers[col]: 'category' for col in CATEGORY_COLUMNS}
+    dtype.update({headers[col]: 'category' for col in MAPPED_CHECKPOINTS})
+    return {
+        'usecols': lambda header: header in COLUMN_MAPPING or header.startswith(CHECKIN_PREFIX),
+        'dtype': dtype,
+    }
+
+def frame_megabytes(df, sample_rows=10000):
+    """
+    In-memory size of a dataframe, including the strings it references
+    
+    Measuring every string is slow on large frames, so text columns are
+    measured on a sample of rows and scaled up.
+    """
+    text = [col for col in df.columns
+            if not isinstance(df[col].dtype, pd.CategoricalDtype) and pd.api.types.is_string_dtype(df[col].dtype)]
+    total = df.drop(columns=text).memory_usage(deep=True).sum()
+    if text:
+        sample = df[text] if len(df) <= sample_rows else df[text].sample(sample_rows, random_state=0)
+        total += sample.memory_usage(deep=True, index=False).sum() * len(df) / max(len(sample), 1)
+    return total / 1e6
+
+def read_csv_chunks(csv_file_path, chunksize=None, compact=False):
+    """
+    Yield the CSV as dataframes of at most `chunksize` rows (whole file if falsy)
+    
+    With `compact`, only imported columns are read, using compact_read_options().
+    """
+    options = compact_read_options() if compact else {}
+    if not chunksize:
+        with instrumentation.span('csv parse', nbytes=os.path.getsize(csv_file_path)) as details:
+            df = pd.read_csv(csv_file_path, **options)
+            details['rows'] = len(df)
+        yield df
+        return
+    
+    with open(csv_file_path, 'rb') as f:
+        reader = pd.read_csv(f, chunksize=chunksize, **options)
+        position = 0
+        while True:
+            with instrumentation.span('csv parse') as details:
+                chunk = next(reader, None)
+                if chunk is not None:
+                    # Bytes consumed so far, to the parser's read-ahead buffer
+                    details['rows'], details['nbytes'] = len(chunk), f.tell() - position
+                    position = f.tell()
+            if chunk is None:
+                return
+            yield chunk
+
+def track_memory(chunks, stats, key):
+    """Record the largest chunk's in-memory size (MB) in stats[key]"""
+    for chunk in chunks:
+        stats[key] = max(stats[key], frame_megabytes(chunk))
+        yield chunk
+
+def rename_columns(chunks):
+    """Rename vendor CSV headers to database column names"""
+    for chunk in chunks:
+        with instrumentation.span('rename', rows=len(chunk)):
+            chunk = chunk.rename(columns=COLUMN_MAPPING)
+        yield chunk
+
+def filter_invalid_records(chunks, stats):
+    """Drop records with missing email addresses, counting what was read and removed"""
+    for chunk in chunks:
+        with instrumentation.span('filter', rows=len(chunk)):
+            stats['read'] += len(chunk)
+            valid = chunk[chunk['ticket_email'].notna() & (chunk['ticket_email'] != '')]
+            stats['removed'] += len(chunk) - len(valid)
+        yield valid
+
+def clean_records(chunks):
+    """Normalize datetime and check-in columns"""
+    for chunk in chunks:
+        with instrumentation.span('clean', rows=len(chunk)):
+            # Shallow copy: cleaned columns replace, rather than modify, the originals
+            chunk = chunk.copy(deep=False)
+            for col in DATE_COLUMNS:
+                if col in chunk.columns:
+                    chunk[col] = clean_datetime_column(chunk[col])
+            
+            # Convert floats to integers for check-ins
+            for col in CHECKIN_COLUMNS:
+                if col in chunk.columns:
+                    chunk[col] = clean_checkin_column(chunk[col])
+        yield chunk
+
+def load_high_water_marks(cursor):
+    """Return the stored ticket_last_updated_date per (event_id, number) as strings"""
+    cursor.execute("SELECT event_id, number, ticket_last_updated_date FROM attendees")
+    return {
+        # MySQL returns datetimes, SQLite returns the stored text
+        (event_id, number): updated if updated is None or isinstance(updated, str) else updated.strftime(DATETIME_FORMAT)
+        for event_id, number, updated in cursor.fetchall()
+    }
+
+def attendee_keys(df):
+    """(event_id, number) of each row, the attendees primary key"""
+    return pd.MultiIndex.from_arrays([df['event_id'].astype('int64'), df['number'].astype('int64')])
+
+def skip_unchanged_records(chunks, high_water_marks, stats):
+    """Drop rows whose ticket_last_updated_date is not newer than the stored one"""
+    index = pd.MultiIndex.from_tuples(list(high_water_marks), names=['event_id', 'number'])
+    known = pd.Series(list(high_water_marks.values()), index=index, dtype=object)
+    known = pd.to_datetime(known, format=DATETIME_FORMAT, errors='coerce')
+    for chunk in chunks:
+        with instrumentation.span('skip unchanged', rows=len(chunk)):
+            # New attendees have no stored value and are always kept
+            previous = pd.Series(known.reindex(attendee_keys(chunk)).to_numpy(), index=chunk.index)
+            updated = chunk['ticket_last_updated_date']
+            changed = previous.isna() | updated.isna()
+            changed |= updated > previous
+            stats['unchanged'] += int((~changed).sum())
+            chunk = chunk[changed]
+        yield chunk
+
+def extract_email_domain(emails):
+    """
+    Vectorized lookup key for university_domains
+    
+    .edu addresses are reduced to their last two labels (cs.ucdavis.edu ->
+    ucdavis.edu); other addresses keep their full, lower-cased domain.
+    """
+    domain = emails.astype('string').str.strip().str.lower().str.rsplit('@', n=1).str[-1]
+    edu_domain = domain.str.extract(r'([^.@]+\.edu)$', expand=False)
+    return edu_domain.fillna(domain)
+
+def classify_university(university):
+    """
+    Default school type and region for a university first seen at import
+    
+    Matches the groupings the charts have always used; the result is stored
+    in university_domains, where it can be edited.
+    """
+    name = university.lower()
+    if university == 'UC Davis':
+        school_type = 'UC Davis'
+    elif 'uc' in name:
+        school_type = 'Other UC Schools'
+    elif university == 'sjsu.edu':
+        school_type = 'San Jose State'
+    elif 'csu' in name or university in ('sfsu.edu', 'csus.edu'):
+        school_type = 'Other CSU Schools'
+    elif university == 'Stanford':
+        school_type = 'Stanford'
+    elif university == 'Non-University':
+        school_type = 'General Public'
+    else:
+        school_type = 'Other Universities'
+    
+    if university in ('UC Davis', 'UC Berkeley', 'sjsu.edu', 'Stanford'):
+        region = 'Bay Area/Sac'
+    elif 'uc' in name or 'csu' in name:
+        region = 'Other California'
+    elif name.endswith('.edu'):
+        region = 'Out-of-State'
+    else:
+        region = 'General Public'
+    return school_type, region
+
+def load_university_domains(cursor):
+    """Return the email_domain -> university lookup"""
+    cursor.execute("SELECT email_domain, university FROM university_domains")
+    return dict(cursor.fetchall())
+
+def assign_universities(chunks, domains, new_domains):
+    """
+    Set email_domain, the key attendees are joined to university_domains on
+    
+    The university itself is not copied into attendees, so renaming or
+    regrouping a school in the lookup table changes every chart and report.
+    .edu domains missing from the lookup are collected in new_domains so they
+    can be added to university_domains, named after their domain.
+    """
+    for chunk in chunks:
+        with instrumentation.span('university lookup', rows=len(chunk)):
+            chunk = chunk.copy(deep=False)
+            chunk['email_domain'] = extract_email_domain(chunk['ticket_email'])
+            is_edu = chunk['email_domain'].str.endswith('.edu').fillna(False).astype(bool)
+            for domain in chunk.loc[is_edu, 'email_domain'].unique():
+                if domain not in domains:
+                    domains[domain] = domain
+                    new_domains.append(domain)
+        yield chunk
+
+def register_university_domains(connection, cursor, new_domains):
+    """Add newly seen .edu domains to university_domains with default groupings"""
+    if not new_domains:
+        return
+    rows = [(domain, domain) + classify_university(domain) for domain in new_domains]
+    cursor.executemany(db.adapt_sql(
+        "INSERT INTO university_domains (email_domain, university, school_type, region) "
+        "VALUES (%s, %s, %s, %s)"
+    ), rows)
+    connection.commit()
+    print(f"Added {len(rows)} new university domains")
+
+def checkpoint_name(header):
+    """Checkpoint name from an export header ('Check-ins: Saturday Lunch Check-in' -> 'Saturday Lunch')"""
+    if header.startswith(CHECKIN_PREFIX):
+        header = header[len(CHECKIN_PREFIX):]
+    return re.sub(r'\s*check[- ]?in(\s+list)?\s*$', '', header, flags=re.IGNORECASE).strip()
+
+# Check-in columns renamed by COLUMN_MAPPING, by database column
+MAPPED_CHECKPOINTS = {
+    db_col: checkpoint_name(header)
+    for header, db_col in COLUMN_MAPPING.items() if header.startswith(CHECKIN_PREFIX)
+}
+
+def checkpoint_columns(columns):
+    """Map the check-in columns present in a renamed chunk to checkpoint names"""
+    checkpoints = {}
+    for col in columns:
+        if col in MAPPED_CHECKPOINTS:
+            checkpoints[col] = MAPPED_CHECKPOINTS[col]
+        elif col.startswith(CHECKIN_PREFIX):
+            checkpoints[col] = checkpoint_name(col)
+    return checkpoints
+
+def checkins_to_rows(df):
+    """(event_id, attendee_number, checkpoint, checked_in_at) rows for every check-in flag that is set"""
+    rows = []
+    for col, checkpoint in checkpoint_columns(df.columns).items():
+        flags = pd.to_numeric(df[col], errors='coerce').fillna(0)
+        checked_in = df.loc[flags > 0]
+        rows.extend((event_id, number, checkpoint, None) for event_id, number
+                    in zip(checked_in['event_id'].tolist(), checked_in['number'].tolist()))
+    return rows
+
+def insert_checkins(connection, cursor, df, batch_size, stats):
+    """
+    Write the chunk's check-ins to attendee_checkins
+    
+    In incremental mode the check-ins of the chunk's attendees are replaced,
+    so flags cleared in the export are removed as well.
+    """
+    if stats['mode'] == 'incremental':
+        for event_id, group in df.groupby('event_id'):
+            numbers = group['number'].tolist()
+            for start in range(0, len(numbers), batch_size):
+                batch = numbers[start:start + batch_size]
+                placeholders = ', '.join(['%s'] * len(batch))
+                cursor.execute(db.adapt_sql(
+                    f"DELETE FROM attendee_checkins WHERE event_id = %s AND attendee_number IN ({placeholders})"
+                ), (int(event_id),) + tuple(batch))
+    
+    with instrumentation.span('checkin rows', rows=len(df)):
+        rows = checkins_to_rows(df)
+    sql = db.adapt_sql(
+        "INSERT INTO attendee_checkins (event_id, attendee_number, checkpoint, checked_in_at) "
+        "VALUES (%s, %s, %s, %s)"
+    )
+    for start in range(0, len(rows), batch_size):
+        cursor.executemany(sql, rows[start:start + batch_size])
+    db.bump_data_version(cursor)
+    connection.commit()
+    stats['checkins'] += len(rows)
+
+def rollup_inputs(df):
+    """Per-attendee rollup inputs for a cleaned chunk, deriving total_checkins like the schema"""
+    checkins = [col for col in CHECKIN_COLUMNS if col in df.columns]
+    total = df[checkins].apply(pd.to_numeric, errors='coerce').fillna(0).sum(axis=1)
+    return pd.DataFrame({
+        'event_id': df['event_id'],
+        'ticket_created_date': df['ticket_created_date'],
+        'email_domain': df['email_domain'],
+        'total_checkins': total,
+        'price': df['price'] if 'price' in df.columns else None,
+        'venue_checkin': df['venue_checkin'] if 'venue_checkin' in df.columns else 0,
+    })
+
+def insert_rows_individually(connection, cursor, sql, df):
+    """Insert rows one statement at a time (legacy fallback)"""
+    inserted_count = 0
+    email = DB_COLUMNS.index('ticket_email')
+    # Same conversion as the batch path: dates as text, NaN/NaT and '' as NULL
+    for index, values in zip(df.index, dataframe_to_rows(df, DB_COLUMNS)):
+        if values[email] is None:
+            # Skip this record if email is empty (shouldn't happen after filtering)
+            print(f"Warning: Empty email at row {index}, skipping...")
+            continue
+        cursor.execute(sql, values)
+        inserted_count += 1
+        
+        if inserted_count % 100 == 0:
+            print(f"Inserted {inserted_count} records...")
+    
+    db.bump_data_version(cursor)
+    connection.commit()
+    return inserted_count
+
+def _load_data_value(value):
+    """Escape a value for LOAD DATA's default tab-separated format"""
+    if value is None:
+        return '\\N'
+    return (str(value).replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+def load_data_batch(cursor, batch, replace=False):
+    """Send one batch through LOAD DATA LOCAL INFILE using a temporary file"""
+    with tempfile.NamedTemporaryFile('w', suffix='.tsv', delete=False,
+                                     newline='', encoding='utf-8') as tmp:
+        for row in batch:
+            tmp.write('\t'.join(_load_data_value(v) for v in row) + '\n')
+    try:
+        path = tmp.name.replace('\\', '/')
+        cursor.execute(
+            f"LOAD DATA LOCAL INFILE '{path}' {'REPLACE ' if replace else ''}INTO TABLE attendees "
+            f"CHARACTER SET utf8mb4 "
+            f"FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' "
+            f"LINES TERMINATED BY '\\n' ({', '.join(DB_COLUMNS)})"
+        )
+    finally:
+        os.remove(tmp.name)
+
+def insert_dataframe(connection, cursor, sql, df, method, batch_size, stats):
+    """
+    Insert a cleaned dataframe using the selected method, committing once per batch
+    
+    Progress is accumulated in stats['inserted'] so that throughput is reported
+    across all chunks of a streaming import.
+    """
+    if method == 'row':
+        stats['inserted'] += insert_rows_individually(connection, cursor, sql, df)
+        return
+    
+    for start in range(0, len(df), batch_size):
+        # Converted one batch at a time, so only batch_size rows exist as Python tuples
+        with instrumentation.span('prepare rows', rows=min(batch_size, len(df) - start)):
+            batch = dataframe_to_rows(df.iloc[start:start + batch_size], DB_COLUMNS)
+        with instrumentation.span(f'insert batch ({method})', rows=len(batch)):
+            if method == 'load_data':
+                load_data_batch(cursor, batch, replace=stats['mode'] == 'incremental')
+            else:
+                cursor.executemany(sql, batch)
+            db.bump_data_version(cursor)
+            connection.commit()
+        stats['inserted'] += len(batch)
+        
+        elapsed = max(time.perf_counter() - stats['started'], 1e-9)
+        print(f"Inserted {stats['inserted']} records ({stats['inserted'] / elapsed:,.0f} rows/s)...")
+
+def attendee_insert_sql(mode='replace'):
+    """INSERT statement for DB_COLUMNS, upserting on the primary key in incremental mode"""
+    placeholders = ', '.join(['%s'] * len(DB_COLUMNS))
+    columns = ', '.join(DB_COLUMNS)
+    sql = f"INSERT INTO attendees ({columns}) VALUES ({placeholders})"
+    if mode == 'incremental':
+        sql += db.upsert_clause(DB_COLUMNS, ['event_id', 'number'])
+    return db.adapt_sql(sql)
+
+def assign_event_ids(chunks, cursor, event_ids, seen, event_date=None):
     """
-    Import event registration data from CSV to MySQL database
+    Set event_id from the (tagged) event column
+    
+    Events missing from the lookup are added to the events table first;
+    the ids of every event met are collected in seen. With event_date, the
+    events met are given that date (new and already stored ones alike).
+    """
+    for chunk in chunks:
+        with instrumentation.span('event lookup', rows=len(chunk)):
+            names = chunk['event'].astype(str)
+            new = events.register_events(cursor, names.unique(), event_ids, event_date)
+            for name in new:
+                print(f"📅 New event '{name}' (id {event_ids[name]})")
+            chunk = chunk.assign(event_id=names.map(event_ids).astype('int64'))
+            met = {int(event_id) for event_id in chunk['event_id'].unique()} - seen
+            if event_date:
+                for event_id in met - {event_ids[name] for name in new}:
+                    events.set_date(cursor, event_id, event_date)
+            seen.update(met)
+        yield chunk
+
+def clear_events(cursor, event_ids, cleared):
+    """Delete the stored rows of events met for the first time in a replace import"""
+    for event_id in event_ids:
+        if event_id not in cleared:
+            removed = events.delete_event(cursor, event_id)
+            cleared.add(event_id)
+            if removed:
+                print(f"Replacing event {event_id}: removed {removed} existing records")
+
+def write_chunk(connection, cursor, sql, chunk, method, batch_size, stats, rollup_deltas, cleared):
+    """
+    Insert one cleaned chunk and its check-ins, collecting its rollup deltas
+    
+    In replace mode each event's existing rows are deleted just before its
+    first chunk is written (cleared holds the events already replaced), so
+    only the events in the file are replaced.
+    """
+    if stats['mode'] == 'replace':
+        clear_events(cursor, [int(event_id) for event_id in chunk['event_id'].unique()], cleared)
+    with instrumentation.span('rollup deltas', rows=len(chunk)):
+        if stats['mode'] == 'incremental':
+            # Take back the stored rows' contribution before they are overwritten
+            previous = rollups.load_contributions(cursor, attendee_keys(chunk).tolist(), batch_size)
+            rollup_deltas.append(rollups.aggregate(previous, sign=-1))
+        rollup_deltas.append(rollups.aggregate(rollup_inputs(chunk)))
+    insert_dataframe(connection, cursor, sql, chunk, method, batch_size, stats)
+    insert_checkins(connection, cursor, chunk, batch_size, stats)
+
+def export_snapshot(connection):
+    """Refresh the columnar snapshot; a failure only warns, since the import itself succeeded"""
+    try:
+        with instrumentation.span('snapshot export'):
+            snapshot.export(connection)
+    except (OSError, ValueError, db.DatabaseError) as e:
+        print(f"⚠️  Snapshot export failed: {e} (run python snapshot.py to retry)")
+
+def options_error(method, mode, event_date=None):
+    """Describe an invalid insert method / import mode combination or event date (None if valid)"""
+    if method not in INSERT_METHODS:
+        return f"Unknown insert method '{method}' (expected one of {', '.join(INSERT_METHODS)})"
+    if mode not in IMPORT_MODES:
+        return f"Unknown import mode '{mode}' (expected one of {', '.join(IMPORT_MODES)})"
+    if method == 'load_data' and DATABASE_BACKEND != 'mysql':
+        return f"LOAD DATA is only available with the MySQL backend (DB_BACKEND={DATABASE_BACKEND})"
+    if event_date:
+        try:
+            events.check_date(event_date)
+        except ValueError as e:
+            return str(e)
+    return None
+
+@instrumentation.run('import')
+def import_event_data(csv_file_path='data/sample/sample_event_data.csv',
+                      method=None, batch_size=None, chunksize=None, mode=None, compact=None, event=None,
+                      event_date=None):
+    """
+    Import event registration data from CSV into the configured database
+    
+    The CSV flows through a generator pipeline (read -> rename -> filter -> clean
+    -> tag event -> insert). With `chunksize` set, only one chunk is held in memory
+    at a time. Rows are stored under their event, and events not in the file are
+    left untouched.
     
     Args:
         csv_file_path (str): Path to the CSV file containing event data
+        method (str): Insert strategy - 'batch' (multi-row executemany),
+            'load_data' (LOAD DATA LOCAL INFILE) or 'row' (one INSERT per row).
+            Defaults to IMPORT_CONFIG['method'].
+        batch_size (int): Rows sent per batch/commit. Defaults to IMPORT_CONFIG['batch_size'].
+        chunksize (int): Rows read from the CSV at a time; 0 reads the whole file.
+            Defaults to IMPORT_CONFIG['chunksize'].
+        mode (str): 'replace' deletes the file's events and reloads them;
+            'incremental' upserts on (event, `number`), skipping rows whose
+            ticket_last_updated_date is not newer than the stored one and
+            classifying universities only for the rows that changed.
+            Defaults to IMPORT_CONFIG['mode'].
+        compact (bool): Read only the imported columns, with categorical text
+            and check-in columns. Defaults to IMPORT_CONFIG['compact'].
+        event (str): Event for every row. By default blank Event values are
+            filled in with EVENT_CONFIG['event_name'].
+        event_date (str): Date (YYYY-MM-DD) stored for the file's events,
+            which the registration timing reports count days to. By default
+            only new events get one (see events.register_events).
         
     Returns:
         bool: True if import successful, False otherwise
     """
     
+    method = method or IMPORT_CONFIG['method']
+    batch_size = batch_size or IMPORT_CONFIG['batch_size']
+    mode = mode or IMPORT_CONFIG['mode']
+    if compact is None:
+        compact = IMPORT_CONFIG['compact']
+    if chunksize is None:
+        chunksize = IMPORT_CONFIG['chunksize']
+    
     try:
+        error = options_error(method, mode, event_date)
+        if error:
+            print(f"Error: {error}")
+            return False
+        
         # Verify file exists
         if not os.path.exists(csv_file_path):
             print(f"Error: File {csv_file_path} not found!")
             return False
-            
-        # Read CSV
-        print("Reading CSV file...")
-        df = pd.read_csv(csv_file_path)
-        print(f"Found {len(df)} records")
-        
-        # Map CSV columns to database columns
-        column_mapping = {
-            'Number': 'number',
-            'Ticket Created Date (-07:00 Pacific Time (US & Canada))': 'ticket_created_date',
-            'Ticket Last Updated Date (-07:00 Pacific Time (US & Canada))': 'ticket_last_updated_date',
-            'Ticket': 'ticket',
-            'Ticket Full Name': 'ticket_full_name',
-            'Ticket First Name': 'ticket_first_name',
-            'Ticket Last Name': 'ticket_last_name',
-            'Ticket Email': 'ticket_email',
-            'Ticket Company Name': 'ticket_company_name',
-            'Ticket Job Title': 'ticket_job_title',
-            'Ticket Phone Number': 'ticket_phone_number',
-            'Event': 'event',
-            'Void Status': 'void_status',
-            'Price': 'price',
-            'Discount Status': 'discount_status',
-            'Ticket Reference': 'ticket_reference',
-            'Tags': 'tags',
-            'Unique Ticket URL': 'unique_ticket_url',
-            'Unique Order URL': 'unique_order_url',
-            'Order Reference': 'order_reference',
-            'Order Name': 'order_name',
-            'Order Email': 'order_email',
-            'Order Phone Number': 'order_phone_number',
-            'Order Discount Code': 'order_discount_code',
-            'Order IP': 'order_ip',
-            'Order Created Date (-07:00 Pacific Time (US & Canada))': 'order_created_date',
-            'Order Completed Date (-07:00 Pacific Time (US & Canada))': 'order_completed_date',
-            'Source': 'source',
-            'Source Type': 'source_type',
-            'Check-ins: Venue Check-In List': 'venue_checkin',
-            'Check-ins: Saturday Lunch Check-in': 'saturday_lunch_checkin',
-            'Check-ins: Sunday Brunch Check-in': 'sunday_brunch_checkin',
-            'Check-ins: Saturday Dinner Check-in': 'saturday_dinner_checkin',
-            'Check-ins: Sunday Midnight Snack Check-in': 'sunday_midnight_snack_checkin',
-            'Check-ins: Mentor Check in': 'mentor_checkin',
-            'Check-ins: Volunteer Check in List': 'volunteer_checkin'
-        }
-        
-        # Rename columns
-        df.rename(columns=column_mapping, inplace=True)
-        
-        # FILTER OUT INVALID RECORDS
-        print("Filtering out invalid records...")
-        initial_count = len(df)
-        
-        # Remove records with missing email addresses
-        df = df[df['ticket_email'].notna() & (df['ticket_email'] != '')]
-        
-        print(f"Removed {initial_count - len(df)} records with missing emails")
-        print(f"Processing {len(df)} valid records")
-        
-        # Clean datetime columns
-        date_columns = ['ticket_created_date', 'ticket_last_updated_date', 'order_created_date', 'order_completed_date']
-        for col in date_columns:
-            if col in df.columns:
-                df[col] = df[col].apply(clean_datetime)
-        
-        # Clean check-in columns (convert floats to integers)
-        checkin_columns = ['venue_checkin', 'saturday_lunch_checkin', 'sunday_brunch_checkin', 
-                          'saturday_dinner_checkin', 'mentor_checkin', 'volunteer_checkin']
-        for col in checkin_columns:
-            if col in df.columns:
-                df[col] = df[col].apply(clean_numeric)
-        
-        # Connect to MySQL using config
-        print("Connecting to MySQL...")
-        connection = mysql.connector.connect(**DATABASE_CONFIG)
-        cursor = connection.cursor()
-        
-        # Clear existing data
-        cursor.execute("TRUNCATE TABLE attendees")
-        
-        # Prepare the INSERT statement
-        db_columns = [
-            'number', 'ticket_created_date', 'ticket_last_updated_date', 'ticket',
-            'ticket_full_name', 'ticket_first_name', 'ticket_last_name', 'ticket_email',
-            'ticket_company_name', 'ticket_job_title', 'ticket_phone_number', 'event',
-            'void_status', 'price', 'discount_status', 'ticket_reference', 'tags',
-            'unique_ticket_url', 'unique_order_url', 'order_reference', 'order_name',
-            'order_email', 'order_phone_number', 'order_discount_code', 'order_ip',
-            'order_created_date', 'order_completed_date', 'source', 'source_type',
-            'venue_checkin', 'saturday_lunch_checkin', 'sunday_brunch_checkin',
-            'saturday_dinner_checkin', 'sunday_midnight_snack_checkin',
-            'mentor_checkin', 'volunteer_checkin'
-        ]
-        
-        placeholders = ', '.join(['%s'] * len(db_columns))
-        columns = ', '.join(db_columns)
-        sql = f"INSERT INTO attendees ({columns}) VALUES ({placeholders})"
-        
-        # Insert data row by row
-        print("Inserting data...")
-        inserted_count = 0
-        for index, row in df.iterrows():
-            # Get values in the correct order
-            values = []
-            for col in db_columns:
-                value = row.get(col, None)
-                # Convert empty strings to None (except for required fields like email)
-                if pd.isna(value) or value == '':
-                    if col == 'ticket_email':
-                        # Skip this record if email is empty (shouldn't happen after filtering)
-                        print(f"Warning: Empty email at row {index}, skipping...")
-                        break
-                    values.append(None)
-                else:
-                    values.append(value)
-            else:
-                # This else block runs if the for loop completed without break
-                cursor.execute(sql, tuple(values))
-                inserted_count += 1
-                
-                if inserted_count % 100 == 0:
-                    print(f"Inserted {inserted_count} records...")
-        
-        # Commit changes
-        connection.commit()
-        
-        # Run data cleaning
-        print("Cleaning data...")
-        cursor.execute("""
-            UPDATE attendees 
-            SET university = CASE 
-                WHEN ticket_email LIKE '%ucdavis.edu' THEN 'UC Davis'
-                WHEN ticket_email LIKE '%berkeley.edu' THEN 'UC Berkeley'
-                WHEN ticket_email LIKE '%stanford.edu' THEN 'Stanford'
-                WHEN ticket_email LIKE '%.edu' THEN SUBSTRING_INDEX(SUBSTRING_INDEX(ticket_email, '@', -1), '.', -2)
-                ELSE 'Non-University'
-            END
-        """)
-        connection.commit()
+        
+        # Connect to the configured database
+        print(f"Connecting to database ({DATABASE_BACKEND})...")
+        if method == 'load_data':
+            connection = get_connection(allow_local_infile=True)
+        else:
+            connection = get_connection()
+        cursor = instrumentation.instrument_cursor(connection.cursor())
+        
+        sql = attendee_insert_sql(mode)
+        if mode == 'incremental':
+            # Remember what is already stored
+            high_water_marks = load_high_water_marks(cursor)
+            print(f"Found {len(high_water_marks)} existing records")
+        
+        # Read, filter, clean and insert
+        reading = f"chunks of {chunksize}" if chunksize else "whole file"
+        print(f"Reading CSV file ({reading})...")
+        print(f"Inserting data ({method}, batch size {batch_size})...")
+        stats = {'mode': mode, 'read': 0, 'removed': 0, 'unchanged': 0, 'inserted': 0,
+                 'checkins': 0, 'read_mb': 0.0, 'clean_mb': 0.0, 'started': time.perf_counter()}
+        domains = load_university_domains(cursor)
+        new_domains = []
+        event_ids, imported_events, cleared = events.load_events(cursor), set(), set()
+        chunks = track_memory(read_csv_chunks(csv_file_path, chunksize, compact), stats, 'read_mb')
+        chunks = clean_records(filter_invalid_records(rename_columns(chunks), stats))
+        chunks = tag_event(chunks, event or EVENT_CONFIG['event_name'], overwrite=event is not None)
+        chunks = assign_event_ids(chunks, cursor, event_ids, imported_events, event_date)
+        if mode == 'incremental':
+            chunks = skip_unchanged_records(chunks, high_water_marks, stats)
+        chunks = track_memory(assign_universities(chunks, domains, new_domains), stats, 'clean_mb')
+        rollup_deltas = []
+        for chunk in chunks:
+            write_chunk(connection, cursor, sql, chunk, method, batch_size, stats, rollup_deltas, cleared)
+        with instrumentation.span('rollup apply'):
+            rollups.apply(connection, cursor, rollups.combine(rollup_deltas))
+        
+        print(f"Found {stats['read']} records")
+        print(f"Removed {stats['removed']} records with missing emails")
+        print(f"Processed {stats['read'] - stats['removed']} valid records")
+        if mode == 'incremental':
+            print(f"Skipped {stats['unchanged']} unchanged records")
+        report_throughput(stats['inserted'], stats['started'])
+        print(f"Dataframe memory ({'largest chunk' if chunksize else 'whole file'}, "
+              f"{'compact' if compact else 'default'} dtypes): "
+              f"{stats['read_mb']:.1f} MB as read, {stats['clean_mb']:.1f} MB cleaned")
+        print(f"Recorded {stats['checkins']} check-ins")
+        
+        register_university_domains(connection, cursor, new_domains)
         
         # Verify
-        cursor.execute("SELECT COUNT(*) FROM attendees")
+        scope = ', '.join(str(event_id) for event_id in sorted(imported_events)) or 'NULL'
+        cursor.execute(f"SELECT COUNT(*) FROM attendees WHERE event_id IN ({scope})")
         count = cursor.fetchone()[0]
         print(f"Successfully imported {count} records!")
         
         # Show sample data (anonymized for privacy)
-        cursor.execute("SELECT COUNT(*) as total, university, AVG(total_checkins) as avg_engagement FROM attendees GROUP BY university LIMIT 5")
+        cursor.execute(f"SELECT COUNT(*) as total, COALESCE(d.university, 'Non-University') as university, "
+                       f"AVG(a.total_checkins) as avg_engagement FROM attendees a "
+                       f"LEFT JOIN university_domains d ON d.email_domain = a.email_domain "
+                       f"WHERE a.event_id IN ({scope}) GROUP BY COALESCE(d.university, 'Non-University') LIMIT 5")
         results = cursor.fetchall()
         print("\nSample university data:")
         for row in results:
             print(f"University: {row[1]}, Count: {row[0]}, Avg Engagement: {row[2]:.2f}")
+        print()
+        events.print_events(cursor)
         
+        if SNAPSHOT_CONFIG['enabled']:
+            export_snapshot(connection)
         return True
         
-    except Error as e:
+    except db.DatabaseError as e:
         print(f"Database Error: {e}")
         return False
         
@@ -209,16 +754,288 @@ def import_event_data(csv_file_path='data/sample/sample_event_data.csv'):
         return False
         
     finally:
-        if 'connection' in locals() and connection.is_connected():
-            cursor.close()
+        if 'connection' in locals():
+            if 'cursor' in locals():
+                cursor.close()
+            # Returns pooled connections to the pool (the session is reset there)
             connection.close()
 
+def expand_paths(paths):
+    """CSV files named by paths: files as given, the *.csv files of directories and glob matches"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            matches = sorted(glob.glob(os.path.join(path, '*.csv')))
+        elif any(char in path for char in '*?['):
+            matches = sorted(glob.glob(path, recursive=True))
+        else:
+            matches = [path]
+        files.extend(match for match in matches if match not in files)
+    return files
+
+def event_name(csv_file_path):
+    """Default event for a file's rows: its name without the extension"""
+    return os.path.splitext(os.path.basename(csv_file_path))[0]
+
+def tag_event(chunks, event, overwrite=False):
+    """Set the event column where it is blank (or everywhere, with overwrite)"""
+    for chunk in chunks:
+        if overwrite or 'event' not in chunk.columns:
+            chunk = chunk.assign(event=event)
+        else:
+            column = chunk['event']
+            if isinstance(column.dtype, pd.CategoricalDtype) and event not in column.cat.categories:
+                column = column.cat.add_categories([event])
+            chunk = chunk.assign(event=column.fillna(event))
+        yield chunk
+
+def prepare_file(csv_file_path, chunksize, compact, domains, event=None):
+    """
+    Read, filter, clean and tag one export (runs in a batch import's worker processes)
+    
+    Args:
+        csv_file_path (str): CSV export to prepare
+        chunksize (int): Rows read at a time; 0 reads the whole file
+        compact (bool): Read with compact_read_options()
+        domains (dict): email_domain -> university lookup
+        event (str): Event for every row. By default only blank events are
+            filled in, with event_name(csv_file_path).
+    
+    Returns:
+        tuple: (cleaned chunks, new .edu domains, stats)
+    """
+    started = time.perf_counter()
+    stats = {'read': 0, 'removed': 0, 'read_mb': 0.0, 'clean_mb': 0.0}
+    new_domains = []
+    chunks = track_memory(read_csv_chunks(csv_file_path, chunksize, compact), stats, 'read_mb')
+    chunks = clean_records(filter_invalid_records(rename_columns(chunks), stats))
+    chunks = tag_event(chunks, event or event_name(csv_file_path), overwrite=event is not None)
+    chunks = list(track_memory(assign_universities(chunks, domains, new_domains), stats, 'clean_mb'))
+    stats['prepare_seconds'] = time.perf_counter() - started
+    return chunks, new_domains, stats
+
+class DeferredCommits:
+    """
+    Connection stand-in whose commit() does nothing
+    
+    The insert helpers commit after every batch; a batch import hands them
+    this instead and commits once per file or once for the whole batch.
+    """
+    
+    def __init__(self, connection):
+        self._connection = connection
+    
+    def commit(self):
+        pass
+    
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+def write_prepared_file(connection, cursor, sql, chunks, method, batch_size, stats, high_water_marks, written,
+                        event_ids, cleared, event_date=None):
+    """
+    Write one prepared file's chunks and apply its rollup deltas
+    
+    Tickets already written to the same event by an earlier file of the batch
+    (`written`) are skipped and counted in stats['duplicates'].
+    
+    Returns:
+        list: (event_id, number) of the tickets written
+    """
+    chunks = assign_event_ids(chunks, cursor, event_ids, set(), event_date)
+    if high_water_marks is not None:
+        chunks = skip_unchanged_records(chunks, high_water_marks, stats)
+    keys, rollup_deltas = [], []
+    for chunk in chunks:
+        if written:
+            duplicate = attendee_keys(chunk).isin(written)
+            stats['duplicates'] += int(duplicate.sum())
+            chunk = chunk[~duplicate]
+        write_chunk(connection, cursor, sql, chunk, method, batch_size, stats, rollup_deltas, cleared)
+        keys.extend(attendee_keys(chunk).tolist())
+    with instrumentation.span('rollup apply'):
+        rollups.apply(connection, cursor, rollups.combine(rollup_deltas))
+    return keys
+
+def print_file_summary(file_stats):
+    """Print one line of counts and timings per imported file"""
+    print(f"\n{'file':<32} {'read':>9} {'removed':>8} {'unchanged':>9} {'dupes':>7} "
+          f"{'inserted':>9} {'check-ins':>9} {'prepare':>8} {'write':>7}  status")
+    for stats in file_stats:
+        print(f"{os.path.basename(stats['file'])[:32]:<32} {stats['read']:>9,} {stats['removed']:>8,} "
+              f"{stats['unchanged']:>9,} {stats['duplicates']:>7,} {stats['inserted']:>9,} "
+              f"{stats['checkins']:>9,} {stats['prepare_seconds']:7.2f}s {stats['write_seconds']:6.2f}s  "
+              f"{stats['error'] or 'ok'}")
+
+@instrumentation.run('batch import')
+def import_event_files(paths, method=None, batch_size=None, chunksize=None, mode=None, compact=None,
+                       workers=None, per_file=False, event=None, event_date=None):
+    """
+    Import several exports (shards of one event, or many events) in one run
+    
+    Files are read, cleaned and tagged in a process pool while a single writer
+    inserts the prepared files in order over one connection. A ticket number
+    already written to the same event by an earlier file of the batch is
+    skipped as a duplicate. In replace mode only the events found in the
+    files are replaced.
+    
+    Args:
+        paths (list): CSV files, directories (their *.csv files) or glob patterns
+        method, batch_size, chunksize, mode, compact: As for import_event_data
+        workers (int): Files prepared in parallel. Defaults to one per CPU.
+            Each prepared file is held in memory until it is written.
+        per_file (bool): Commit after each file, so a failing file is rolled
+            back and reported while the others are kept. By default the whole
+            batch is one transaction and any failure leaves the database unchanged.
+        event (str): Event for every row. By default blank Event values are
+            filled in from each file's name.
+        event_date (str): Date (YYYY-MM-DD) stored for the files' events, as
+            for import_event_data
+    
+    Returns:
+        bool: True if every file was imported, False otherwise
+    """
+    method = method or IMPORT_CONFIG['method']
+    batch_size = batch_size or IMPORT_CONFIG['batch_size']
+    mode = mode or IMPORT_CONFIG['mode']
+    if compact is None:
+        compact = IMPORT_CONFIG['compact']
+    if chunksize is None:
+        chunksize = IMPORT_CONFIG['chunksize']
+    
+    error = options_error(method, mode, event_date)
+    files = expand_paths(paths)
+    missing = [path for path in files if not os.path.isfile(path)]
+    if error or not files or missing:
+        print(f"Error: {error or (f'File {missing[0]} not found!' if missing else 'No CSV files matched')}")
+        return False
+    workers = min(workers or os.cpu_count() or 1, len(files))
+    
+    print(f"Importing {len(files)} files ({mode}, {method}, {workers} workers, "
+          f"{'committing per file' if per_file else 'one transaction'}) into {DATABASE_BACKEND}...")
+    connection = get_connection(allow_local_infile=True) if method == 'load_data' else get_connection()
+    writer = DeferredCommits(connection)
+    cursor = instrumentation.instrument_cursor(connection.cursor())
+    file_stats = []
+    try:
+        high_water_marks = None
+        if mode == 'incremental':
+            high_water_marks = load_high_water_marks(cursor)
+            print(f"Found {len(high_water_marks)} existing records")
+        sql = attendee_insert_sql(mode)
+        domains = load_university_domains(cursor)
+        registered = set(domains)
+        event_ids = events.load_events(cursor)
+        written, cleared = set(), set()
+        
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            queue = iter(files)
+            pending = deque()
+            
+            def submit_next():
+                path = next(queue, None)
+                if path:
+                    pending.append((path, pool.submit(prepare_file, path, chunksize, compact, domains, event)))
+            
+            # Keep every worker busy, with at most one prepared file waiting for the writer
+            for _ in range(workers):
+                submit_next()
+            while pending:
+                path, future = pending.popleft()
+                submit_next()
+                stats = {'file': path, 'mode': mode, 'read': 0, 'removed': 0, 'unchanged': 0,
+                         'duplicates': 0, 'inserted': 0, 'checkins': 0, 'prepare_seconds': 0.0,
+                         'write_seconds': 0.0, 'error': None}
+                replaced = set(cleared)
+                try:
+                    chunks, new_domains, prepared = future.result()
+                    stats.update(prepared)
+                    instrumentation.record('prepare file (worker)', prepared['prepare_seconds'], rows=prepared['read'])
+                    print(f"\n{path}: {stats['read']} records read")
+                    stats['started'] = time.perf_counter()
+                    keys = write_prepared_file(writer, cursor, sql, chunks, method, batch_size, stats,
+                                               high_water_marks, written, event_ids, cleared, event_date)
+                    del chunks
+                    new_domains = [domain for domain in dict.fromkeys(new_domains) if domain not in registered]
+                    register_university_domains(writer, cursor, new_domains)
+                    if per_file:
+                        connection.commit()
+                except Exception as e:
+                    if not per_file:
+                        print(f"❌ {path} failed, rolling back the whole batch")
+                        raise
+                    connection.rollback()
+                    # The file's event deletions and new events were rolled back with it
+                    cleared.intersection_update(replaced)
+                    event_ids = events.load_events(cursor)
+                    stats['error'] = f"{type(e).__name__}: {e}"
+                    print(f"❌ {path} rolled back: {stats['error']}")
+                else:
+                    written.update(keys)
+                    registered.update(new_domains)
+                if 'started' in stats:
+                    stats['write_seconds'] = time.perf_counter() - stats.pop('started')
+                file_stats.append(stats)
+        
+        if not per_file:
+            connection.commit()
+        
+        print_file_summary(file_stats)
+        imported = [stats for stats in file_stats if not stats['error']]
+        print(f"\nImported {len(imported)} of {len(files)} files: {sum(s['inserted'] for s in imported)} "
+              f"records, {sum(s['checkins'] for s in imported)} check-ins")
+        cursor.execute("SELECT COUNT(*) FROM attendees")
+        print(f"Database now holds {cursor.fetchone()[0]} records\n")
+        events.print_events(cursor)
+        if SNAPSHOT_CONFIG['enabled'] and imported:
+            export_snapshot(connection)
+        return len(imported) == len(files)
+    
+    except db.DatabaseError as e:
+        print(f"Database Error: {e}")
+        connection.rollback()
+        return False
+    
+    except Exception as e:
+        print(f"Error: {e}")
+        connection.rollback()
+        return False
+    
+    finally:
+        cursor.close()
+        connection.close()
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Import event registration CSV exports. With paths, runs a non-interactive "
+                    "batch import; without, asks for a single file.")
+    parser.add_argument('paths', nargs='*', help="CSV files, directories or glob patterns (e.g. 'exports/*.csv')")
+    parser.add_argument('--mode', choices=IMPORT_MODES, help="default IMPORT_MODE")
+    parser.add_argument('--method', choices=INSERT_METHODS, help="default IMPORT_METHOD")
+    parser.add_argument('--batch-size', type=int, help="rows per insert batch (default IMPORT_BATCH_SIZE)")
+    parser.add_argument('--chunksize', type=int, help="CSV rows per chunk, 0 = whole file (default IMPORT_CHUNKSIZE)")
+    parser.add_argument('--no-compact', action='store_true', help="read every CSV column as text")
+    parser.add_argument('--workers', type=int, help="files prepared in parallel (default one per CPU)")
+    parser.add_argument('--per-file', action='store_true',
+                        help="commit each file separately instead of the whole batch at once")
+    parser.add_argument('--event', help="event name for every row (default: blank events get the file name, "
+                                        "or EVENT_NAME for a single interactive import)")
+    parser.add_argument('--event-date', help="date (YYYY-MM-DD) of the imported events, used by the "
+                                             "registration timing reports (default: EVENT_DATE for EVENT_NAME only)")
+    args = parser.parse_args()
+    compact = False if args.no_compact else None
+    
+    if args.paths:
+        success = import_event_files(args.paths, args.method, args.batch_size, args.chunksize, args.mode,
+                                     compact, args.workers, args.per_file, args.event, args.event_date)
+        print("\n✅ Import completed successfully!" if success else "\n❌ Import failed. Check the error messages above.")
+        raise SystemExit(0 if success else 1)
+    
     print("Event Data Import Tool")
     print("=" * 50)
     print("⚠️  IMPORTANT: This tool processes event registration data.")
     print("   Make sure your CSV file contains participant information.")
-    print("   The database will be cleared and repopulated.")
+    print("   The events in the file will be cleared and repopulated; other events are kept.")
     print()
     
     # Allow user to specify different file
@@ -228,10 +1045,11 @@ if __name__ == "__main__":
     # Confirm before proceeding
     confirm = input(f"Import data from '{csv_path}'? (y/N): ").strip().lower()
     if confirm == 'y':
-        success = import_event_data(csv_path)
+        success = import_event_data(csv_path, args.method, args.batch_size, args.chunksize, args.mode, compact,
+                                    args.event, args.event_date)
         if success:
             print("\n✅ Import completed successfully!")
         else:
             print("\n❌ Import failed. Check the error messages above.")
     else:
-        print("Import cancelled.")
\ No newline at end of file
+        print("Import cancelled.")
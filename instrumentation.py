@@ -0,0 +1,186 @@
+import os
+import io
+import re
+import json
+import time
+import uuid
+import pstats
+import cProfile
+import tracemalloc
+from datetime import datetime
+from contextlib import contextmanager
+from config import INSTRUMENTATION_CONFIG
+
+# Spans recorded by the current run; plain dicts so they serialize as JSON lines
+_spans = []
+_run = {'id': None, 'script': None}
+
+def enabled():
+    """True when spans should be recorded (INSTRUMENT is 'summary', 'jsonl' or 'both')"""
+    return bool(INSTRUMENTATION_CONFIG['output'])
+
+def record(name, seconds, rows=None, nbytes=None, **fields):
+    """Record an already-timed span"""
+    if not enabled():
+        return
+    span = {'name': name, 'seconds': seconds}
+    if rows is not None:
+        span['rows'] = int(rows)
+    if nbytes is not None:
+        span['bytes'] = int(nbytes)
+    span.update(fields)
+    _spans.append(span)
+
+@contextmanager
+def span(name, rows=None, nbytes=None, **fields):
+    """
+    Time the enclosed block as one span
+
+    Yields a dict; set 'rows' or 'nbytes' (or any other field) on it when the
+    counts are only known inside the block.
+    """
+    if not enabled():
+        yield {}
+        return
+    details = {'rows': rows, 'nbytes': nbytes, **fields}
+    started = time.perf_counter()
+    try:
+        yield details
+    finally:
+        record(name, time.perf_counter() - started, **details)
+
+def statement_name(sql):
+    """Short label grouping executions of the same statement (e.g. 'sql INSERT INTO attendees')"""
+    sql = str(sql)
+    words = sql.split()
+    if words and words[0].upper() == 'SELECT':
+        table = re.search(r'\bFROM\s+(\w+)', sql, re.IGNORECASE)
+        return f"sql SELECT ... FROM {table.group(1) if table else '?'}"
+    return 'sql ' + ' '.join(words[:3])[:60]
+
+class InstrumentedCursor:
+    """Cursor wrapper recording a span per execute/executemany"""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, sql, *args, **kwargs):
+        with span(statement_name(sql)) as details:
+            result = self._cursor.execute(sql, *args, **kwargs)
+            if self._cursor.rowcount >= 0:
+                details['rows'] = self._cursor.rowcount
+        return result
+
+    def executemany(self, sql, seq_params, *args, **kwargs):
+        seq_params = list(seq_params)
+        with span(statement_name(sql), rows=len(seq_params)):
+            return self._cursor.executemany(sql, seq_params, *args, **kwargs)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+def instrument_cursor(cursor):
+    """Wrap a DB-API cursor so its statements are timed (no-op when disabled)"""
+    return InstrumentedCursor(cursor) if enabled() else cursor
+
+def summarize(spans=None):
+    """Aggregate spans by name, in order of first appearance"""
+    totals = {}
+    for span in _spans if spans is None else spans:
+        total = totals.setdefault(span['name'], {'name': span['name'], 'calls': 0, 'seconds': 0.0,
+                                                 'rows': None, 'bytes': None})
+        total['calls'] += 1
+        total['seconds'] += span['seconds']
+        for key in ('rows', 'bytes'):
+            if span.get(key) is not None:
+                total[key] = (total[key] or 0) + span[key]
+    return list(totals.values())
+
+def print_summary(spans=None):
+    """Print a table of time, calls, rows and bytes per span name"""
+    totals = summarize(spans)
+    if not totals:
+        return
+    print(f"\n⏱  Stage timings ({_run['script']})")
+    print(f"  {'stage':<46} {'calls':>6} {'seconds':>9} {'rows':>10} {'rows/s':>10} {'MB':>8}")
+    for total in totals:
+        rows = f"{total['rows']:,}" if total['rows'] is not None else '-'
+        rate = (f"{total['rows'] / total['seconds']:,.0f}"
+                if total['rows'] and total['seconds'] > 0 else '-')
+        size = f"{total['bytes'] / 1e6:.1f}" if total['bytes'] is not None else '-'
+        print(f"  {total['name'][:46]:<46} {total['calls']:>6} {total['seconds']:9.3f} {rows:>10} {rate:>10} {size:>8}")
+
+def write_json_lines(path=None, spans=None):
+    """Append one JSON object per span, tagged with the run id and script"""
+    path = path or INSTRUMENTATION_CONFIG['log_path']
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'a') as f:
+        for span in _spans if spans is None else spans:
+            f.write(json.dumps({'run': _run['id'], 'script': _run['script'], **span}, default=str) + '\n')
+    print(f"📁 Instrumentation written to {path}")
+
+@contextmanager
+def profiled(label):
+    """
+    Capture a cProfile and/or tracemalloc profile of the enclosed block
+
+    Enabled by INSTRUMENTATION_CONFIG['profile'] ('cprofile', 'tracemalloc'
+    or 'both'). cProfile stats are saved under the profile directory and the
+    top functions printed; tracemalloc reports the peak and top allocation sites.
+    """
+    mode = INSTRUMENTATION_CONFIG['profile']
+    use_cprofile = mode in ('cprofile', 'both')
+    use_tracemalloc = mode in ('tracemalloc', 'both')
+    if not (use_cprofile or use_tracemalloc):
+        yield
+        return
+
+    profiler = cProfile.Profile() if use_cprofile else None
+    if use_tracemalloc:
+        tracemalloc.start()
+    if profiler:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler:
+            profiler.disable()
+            directory = INSTRUMENTATION_CONFIG['profile_dir']
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"{label}_{datetime.now():%Y%m%d_%H%M%S}.prof")
+            profiler.dump_stats(path)
+            output = io.StringIO()
+            pstats.Stats(profiler, stream=output).sort_stats('cumulative').print_stats(15)
+            print(f"\n🔎 cProfile ({label}), saved to {path}")
+            print(output.getvalue())
+        if use_tracemalloc:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"\n🔎 tracemalloc ({label}): peak {peak / 1e6:.1f} MB traced")
+            for stat in snapshot.statistics('lineno')[:10]:
+                print(f"  {stat}")
+
+@contextmanager
+def run(script):
+    """
+    Instrument one script run: collect spans, profile if requested, then
+    report them as a summary table and/or JSON lines
+    """
+    _spans.clear()
+    _run.update(id=uuid.uuid4().hex[:12], script=script)
+    try:
+        with profiled(script):
+            with span('total'):
+                yield
+    finally:
+        output = INSTRUMENTATION_CONFIG['output']
+        if output in ('summary', 'both'):
+            print_summary()
+        if output in ('jsonl', 'both'):
+            write_json_lines()
@@ -0,0 +1,419 @@
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import selectors
+from datetime import datetime
+import pandas as pd
+import db
+import events
+import rollups
+import chart_data
+import instrumentation
+from db import database_connection
+from import_csv import CHECKIN_COLUMNS, MAPPED_CHECKPOINTS, DATETIME_FORMAT, checkpoint_name, clean_datetime
+
+LIVE_METRICS_PATH = 'results/live_metrics.json'
+
+# Checkpoint name -> attendees flag column, for the checkpoints exported as columns
+CHECKPOINT_COLUMNS = {checkpoint: column for column, checkpoint in MAPPED_CHECKPOINTS.items()}
+
+# Checkpoints summed into attendees.total_checkins, and the venue entry checkpoint
+ENGAGEMENT_CHECKPOINTS = {MAPPED_CHECKPOINTS[column] for column in CHECKIN_COLUMNS}
+VENUE_CHECKPOINT = MAPPED_CHECKPOINTS['venue_checkin']
+
+# Pause between polls of an idle source; sources yield None while idle so
+# pending check-ins are still flushed on time
+POLL_INTERVAL = 0.2
+
+# Seconds to wait before retrying a batch whose write failed
+RETRY_INTERVAL = 5.0
+
+def parse_event(line):
+    """
+    Parse one check-in event
+
+    Accepts JSON ({"number": 12, "checkpoint": "Saturday Lunch", "at": "..."})
+    or comma-separated text (12,Saturday Lunch[,2025-04-19 12:03:00]). The
+    checkpoint may also be given as its attendees column (saturday_lunch_checkin).
+    Timestamps are normalized like the importer's dates (offsets dropped,
+    DATETIME_FORMAT); events without one are stamped with the current time.
+
+    Returns:
+        tuple: (attendee number, checkpoint, checked-in timestamp), or None if invalid
+    """
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        if line.startswith('{'):
+            event = json.loads(line)
+            number, checkpoint, at = event['number'], event['checkpoint'], event.get('at')
+        else:
+            parts = [part.strip() for part in line.split(',')]
+            number, checkpoint, at = parts[0], parts[1], parts[2] if len(parts) > 2 else None
+        number = int(number)
+    except (ValueError, KeyError, IndexError, TypeError):
+        return None
+    checkpoint = MAPPED_CHECKPOINTS.get(checkpoint) or checkpoint_name(str(checkpoint))
+    if not checkpoint:
+        return None
+    if at is None or at == '':
+        return number, checkpoint, datetime.now().strftime(DATETIME_FORMAT)
+    at = clean_datetime(at)
+    if at is None:
+        return None
+    return number, checkpoint, at
+
+def tail_file(path, from_start=False):
+    """Yield lines appended to a file ('-' reads stdin), or None while there are none"""
+    if path == '-':
+        yield from sys.stdin
+        return
+    with open(path, encoding='utf-8') as f:
+        if not from_start:
+            f.seek(0, os.SEEK_END)
+        partial = ''
+        while True:
+            line = f.readline()
+            if not line:
+                yield None
+                time.sleep(POLL_INTERVAL)
+                continue
+            partial += line
+            if partial.endswith('\n'):
+                yield partial
+                partial = ''
+
+def listen_socket(host, port):
+    """Accept TCP clients sending newline-delimited events; yield lines, or None while idle"""
+    selector = selectors.DefaultSelector()
+    server = socket.create_server((host, port))
+    server.setblocking(False)
+    selector.register(server, selectors.EVENT_READ, data=None)
+    print(f"Listening for check-ins on {host}:{port}")
+    buffers = {}
+    try:
+        while True:
+            ready = selector.select(timeout=POLL_INTERVAL)
+            if not ready:
+                yield None
+            for key, _ in ready:
+                if key.data is None:
+                    client, _ = server.accept()
+                    client.setblocking(False)
+                    selector.register(client, selectors.EVENT_READ, data=b'')
+                    buffers[client] = b''
+                    continue
+                client = key.fileobj
+                data = client.recv(65536)
+                *lines, rest = (buffers.pop(client, b'') + (data or b'\n')).split(b'\n')
+                if data:
+                    buffers[client] = rest
+                else:
+                    # Disconnected: its last unterminated line was flushed above
+                    selector.unregister(client)
+                    client.close()
+                for line in lines:
+                    yield line.decode('utf-8', errors='replace')
+    finally:
+        selector.close()
+        server.close()
+
+class LiveCounters:
+    """
+    Running dashboard numbers, updated in memory as check-ins are accepted
+
+    Loaded once from the event's checkpoint counts and per-domain rollup, so
+    the meal and executive dashboard frames never need another query.
+    """
+
+    def __init__(self, checkpoint_counts, total_reg, attendance, revenue, universities, total_checkins):
+        self.checkpoints = dict(checkpoint_counts)
+        self.total_reg = total_reg
+        self.attendance = attendance
+        self.revenue = revenue
+        self.universities = universities
+        self.total_checkins = total_checkins
+        self.updated = datetime.now()
+
+    @classmethod
+    def load(cls, connection, event_id):
+        """Initialize from an event's CHECKPOINT_QUERY counts and rollup_university_domains rows"""
+        queries = chart_data.input_queries(['checkpoints', 'domains'], event_id)
+        counts = pd.read_sql(queries['checkpoints'], connection)
+        domains = chart_data.prepare_rollups({'domains': pd.read_sql(queries['domains'], connection)})['domains']
+        return cls(
+            {row.checkpoint: int(row.attended) for row in counts.itertuples()},
+            total_reg=int(domains['attendees'].sum()),
+            attendance=int(domains['venue_checkins'].sum()),
+            revenue=float(domains['revenue'].sum()),
+            universities=int(domains['university'].nunique()),
+            total_checkins=int(domains['total_checkins'].sum()),
+        )
+
+    def add(self, checkpoint):
+        """Count one newly recorded check-in"""
+        self.checkpoints[checkpoint] = self.checkpoints.get(checkpoint, 0) + 1
+        if checkpoint in ENGAGEMENT_CHECKPOINTS:
+            self.total_checkins += 1
+        if checkpoint == VENUE_CHECKPOINT:
+            self.attendance += 1
+        self.updated = datetime.now()
+
+    def meal_frame(self):
+        """Chart 5 dataset (chart_data.meal_analysis) from the counters"""
+        counts = pd.DataFrame(list(self.checkpoints.items()), columns=['checkpoint', 'attended'])
+        return chart_data.meal_analysis(counts, self.total_reg)
+
+    def executive_frame(self):
+        """Chart 7 dataset (chart_data.executive_metrics) from the counters"""
+        total = self.total_reg
+        return pd.DataFrame([{
+            'total_reg': total,
+            'attendance': self.attendance,
+            'attend_rate': float(chart_data.sql_round(self.attendance * 100.0 / total, 1)) if total else 0.0,
+            'revenue': self.revenue,
+            'universities': self.universities,
+            'avg_engagement': float(chart_data.sql_round(self.total_checkins / total, 2)) if total else 0.0,
+        }])
+
+    def metrics(self):
+        """Everything the dashboard shows, as a JSON-serializable dict"""
+        return {
+            'updated': self.updated.strftime(DATETIME_FORMAT),
+            'executive': self.executive_frame().to_dict(orient='records')[0],
+            'meals': self.meal_frame().to_dict(orient='records'),
+            'checkpoints': dict(sorted(self.checkpoints.items())),
+        }
+
+    def write(self, path=LIVE_METRICS_PATH):
+        """Atomically replace the metrics file read by the dashboard"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.metrics(), f, indent=2, default=float)
+        os.replace(tmp_path, path)
+
+class CheckinWriter:
+    """
+    Buffer one event's check-ins and write them in batches
+
+    Attendee numbers are those of event_id. Each flush records new check-ins
+    in attendee_checkins, sets the matching
+    *_checkin flags on attendees, moves the affected attendees' rollup
+    contributions and commits once. Repeated check-ins (same attendee and
+    checkpoint) and unknown attendee numbers are counted and dropped. A batch
+    whose write fails is rolled back and kept pending, and retried after
+    RETRY_INTERVAL seconds.
+    """
+
+    def __init__(self, connection, counters, event_id, batch_size=200, flush_interval=1.0):
+        self.connection = connection
+        self.cursor = instrumentation.instrument_cursor(connection.cursor())
+        self.counters = counters
+        self.event_id = event_id
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.pending = []
+        self.oldest = None
+        self.retry_at = None
+        self.stats = {'received': 0, 'invalid': 0, 'recorded': 0, 'duplicates': 0, 'unknown': 0,
+                      'write_errors': 0}
+        self.cursor.execute(db.adapt_sql(
+            "SELECT attendee_number, checkpoint FROM attendee_checkins WHERE event_id = %s"
+        ), (event_id,))
+        self.seen = set(self.cursor.fetchall())
+
+    def add(self, event):
+        """Queue one parsed event (or count an invalid one)"""
+        self.stats['received'] += 1
+        if event is None:
+            self.stats['invalid'] += 1
+            return
+        if not self.pending:
+            self.oldest = time.monotonic()
+        self.pending.append(event)
+
+    def due(self):
+        """True when the batch is full or the oldest pending event has waited long enough"""
+        if self.retry_at is not None and time.monotonic() < self.retry_at:
+            return False
+        if len(self.pending) >= self.batch_size:
+            return True
+        return bool(self.pending) and time.monotonic() - self.oldest >= self.flush_interval
+
+    def _existing_attendees(self, numbers):
+        placeholders = ', '.join(['%s'] * len(numbers))
+        self.cursor.execute(db.adapt_sql(
+            f"SELECT number FROM attendees WHERE event_id = %s AND number IN ({placeholders})"
+        ), (self.event_id,) + tuple(numbers))
+        return {number for (number,) in self.cursor.fetchall()}
+
+    def flush(self):
+        """Write pending events; returns the number of new check-ins recorded"""
+        batch, self.pending = self.pending, []
+        new = {}
+        for number, checkpoint, at in batch:
+            key = (number, checkpoint)
+            if key in self.seen or key in new:
+                self.stats['duplicates'] += 1
+            else:
+                new[key] = at
+        if not new:
+            return 0
+
+        with instrumentation.span('live flush', rows=len(new)):
+            try:
+                known = self._existing_attendees(sorted({number for number, _ in new}))
+                unknown = [key for key in new if key[0] not in known]
+                for key in unknown:
+                    del new[key]
+                # Counted now: a failed write only re-queues the known attendees' check-ins
+                self.stats['unknown'] += len(unknown)
+                if new:
+                    self._write(new)
+            except db.DatabaseError as e:
+                self.connection.rollback()
+                self.pending = [(number, checkpoint, at) for (number, checkpoint), at in new.items()]
+                self.oldest = time.monotonic()
+                self.retry_at = self.oldest + RETRY_INTERVAL
+                self.stats['write_errors'] += 1
+                print(f"⚠️  Writing {len(new)} check-ins failed ({e}); retrying in {RETRY_INTERVAL:.0f}s")
+                return 0
+            self.retry_at = None
+
+        for number, checkpoint in new:
+            self.counters.add(checkpoint)
+        self.seen.update(new)
+        self.stats['recorded'] += len(new)
+        return len(new)
+
+    def _write(self, new):
+        """Record new check-ins ({(number, checkpoint): timestamp}) and their flags and rollups in one commit"""
+        # Attendees whose flag columns (and so rollup contributions) change
+        flagged = {}
+        for number, checkpoint in new:
+            if checkpoint in CHECKPOINT_COLUMNS:
+                flagged.setdefault(CHECKPOINT_COLUMNS[checkpoint], []).append(number)
+        affected = [(self.event_id, number)
+                    for number in sorted({number for numbers in flagged.values() for number in numbers})]
+        before = rollups.load_contributions(self.cursor, affected) if affected else None
+
+        self.cursor.executemany(db.adapt_sql(
+            "INSERT IGNORE INTO attendee_checkins (event_id, attendee_number, checkpoint, checked_in_at) "
+            "VALUES (%s, %s, %s, %s)"
+        ), [(self.event_id, number, checkpoint, at) for (number, checkpoint), at in new.items()])
+        for column, numbers in flagged.items():
+            placeholders = ', '.join(['%s'] * len(numbers))
+            self.cursor.execute(db.adapt_sql(
+                f"UPDATE attendees SET {column} = 1 WHERE event_id = %s AND number IN ({placeholders})"
+            ), (self.event_id,) + tuple(numbers))
+        if affected:
+            after = rollups.load_contributions(self.cursor, affected)
+            rollups.accumulate(self.cursor, rollups.combine(
+                [rollups.aggregate(before, sign=-1), rollups.aggregate(after)]))
+        # Committed with the check-ins, so cached charts and the snapshot are invalidated
+        db.bump_data_version(self.cursor)
+        self.connection.commit()
+
+    def close(self):
+        self.cursor.close()
+
+def render_dashboard(counters, event_name=None):
+    """Re-render the meal and executive charts from the counters (unchanged charts are skipped)"""
+    import create_visualizations as charts
+    import render_cache
+    for name, df in (('chart5_meal_analysis', counters.meal_frame()),
+                     ('chart7_executive_dashboard', counters.executive_frame())):
+        key = charts.chart_signature(name, df, event_name=event_name)
+        if not render_cache.is_current(name, key, charts.CHART_DIR):
+            os.makedirs(charts.CHART_DIR, exist_ok=True)
+            _, seconds, error = charts.render_chart(name, df, key, event_name=event_name)
+            if error:
+                print(f"⚠️  {name} failed: {error}")
+
+def ingest(lines, batch_size=200, flush_interval=1.0, metrics_path=LIVE_METRICS_PATH,
+           render_interval=None, max_events=None, event=None):
+    """
+    Ingest one event's check-ins until the source ends (or max_events are received)
+
+    Args:
+        lines (iterable): Event lines; None items mark idle polls
+        batch_size (int): Events written per batch
+        flush_interval (float): Seconds a pending event may wait before a flush
+        metrics_path (str): JSON file rewritten with the dashboard metrics after each flush
+        render_interval (float): Re-render charts 5 and 7 at most this often (None = never)
+        max_events (int): Stop after this many events (for tests and replays)
+        event (str): Event the attendee numbers belong to. Defaults to the
+            event with the latest registrations.
+
+    Returns:
+        dict: Event counts (received, invalid, recorded, duplicates, unknown, write_errors)
+
+    Raises:
+        ValueError: If the event is unknown or nothing has been imported
+    """
+    with database_connection() as connection:
+        cursor = connection.cursor()
+        event_id, event_name = events.resolve_event(cursor, event)
+        cursor.close()
+        print(f"Recording check-ins for {event_name}")
+        counters = LiveCounters.load(connection, event_id)
+        counters.write(metrics_path)
+        writer = CheckinWriter(connection, counters, event_id, batch_size, flush_interval)
+        last_render = 0.0
+        try:
+            for line in lines:
+                if line is not None and line.strip():
+                    writer.add(parse_event(line))
+                if writer.due() and writer.flush():
+                    counters.write(metrics_path)
+                    if render_interval is not None and time.monotonic() - last_render >= render_interval:
+                        render_dashboard(counters, event_name)
+                        last_render = time.monotonic()
+                if max_events and writer.stats['received'] >= max_events:
+                    break
+        except KeyboardInterrupt:
+            print("\nStopping...")
+        finally:
+            if writer.pending and writer.flush():
+                counters.write(metrics_path)
+                if render_interval is not None:
+                    render_dashboard(counters, event_name)
+            writer.close()
+    stats = writer.stats
+    print(f"Received {stats['received']} events: {stats['recorded']} check-ins recorded, "
+          f"{stats['duplicates']} duplicates, {stats['unknown']} unknown attendees, {stats['invalid']} invalid")
+    if writer.pending:
+        print(f"⚠️  {len(writer.pending)} check-ins could not be written after {stats['write_errors']} failed attempts")
+    return stats
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record live check-ins and keep dashboard metrics current")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--file', help="follow a file of events, one per line ('-' reads stdin)")
+    source.add_argument('--listen', metavar='HOST:PORT', help="accept events over TCP, one per line")
+    parser.add_argument('--from-start', action='store_true', help="with --file, also ingest lines already in the file")
+    parser.add_argument('--batch-size', type=int, default=200, help="events written per batch (default 200)")
+    parser.add_argument('--flush-interval', type=float, default=1.0,
+                        help="seconds a pending event may wait before it is written (default 1)")
+    parser.add_argument('--metrics', default=LIVE_METRICS_PATH, help=f"metrics JSON file (default {LIVE_METRICS_PATH})")
+    parser.add_argument('--render-interval', type=float,
+                        help="re-render the meal and executive charts at most every N seconds")
+    parser.add_argument('--event', help="event the check-ins belong to (default: the event with the latest registrations)")
+    args = parser.parse_args()
+
+    if args.file:
+        lines = tail_file(args.file, from_start=args.from_start)
+    else:
+        host, _, port = args.listen.rpartition(':')
+        lines = listen_socket(host or '0.0.0.0', int(port))
+    try:
+        ingest(lines, args.batch_size, args.flush_interval, args.metrics, args.render_interval, event=args.event)
+    except ValueError as e:
+        parser.error(str(e))
@@ -0,0 +1,94 @@
+import os
+import re
+import hashlib
+import pandas as pd
+import db
+from config import QUERY_CACHE_CONFIG
+
+def normalize_query(query):
+    """Collapse whitespace and drop trailing semicolons so formatting doesn't change the key"""
+    return re.sub(r'\s+', ' ', query).strip().rstrip(';').strip()
+
+def data_fingerprint(connection):
+    """
+    Return a string identifying the current version of the data
+    
+    This is the data_version counter every writer bumps with its changes, so
+    a lookup costs one primary key read rather than scanning the tables.
+    """
+    cursor = connection.cursor()
+    try:
+        return db.data_version(cursor)
+    finally:
+        cursor.close()
+
+def cache_key(query, fingerprint):
+    """Hash the normalized query text together with the data version"""
+    text = f"{fingerprint}\n{normalize_query(query)}"
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+# Entries are Feather files: columnar, fast to read back, and unlike pickles
+# safe to load from a shared directory since reading them runs no code
+ENTRY_SUFFIX = '.feather'
+
+def _entry_path(key, directory):
+    return os.path.join(directory, f"{key}{ENTRY_SUFFIX}")
+
+def load(key, directory=None):
+    """Return the cached dataframe for key, or None on a miss"""
+    path = _entry_path(key, directory or QUERY_CACHE_CONFIG['directory'])
+    try:
+        df = pd.read_feather(path)
+    except (OSError, ValueError):
+        return None
+    # Touch the entry so eviction drops the least recently used results first
+    os.utime(path)
+    return df
+
+def store(key, df, directory=None, max_bytes=None):
+    """
+    Write a result to the cache atomically, then evict down to the size limit
+
+    Results Feather can't store (columns mixing value types) are not cached.
+    """
+    directory = directory or QUERY_CACHE_CONFIG['directory']
+    os.makedirs(directory, exist_ok=True)
+    path = _entry_path(key, directory)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        df.reset_index(drop=True).to_feather(tmp_path)
+    except (TypeError, ValueError):
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return
+    os.replace(tmp_path, path)
+    evict(directory, max_bytes or QUERY_CACHE_CONFIG['max_bytes'])
+
+def evict(directory=None, max_bytes=None):
+    """Delete least recently used entries until the cache fits in max_bytes"""
+    directory = directory or QUERY_CACHE_CONFIG['directory']
+    max_bytes = max_bytes or QUERY_CACHE_CONFIG['max_bytes']
+    entries = []
+    for entry in os.scandir(directory):
+        if entry.name.endswith(ENTRY_SUFFIX):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+def cached_read_sql(query, connection):
+    """Run query through the cache, keyed on its text and the current data version"""
+    key = cache_key(query, data_fingerprint(connection))
+    df = load(key)
+    if df is None:
+        df = pd.read_sql(query, connection)
+        store(key, df)
+    return df
@@ -0,0 +1,49 @@
+import os
+import json
+import hashlib
+
+# Sidecar written next to a chart's files, recording what they were rendered from
+SIDECAR_SUFFIX = '.render.json'
+
+def signature(df, *parts):
+    """
+    Hash a chart's input dataframe together with anything else that affects
+    its output (function source, render settings, library versions)
+    """
+    import pandas as pd
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode('utf-8'))
+        digest.update(b'\0')
+    digest.update(repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()]).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+def _sidecar_path(name, directory):
+    return os.path.join(directory, f".{name}{SIDECAR_SUFFIX}")
+
+def is_current(name, key, directory):
+    """True if the chart was last rendered from `key` and its files still exist"""
+    try:
+        with open(_sidecar_path(name, directory)) as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return False
+    files = entry.get('files') or []
+    return entry.get('signature') == key and bool(files) and all(os.path.exists(path) for path in files)
+
+def store(name, key, files, directory):
+    """Record the signature and files of a successful render (atomically)"""
+    os.makedirs(directory, exist_ok=True)
+    path = _sidecar_path(name, directory)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({'signature': key, 'files': files}, f)
+    os.replace(tmp_path, path)
+
+def invalidate(name, directory):
+    """Forget a chart's render so it is redrawn next time"""
+    try:
+        os.remove(_sidecar_path(name, directory))
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,232 @@
+import argparse
+import numpy as np
+import pandas as pd
+import db
+
+# Engagement tiers used by chart 2, by minimum total check-ins
+ENGAGEMENT_TIERS = [
+    (4, 'High (4+ meals)'),
+    (2, 'Medium (2-3 meals)'),
+    (1, 'Low (1 meal)'),
+    (0, 'None (0 meals)'),
+]
+
+# Rollup tables: key column (within an event) and the counters summed into them.
+# Every table is keyed on (event_id, key).
+ROLLUP_TABLES = {
+    'rollup_daily_registrations': ('registration_date', ['registrations']),
+    'rollup_university_domains': ('email_domain', ['attendees', 'total_checkins', 'venue_checkins', 'revenue']),
+    'rollup_engagement_tiers': ('engagement_level', ['participants', 'total_checkins',
+                                                     'priced_participants', 'total_price']),
+}
+
+# Counters holding money amounts; all others are integer counts
+MONEY_COUNTERS = {'revenue', 'total_price'}
+
+# Stored attendee columns needed to work out a row's current rollup contribution
+CONTRIBUTION_COLUMNS = ['event_id', 'number', 'ticket_created_date', 'email_domain', 'total_checkins',
+                        'price', 'venue_checkin']
+
+# The same aggregates as aggregate(), computed in the database from every stored
+# row of one event (%s = event_id). sql/02_data_import.sql runs these too, as
+# the SQL import path has no importer to maintain the rollups.
+REBUILD_QUERIES = {
+    'rollup_daily_registrations': """
+        INSERT INTO rollup_daily_registrations (event_id, registration_date, registrations, cumulative)
+        SELECT event_id, DATE(ticket_created_date), COUNT(*),
+               SUM(COUNT(*)) OVER (ORDER BY DATE(ticket_created_date))
+        FROM attendees
+        WHERE event_id = %s AND ticket_created_date IS NOT NULL
+        GROUP BY event_id, DATE(ticket_created_date)
+    """,
+    'rollup_university_domains': """
+        INSERT INTO rollup_university_domains (event_id, email_domain, attendees, total_checkins,
+                                               venue_checkins, revenue)
+        SELECT event_id, COALESCE(email_domain, ''), COUNT(*), COALESCE(SUM(total_checkins), 0),
+               COALESCE(SUM(venue_checkin), 0), ROUND(COALESCE(SUM(price), 0), 2)
+        FROM attendees
+        WHERE event_id = %s
+        GROUP BY event_id, COALESCE(email_domain, '')
+    """,
+    'rollup_engagement_tiers': f"""
+        INSERT INTO rollup_engagement_tiers (event_id, engagement_level, participants, total_checkins,
+                                             priced_participants, total_price)
+        SELECT event_id, engagement_level, COUNT(*), SUM(checkins), COUNT(price), ROUND(COALESCE(SUM(price), 0), 2)
+        FROM (
+            SELECT event_id, price, COALESCE(total_checkins, 0) AS checkins,
+                   CASE {' '.join(f"WHEN COALESCE(total_checkins, 0) >= {minimum} THEN '{label}'"
+                             for minimum, label in ENGAGEMENT_TIERS[:-1])}
+                        ELSE '{ENGAGEMENT_TIERS[-1][1]}' END AS engagement_level
+            FROM attendees
+            WHERE event_id = %s
+        ) tiers
+        GROUP BY event_id, engagement_level
+    """,
+}
+
+def engagement_level(total_checkins):
+    """Engagement tier label for each total check-in count"""
+    checkins = np.asarray(total_checkins, dtype=float)
+    return np.select([checkins >= minimum for minimum, _ in ENGAGEMENT_TIERS[:-1]],
+                     [label for _, label in ENGAGEMENT_TIERS[:-1]],
+                     default=ENGAGEMENT_TIERS[-1][1])
+
+def aggregate(attendees, sign=1):
+    """
+    Aggregate attendee rows into rollup deltas
+    
+    Args:
+        attendees (DataFrame): One row per attendee with event_id, ticket_created_date,
+            email_domain, total_checkins, price and venue_checkin
+        sign (int): 1 to add the rows' contribution, -1 to remove it
+        
+    Returns:
+        dict: rollup table name -> DataFrame of key and counter deltas
+    """
+    created = pd.to_datetime(attendees['ticket_created_date'], errors='coerce')
+    checkins = pd.to_numeric(attendees['total_checkins'], errors='coerce').fillna(0).astype(float)
+    price = pd.to_numeric(attendees['price'], errors='coerce').astype(float)
+    facts = pd.DataFrame({
+        'event_id': pd.to_numeric(attendees['event_id']).astype('int64'),
+        'registration_date': created.dt.strftime('%Y-%m-%d'),
+        'email_domain': attendees['email_domain'].fillna('').astype(str),
+        'engagement_level': engagement_level(checkins),
+        'total_checkins': checkins,
+        'venue_checkins': pd.to_numeric(attendees['venue_checkin'], errors='coerce').fillna(0).astype(float),
+        'priced': price.notna().astype(int),
+        'price': price.fillna(0),
+    })
+    
+    daily = facts.dropna(subset=['registration_date']).groupby(['event_id', 'registration_date']).size()
+    domains = facts.groupby(['event_id', 'email_domain']).agg(
+        attendees=('total_checkins', 'size'),
+        total_checkins=('total_checkins', 'sum'),
+        venue_checkins=('venue_checkins', 'sum'),
+        revenue=('price', 'sum'),
+    )
+    tiers = facts.groupby(['event_id', 'engagement_level']).agg(
+        participants=('total_checkins', 'size'),
+        total_checkins=('total_checkins', 'sum'),
+        priced_participants=('priced', 'sum'),
+        total_price=('price', 'sum'),
+    )
+    return {
+        'rollup_daily_registrations': (daily.rename('registrations') * sign).reset_index(),
+        'rollup_university_domains': (domains * sign).reset_index(),
+        'rollup_engagement_tiers': (tiers * sign).reset_index(),
+    }
+
+def combine(deltas):
+    """Sum a list of aggregate() results into one delta per rollup key"""
+    combined = {}
+    for table, (key, counters) in ROLLUP_TABLES.items():
+        frames = [delta[table] for delta in deltas if len(delta[table])]
+        if frames:
+            combined[table] = pd.concat(frames).groupby(['event_id', key], as_index=False)[counters].sum()
+        else:
+            combined[table] = pd.DataFrame(columns=['event_id', key] + counters)
+    return combined
+
+def load_contributions(cursor, attendees, batch_size=5000):
+    """
+    Fetch the stored rollup inputs of the given attendees (before they are overwritten)
+    
+    Args:
+        attendees (list): (event_id, number) pairs
+    """
+    by_event = {}
+    for event_id, number in attendees:
+        by_event.setdefault(int(event_id), []).append(int(number))
+    rows = []
+    for event_id, numbers in by_event.items():
+        for start in range(0, len(numbers), batch_size):
+            batch = numbers[start:start + batch_size]
+            placeholders = ', '.join(['%s'] * len(batch))
+            cursor.execute(db.adapt_sql(
+                f"SELECT {', '.join(CONTRIBUTION_COLUMNS)} FROM attendees "
+                f"WHERE event_id = %s AND number IN ({placeholders})"
+            ), (event_id,) + tuple(batch))
+            rows.extend(cursor.fetchall())
+    return pd.DataFrame(rows, columns=CONTRIBUTION_COLUMNS)
+
+def clear(cursor, transactional=False, event_id=None):
+    """Empty every rollup table, or only one event's rows (before a reload)"""
+    for table in ROLLUP_TABLES:
+        if event_id is None:
+            cursor.execute(db.truncate_sql(table, transactional))
+        else:
+            cursor.execute(db.adapt_sql(f"DELETE FROM {table} WHERE event_id = %s"), (event_id,))
+
+def apply(connection, cursor, deltas):
+    """Add combined deltas to the rollup tables (see accumulate) and commit"""
+    accumulate(cursor, deltas)
+    db.bump_data_version(cursor)
+    connection.commit()
+
+def accumulate(cursor, deltas):
+    """
+    Add combined deltas to the rollup tables, without committing
+    
+    Keys whose count drops to zero are removed, and the running cumulative
+    registration total is recomputed over the (small) daily table of each
+    event the deltas touch. For callers that write the rows the deltas
+    describe in the same transaction; they bump the data version and commit.
+    """
+    for table, (key, counters) in ROLLUP_TABLES.items():
+        delta = deltas[table]
+        if not len(delta):
+            continue
+        columns = ['event_id', key] + counters
+        placeholders = ', '.join(['%s'] * len(columns))
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+        sql += db.accumulate_clause(columns, ['event_id', key])
+        rows = [
+            (int(row[0]), row[1]) + tuple(round(float(value), 2) if col in MONEY_COUNTERS else int(round(value))
+                                          for col, value in zip(counters, row[2:]))
+            for row in delta[columns].itertuples(index=False, name=None)
+        ]
+        cursor.executemany(db.adapt_sql(sql), rows)
+        cursor.execute(f"DELETE FROM {table} WHERE {counters[0]} <= 0")
+    
+    for event_id in deltas['rollup_daily_registrations']['event_id'].unique():
+        cursor.execute(db.adapt_sql(
+            "SELECT registration_date, registrations FROM rollup_daily_registrations "
+            "WHERE event_id = %s ORDER BY registration_date"
+        ), (int(event_id),))
+        daily = cursor.fetchall()
+        cumulative = np.cumsum([registrations for _, registrations in daily])
+        cursor.executemany(db.adapt_sql(
+            "UPDATE rollup_daily_registrations SET cumulative = %s WHERE event_id = %s AND registration_date = %s"
+        ), [(int(total), int(event_id), date) for (date, _), total in zip(daily, cumulative)])
+
+def rebuild(connection, cursor, event_id):
+    """
+    Recompute an event's rollup rows from its stored attendees
+
+    Only needed when attendees was written without the importer (the SQL
+    import path or manual edits); the importer keeps the rollups current.
+    """
+    clear(cursor, event_id=event_id)
+    for query in REBUILD_QUERIES.values():
+        cursor.execute(db.adapt_sql(query), (event_id,))
+    db.bump_data_version(cursor)
+    connection.commit()
+
+if __name__ == "__main__":
+    import events
+    parser = argparse.ArgumentParser(description="Rebuild the rollup tables from attendees")
+    parser.add_argument('--event', help="only rebuild this event (default: every event)")
+    args = parser.parse_args()
+    with db.database_connection() as connection:
+        cursor = connection.cursor()
+        if args.event:
+            try:
+                rebuilt = [events.resolve_event(cursor, args.event)]
+            except ValueError as e:
+                parser.error(str(e))
+        else:
+            rebuilt = sorted((event_id, name) for name, event_id in events.load_events(cursor).items())
+        for event_id, name in rebuilt:
+            rebuild(connection, cursor, event_id)
+            print(f"🔄 Rebuilt the rollups of '{name}'")
+        cursor.close()
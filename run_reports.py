@@ -0,0 +1,369 @@
+import os
+import re
+import csv
+import json
+import time
+import argparse
+import hashlib
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import db
+from config import DATABASE_BACKEND, DATABASE_POOL_SIZE
+from db import database_connection
+
+REPORT_FILES = [
+    'sql/03_core_analytics.sql',
+    'sql/04_custom_queries.sql',
+    'sql/custom_queries.sql',
+    'sql/analytics_queries.sql',
+]
+REPORTS_DIR = 'results/reports'
+
+# Only read-only statements are run; schema and import statements in the
+# same files are listed as skipped
+REPORT_KEYWORDS = ('SELECT', 'WITH')
+
+# MySQL session counters of rows read by the storage engine
+HANDLER_STATUS = "SHOW SESSION STATUS LIKE 'Handler_read%'"
+
+def split_statements(text):
+    """
+    Split a SQL script into statements
+
+    Semicolons inside quotes and comments do not end a statement. Comments
+    are dropped from the statement text; the last '--' comment line before a
+    statement becomes its title.
+
+    Returns:
+        list: (line number, title, statement) tuples
+    """
+    statements = []
+    current, title, start_line, line = [], None, None, 1
+    last_comment = None
+    i, n = 0, len(text)
+    while i < n:
+        char = text[i]
+        if char == '-' and text.startswith('--', i):
+            end = text.find('\n', i)
+            end = n if end == -1 else end
+            comment = text[i + 2:end].strip(' -=')
+            if comment:
+                last_comment = comment
+            i = end
+            continue
+        if char == '/' and text.startswith('/*', i):
+            end = text.find('*/', i + 2)
+            end = n if end == -1 else end + 2
+            line += text.count('\n', i, end)
+            i = end
+            continue
+        if char in ("'", '"', '`'):
+            end = i + 1
+            while end < n and text[end] != char:
+                end += 2 if text[end] == '\\' else 1
+            end = min(end + 1, n)
+            if start_line is None:
+                start_line = line
+            current.append(text[i:end])
+            line += text.count('\n', i, end)
+            i = end
+            continue
+        if char == ';':
+            statement = ' '.join(''.join(current).split())
+            if statement:
+                statements.append((start_line, title, statement))
+            current, title, start_line, last_comment = [], None, None, None
+            i += 1
+            continue
+        if char == '\n':
+            line += 1
+        elif not char.isspace() and start_line is None:
+            start_line, title = line, last_comment
+            last_comment = None
+        current.append(char)
+        i += 1
+    statement = ' '.join(''.join(current).split())
+    if statement:
+        statements.append((start_line, title, statement))
+    return statements
+
+def is_report(sql):
+    """True for read-only report statements"""
+    return sql.split(None, 1)[0].upper() in REPORT_KEYWORDS
+
+def statement_id(sql):
+    """Stable id for comparing a statement across runs, whatever its position in the file"""
+    return hashlib.sha256(sql.encode('utf-8')).hexdigest()[:12]
+
+def load_indexes(connection):
+    """Indexes of every table, with their columns in key order: {table: {index name: [columns]}}"""
+    cursor = connection.cursor()
+    indexes = {}
+    try:
+        if DATABASE_BACKEND == 'sqlite':
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+            for (table,) in cursor.fetchall():
+                indexes.setdefault(table, {})
+                cursor.execute(f"PRAGMA index_list({table})")
+                for index in [row[1] for row in cursor.fetchall()]:
+                    cursor.execute(f"PRAGMA index_info({index})")
+                    indexes[table][index] = [row[2] for row in sorted(cursor.fetchall())]
+        else:
+            cursor.execute("SELECT TABLE_NAME FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE()")
+            for (table,) in cursor.fetchall():
+                indexes.setdefault(table, {})
+            cursor.execute("SELECT TABLE_NAME, COLUMN_NAME, INDEX_NAME FROM information_schema.STATISTICS "
+                           "WHERE TABLE_SCHEMA = DATABASE() ORDER BY SEQ_IN_INDEX")
+            for table, column, index in cursor.fetchall():
+                indexes.setdefault(table, {}).setdefault(index, []).append(column)
+    finally:
+        cursor.close()
+    return indexes
+
+# Words that can follow a table name without being its alias
+NOT_ALIASES = {'WHERE', 'JOIN', 'LEFT', 'RIGHT', 'INNER', 'OUTER', 'CROSS', 'ON', 'GROUP', 'ORDER',
+               'HAVING', 'LIMIT', 'UNION', 'USING'}
+
+def table_aliases(sql):
+    """Alias -> table for the FROM/JOIN clauses of a statement"""
+    aliases = {}
+    for table, alias in re.findall(r'\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?', sql, re.IGNORECASE):
+        if alias and alias.upper() not in NOT_ALIASES:
+            aliases[alias] = table
+    return aliases
+
+def explain(cursor, sql, tables):
+    """
+    Capture the query plan and the tables it reads in full
+
+    Args:
+        tables (iterable): Names of the database's tables; scans of derived
+            tables and subquery results are not reported
+
+    Returns:
+        tuple: (plan as a list of dicts, names of fully scanned tables)
+    """
+    if DATABASE_BACKEND == 'sqlite':
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        plan = [{'id': row[0], 'parent': row[1], 'detail': row[3]} for row in cursor.fetchall()]
+        # 'SCAN attendees' (or its alias) reads every row; 'SCAN ... USING INDEX' walks an index instead
+        aliases = table_aliases(sql)
+        scans = [re.match(r'SCAN (?:TABLE )?(\w+)$', step['detail']) for step in plan]
+        full = [aliases.get(match.group(1), match.group(1)) for match in scans if match]
+    else:
+        cursor.execute(f"EXPLAIN {sql}")
+        columns = [column[0] for column in cursor.description]
+        plan = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        full = [step['table'] for step in plan if step.get('type') == 'ALL' and step.get('table')]
+    return plan, [table for table in dict.fromkeys(full) if table in tables]
+
+# Column every attendee, check-in and rollup key leads with
+PARTITION_COLUMN = 'event_id'
+
+def binds_partition(sql, names):
+    """
+    True if the statement compares the partition column of a table (by name or
+    alias, or unqualified) with a value, subquery or list rather than with
+    another table's column, i.e. it reads only some events' range
+    """
+    qualifier = rf"(?:(?:{'|'.join(re.escape(name) for name in names)})\.)?"
+    column = rf"(?<![\w.]){qualifier}{PARTITION_COLUMN}\b"
+    other_column = rf"(?:\w+\.)?{PARTITION_COLUMN}\b"
+    return bool(re.search(rf"{column}\s*(?:=\s*(?!{other_column})|IN\s*\()", sql, re.IGNORECASE)
+                or re.search(rf"(?<![\w.])(?:\d+|%s|\?|'[^']*'|\))\s*=\s*{column}", sql, re.IGNORECASE))
+
+def scan_flags(sql, plan, full_scans, indexes):
+    """
+    Flag correlated subqueries (re-run for every outer row) and full scans
+
+    A full scan of an event-partitioned table (one whose composite keys lead
+    with event_id) is flagged unless the statement binds event_id, since it
+    reads every season. Once event_id is bound, the index's second column can
+    be looked up too, so a scan despite the statement using it (usually
+    wrapped in a function: DATE(ticket_created_date), DATEDIFF(...)) is
+    flagged. Other tables are checked on their indexes' leading columns.
+    """
+    flags = []
+    if any('CORRELATED' in str(step.get('detail', '')) or step.get('select_type') == 'DEPENDENT SUBQUERY'
+           for step in plan):
+        flags.append("correlated subquery")
+    aliases = table_aliases(sql)
+    for table in full_scans:
+        keys = [columns for columns in indexes.get(table, {}).values() if columns]
+        partitioned = any(columns[0] == PARTITION_COLUMN and len(columns) > 1 for columns in keys)
+        candidates = dict.fromkeys(
+            columns[1] if partitioned and columns[0] == PARTITION_COLUMN else columns[0]
+            for columns in keys if not (partitioned and columns == [PARTITION_COLUMN]))
+        used = [column for column in candidates
+                if column != PARTITION_COLUMN and re.search(rf'\b{re.escape(column)}\b', sql, re.IGNORECASE)]
+        names = [table] + [alias for alias, name in aliases.items() if name == table]
+        if partitioned and not binds_partition(sql, names):
+            note = f" (indexed with it: {', '.join(used)})" if used else ''
+            flags.append(f"full scan of {table} without an {PARTITION_COLUMN} predicate{note}")
+        elif used:
+            flags.append(f"full scan of {table} despite index on {', '.join(used)}")
+    return flags
+
+def handler_reads(cursor):
+    """Sum of the session's Handler_read_* counters (MySQL)"""
+    cursor.execute(HANDLER_STATUS)
+    return sum(int(value) for _, value in cursor.fetchall())
+
+def _result(entry, status):
+    return dict(entry, status=status, seconds=None, rows=None, rows_examined=None,
+                full_scans=[], flags=[], plan=[], error=None)
+
+def run_statement(entry, indexes, explain_plans=True):
+    """
+    Run one report statement on its own pooled connection
+
+    Rows examined are the change in the session's Handler_read_* counters
+    (MySQL only), less the reads of the status query itself.
+    """
+    result = _result(entry, 'ok')
+    try:
+        with database_connection() as connection:
+            cursor = connection.cursor()
+            try:
+                before = overhead = None
+                if DATABASE_BACKEND == 'mysql':
+                    before = handler_reads(cursor)
+                    overhead = handler_reads(cursor) - before
+                    before += overhead
+                started = time.perf_counter()
+                cursor.execute(entry['sql'])
+                rows = cursor.fetchall()
+                result['seconds'] = round(time.perf_counter() - started, 4)
+                result['rows'] = len(rows)
+                if before is not None:
+                    result['rows_examined'] = max(handler_reads(cursor) - before - overhead, 0)
+                if explain_plans:
+                    result['plan'], result['full_scans'] = explain(cursor, entry['sql'], indexes)
+                    result['flags'] = scan_flags(entry['sql'], result['plan'], result['full_scans'], indexes)
+            finally:
+                cursor.close()
+    except db.DatabaseError as e:
+        result['status'], result['error'] = 'error', str(e)
+    return result
+
+def collect_statements(paths):
+    """Report and skipped statements from the given SQL files, in file order"""
+    entries = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            statements = split_statements(f.read())
+        title = None
+        for line, comment, sql in statements:
+            # Section headers (SELECT 'REVENUE ANALYSIS' ...) share the title with the query after them
+            title = comment or title
+            entries.append({'file': path, 'line': line, 'title': title, 'id': statement_id(sql),
+                            'sql': sql, 'report': is_report(sql)})
+    return entries
+
+def print_report(results, previous=None):
+    """Print per-statement timings, slowest first, with scan flags and the change against a previous run"""
+    before = {result['id']: result for result in (previous or {}).get('statements', [])}
+    print(f"\n{'statement':<48} {'seconds':>8} {'rows':>7} {'examined':>10}  change  notes")
+    ran = [result for result in results if result['status'] != 'skipped']
+    for result in sorted(ran, key=lambda result: -(result['seconds'] or 0)):
+        name = f"{os.path.basename(result['file'])}:{result['line']} {result['title'] or ''}".strip()
+        seconds = f"{result['seconds']:.3f}" if result['seconds'] is not None else '-'
+        rows = f"{result['rows']:,}" if result['rows'] is not None else '-'
+        examined = f"{result['rows_examined']:,}" if result['rows_examined'] is not None else '-'
+        change = ''
+        old = before.get(result['id'])
+        if old and old.get('seconds') and result['seconds'] is not None:
+            change = f"{(result['seconds'] / old['seconds'] - 1) * 100:+.0f}%"
+        notes = result['error'] or '; '.join(result['flags'])
+        print(f"{name[:48]:<48} {seconds:>8} {rows:>7} {examined:>10}  {change:>6}  {notes}")
+    skipped = len(results) - len(ran)
+    failed = sum(result['status'] == 'error' for result in ran)
+    flagged = sum(bool(result['flags']) for result in ran)
+    print(f"\n{len(ran)} statements run ({failed} failed, {flagged} with flagged scans), "
+          f"{skipped} non-report statements skipped")
+
+def write_results(results, summary, output_dir=REPORTS_DIR):
+    """Save the run as JSON (with plans) and CSV (one row per statement)"""
+    os.makedirs(output_dir, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    json_path = os.path.join(output_dir, f"reports_{stamp}.json")
+    with open(json_path, 'w') as f:
+        json.dump({**summary, 'statements': results}, f, indent=2, default=str)
+
+    csv_path = os.path.join(output_dir, f"reports_{stamp}.csv")
+    columns = ['file', 'line', 'title', 'id', 'status', 'seconds', 'rows', 'rows_examined',
+               'full_scans', 'flags', 'error']
+    with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore')
+        writer.writeheader()
+        for result in results:
+            writer.writerow({**result, 'full_scans': ' '.join(result['full_scans']),
+                             'flags': '; '.join(result['flags'])})
+    print(f"📁 Results saved to {json_path} and {csv_path}")
+    return json_path
+
+def main(paths=None, workers=None, explain_plans=True, compare=None, output_dir=REPORTS_DIR):
+    """
+    Run the report statements of the SQL files and record how each performs
+
+    Args:
+        paths (list): SQL files to run. Defaults to REPORT_FILES.
+        workers (int): Statements run concurrently, each on its own pooled
+            connection. Defaults to DATABASE_POOL_SIZE.
+        explain_plans (bool): Capture EXPLAIN output and flag full scans
+        compare (str): Previous results JSON to compare statement times against
+        output_dir (str): Directory the JSON and CSV results are written to
+
+    Returns:
+        str: Path of the JSON results file
+    """
+    paths = paths or REPORT_FILES
+    entries = collect_statements(paths)
+    reports = [entry for entry in entries if entry['report']]
+    print(f"📊 Running {len(reports)} report statements from {len(paths)} files ({DATABASE_BACKEND})")
+
+    with database_connection() as connection:
+        indexes = load_indexes(connection)
+        cursor = connection.cursor()
+        cursor.execute("SELECT COUNT(*) FROM attendees")
+        attendees = cursor.fetchone()[0]
+        cursor.execute("SELECT name FROM events WHERE event_date IS NULL ORDER BY event_id")
+        undated = [name for (name,) in cursor.fetchall()]
+        cursor.close()
+    if undated:
+        print(f"⚠️  No event date for {', '.join(undated)}: the registration timing reports leave "
+              f"{'it' if len(undated) == 1 else 'them'} out (python events.py --set-date NAME YYYY-MM-DD)")
+
+    started = time.perf_counter()
+    # Report statements only read, so they are independent and can overlap
+    workers = min(workers or DATABASE_POOL_SIZE, len(reports)) or 1
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='report') as executor:
+        futures = iter([executor.submit(run_statement, entry, indexes, explain_plans) for entry in reports])
+        results = [next(futures).result() if entry['report'] else _result(entry, 'skipped') for entry in entries]
+    wall = time.perf_counter() - started
+
+    previous = None
+    if compare:
+        with open(compare) as f:
+            previous = json.load(f)
+    print_report(results, previous)
+    print(f"⏱  {wall:.2f}s wall for {sum(result['seconds'] or 0 for result in results):.2f}s of queries")
+
+    summary = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'backend': DATABASE_BACKEND,
+        'attendees': attendees,
+        'wall_seconds': round(wall, 4),
+        'files': paths,
+    }
+    return write_results(results, summary, output_dir)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the SQL report files with timing and query plans")
+    parser.add_argument('files', nargs='*', help=f"SQL files (default {' '.join(REPORT_FILES)})")
+    parser.add_argument('--workers', type=int, help="statements run concurrently (default DB_POOL_SIZE)")
+    parser.add_argument('--no-explain', action='store_true', help="skip EXPLAIN capture and scan flags")
+    parser.add_argument('--compare', help="previous results JSON to compare statement times against")
+    parser.add_argument('--output-dir', default=REPORTS_DIR, help=f"results directory (default {REPORTS_DIR})")
+    args = parser.parse_args()
+    main(args.files, args.workers, not args.no_explain, args.compare, args.output_dir)
@@ -0,0 +1,266 @@
+import os
+import json
+import time
+import shutil
+import argparse
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from config import SNAPSHOT_CONFIG, DATABASE_BACKEND
+from db import database_connection
+
+MANIFEST = 'manifest.json'
+FORMAT_VERSION = 4
+
+# Snapshot layout per table: column -> storage kind. 'dictionary' columns are
+# stored as integer codes (-1 = NULL) with their distinct values in the manifest;
+# datetimes are datetime64[s] (NaT = NULL) and prices float64 (NaN = NULL).
+# Rows are stored in primary key order, so each event is one contiguous slice.
+TABLES = {
+    'attendees': {
+        'event_id': 'int64',
+        'number': 'int64',
+        'ticket_created_date': 'datetime64[s]',
+        'ticket_last_updated_date': 'datetime64[s]',
+        'order_created_date': 'datetime64[s]',
+        'order_completed_date': 'datetime64[s]',
+        'price': 'float64',
+        'venue_checkin': 'int8',
+        'saturday_lunch_checkin': 'int8',
+        'sunday_brunch_checkin': 'int8',
+        'saturday_dinner_checkin': 'int8',
+        'sunday_midnight_snack_checkin': 'int8',
+        'mentor_checkin': 'int8',
+        'volunteer_checkin': 'int8',
+        'total_checkins': 'int8',
+        'email_domain': 'dictionary',
+        'source': 'dictionary',
+        'ticket': 'dictionary',
+        'event': 'dictionary',
+        'void_status': 'dictionary',
+    },
+    'attendee_checkins': {
+        'event_id': 'int64',
+        'attendee_number': 'int64',
+        'checkpoint': 'dictionary',
+    },
+}
+
+# university_domains attributes stored per email_domain dictionary entry
+DOMAIN_ATTRIBUTES = ['university', 'school_type', 'region']
+
+def _encode(values, dtype, dictionary=None):
+    """
+    Convert one chunk of a column to its snapshot array
+
+    Dictionary columns are coded against `dictionary` (value -> code), which
+    is extended with the chunk's new values so codes are stable across chunks.
+    """
+    if dtype == 'dictionary':
+        codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+        mapping = np.array([dictionary.setdefault(str(value), len(dictionary)) for value in uniques] + [-1],
+                           dtype=np.int64)
+        return mapping[codes]
+    if dtype.startswith('datetime64'):
+        return pd.to_datetime(pd.Series(values), errors='coerce').to_numpy(dtype)
+    numeric = pd.to_numeric(pd.Series(values), errors='coerce')
+    if dtype == 'float64':
+        return numeric.to_numpy(np.float64)
+    return numeric.fillna(0).to_numpy(dtype)
+
+def _export_table(connection, table, layout, directory, chunksize):
+    """Encode a table chunk by chunk and save one .npy per column; returns its manifest entry"""
+    columns = list(layout)
+    parts = {column: [] for column in columns}
+    dictionaries = {column: {} for column, dtype in layout.items() if dtype == 'dictionary'}
+    query = f"SELECT {', '.join(columns)} FROM {table} ORDER BY {columns[0]}, {columns[1]}"
+    for chunk in pd.read_sql(query, connection, chunksize=chunksize):
+        for column, dtype in layout.items():
+            parts[column].append(_encode(chunk[column].to_numpy(dtype=object), dtype, dictionaries.get(column)))
+
+    entry = {'rows': 0, 'columns': {}}
+    os.makedirs(os.path.join(directory, table))
+    for column, dtype in layout.items():
+        chunks = parts.pop(column)
+        storage = np.int64 if dtype == 'dictionary' else dtype
+        array = np.concatenate(chunks) if chunks else np.array([], dtype=storage)
+        info = {'kind': dtype}
+        if dtype == 'dictionary':
+            # Smallest code type that holds every code
+            values = list(dictionaries[column])
+            array = array.astype(np.int16 if len(values) < np.iinfo(np.int16).max else np.int32)
+            info['dictionary'] = values
+        np.save(os.path.join(directory, table, f"{column}.npy"), array, allow_pickle=False)
+        info['dtype'] = str(array.dtype)
+        entry['columns'][column] = info
+        entry['rows'] = len(array)
+        if column == 'event_id':
+            # Each event's [start, stop) row range
+            ids, starts, counts = np.unique(array, return_index=True, return_counts=True)
+            entry['partitions'] = {str(event_id): [int(start), int(start + count)]
+                                   for event_id, start, count in zip(ids, starts, counts)}
+    return entry
+
+def export(connection=None, directory=None, chunksize=100_000):
+    """
+    Write the attendees and check-in tables as a columnar snapshot
+
+    Each column is a .npy file that np.load(mmap_mode='r') maps without
+    reading it, next to a manifest with the row counts, the dictionaries of
+    the encoded columns, the university_domains groupings and the data
+    version it was taken at. Rows are ordered by event, and the
+    manifest holds each event's row range. The snapshot is written to a staging
+    directory and swapped in once complete, so readers never see a
+    half-written one.
+
+    Args:
+        connection: Open database connection (a pooled one is borrowed if omitted)
+        directory (str): Snapshot directory. Defaults to SNAPSHOT_CONFIG['directory'].
+        chunksize (int): Rows fetched from the database at a time
+
+    Returns:
+        str: The snapshot directory
+    """
+    if connection is None:
+        with database_connection() as connection:
+            return export(connection, directory, chunksize)
+    import query_cache
+    directory = directory or SNAPSHOT_CONFIG['directory']
+    started = time.perf_counter()
+    staging = f"{directory.rstrip(os.sep)}.{os.getpid()}.tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+
+    manifest = {
+        'version': FORMAT_VERSION,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'backend': DATABASE_BACKEND,
+        'data_version': query_cache.data_fingerprint(connection),
+        'tables': {},
+    }
+    for table, layout in TABLES.items():
+        manifest['tables'][table] = _export_table(connection, table, layout, staging, chunksize)
+
+    cursor = connection.cursor()
+    cursor.execute("SELECT event_id, name, event_date FROM events ORDER BY event_id")
+    manifest['events'] = [{'event_id': int(event_id), 'name': name,
+                           'event_date': str(event_date) if event_date is not None else None}
+                          for event_id, name, event_date in cursor.fetchall()]
+
+    # Groupings of each email domain, aligned with its dictionary (None = not in the lookup)
+    cursor.execute(f"SELECT email_domain, {', '.join(DOMAIN_ATTRIBUTES)} FROM university_domains")
+    lookup = {row[0]: row[1:] for row in cursor.fetchall()}
+    cursor.close()
+    domains = manifest['tables']['attendees']['columns']['email_domain']['dictionary']
+    manifest['domains'] = {
+        attribute: [lookup[domain][i] if domain in lookup else None for domain in domains]
+        for i, attribute in enumerate(DOMAIN_ATTRIBUTES)
+    }
+
+    with open(os.path.join(staging, MANIFEST), 'w') as f:
+        json.dump(manifest, f)
+    previous = f"{directory.rstrip(os.sep)}.{os.getpid()}.old"
+    if os.path.exists(directory):
+        os.replace(directory, previous)
+    os.replace(staging, directory)
+    shutil.rmtree(previous, ignore_errors=True)
+
+    rows = manifest['tables']['attendees']['rows']
+    print(f"📦 Snapshot of {rows} attendees written to {directory} ({time.perf_counter() - started:.2f}s)")
+    return directory
+
+class Snapshot:
+    """
+    Read-only view of an exported snapshot
+
+    Columns are memory-mapped on first access, so opening a snapshot reads
+    only its manifest and a chart touches only the columns it uses. Passing
+    an event_id restricts a column to that event's slice (a view, not a copy).
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory or SNAPSHOT_CONFIG['directory']
+        with open(os.path.join(self.directory, MANIFEST)) as f:
+            self.manifest = json.load(f)
+        if self.manifest.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Snapshot format {self.manifest.get('version')} is not {FORMAT_VERSION}; re-export it")
+        self._arrays = {}
+
+    def events(self):
+        """event_id, name and event_date of every event, in id order"""
+        return self.manifest['events']
+
+    def partition(self, event_id, table='attendees'):
+        """Slice of an event's rows in a table (empty for an event without rows)"""
+        start, stop = self.manifest['tables'][table]['partitions'].get(str(event_id), (0, 0))
+        return slice(start, stop)
+
+    def rows(self, table='attendees', event_id=None):
+        if event_id is not None:
+            part = self.partition(event_id, table)
+            return part.stop - part.start
+        return self.manifest['tables'][table]['rows']
+
+    def columns(self, table='attendees'):
+        return list(self.manifest['tables'][table]['columns'])
+
+    def column(self, name, table='attendees', event_id=None):
+        """The stored array (codes for dictionary columns), memory-mapped"""
+        key = (table, name)
+        if key not in self._arrays:
+            self._arrays[key] = np.load(os.path.join(self.directory, table, f"{name}.npy"),
+                                        mmap_mode='r', allow_pickle=False)
+        if event_id is not None:
+            return self._arrays[key][self.partition(event_id, table)]
+        return self._arrays[key]
+
+    def dictionary(self, name, table='attendees'):
+        """Distinct values of a dictionary-encoded column, indexed by code"""
+        return self.manifest['tables'][table]['columns'][name]['dictionary']
+
+    def decoded(self, name, table='attendees', event_id=None):
+        """A column as pandas would hold it: categoricals for dictionary columns"""
+        info = self.manifest['tables'][table]['columns'][name]
+        if info['kind'] == 'dictionary':
+            return pd.Categorical.from_codes(self.column(name, table, event_id), categories=info['dictionary'])
+        return self.column(name, table, event_id)
+
+    def frame(self, columns=None, table='attendees', event_id=None):
+        """DataFrame of the given columns (all by default), of every event or only event_id"""
+        return pd.DataFrame({name: self.decoded(name, table, event_id) for name in columns or self.columns(table)})
+
+    def is_current(self, connection):
+        """True if the database has not changed since the snapshot was taken"""
+        import query_cache
+        return self.manifest['data_version'] == query_cache.data_fingerprint(connection)
+
+def open_snapshot(directory=None):
+    """The snapshot in directory, or None if none has been exported"""
+    try:
+        return Snapshot(directory)
+    except (OSError, ValueError):
+        return None
+
+def print_info(snapshot):
+    """Describe a snapshot's tables and on-disk size"""
+    print(f"Snapshot {snapshot.directory} (taken {snapshot.manifest['created']}, "
+          f"{snapshot.manifest['backend']}, data version {snapshot.manifest['data_version']})")
+    for table, info in snapshot.manifest['tables'].items():
+        size = sum(os.path.getsize(os.path.join(snapshot.directory, table, f"{name}.npy"))
+                   for name in info['columns'])
+        print(f"  {table}: {info['rows']:,} rows, {len(info['columns'])} columns, {size / 1e6:.1f} MB")
+    for event in snapshot.events():
+        print(f"  event {event['event_id']} {event['name']}: {snapshot.rows('attendees', event['event_id']):,} attendees")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the attendee tables as a memory-mappable columnar snapshot")
+    parser.add_argument('--dir', help=f"snapshot directory (default {SNAPSHOT_CONFIG['directory']})")
+    parser.add_argument('--info', action='store_true', help="describe the existing snapshot instead of exporting")
+    args = parser.parse_args()
+    if args.info:
+        snapshot = open_snapshot(args.dir)
+        if snapshot is None:
+            print("No snapshot found; run python snapshot.py to export one")
+            raise SystemExit(1)
+        print_info(snapshot)
+    else:
+        print_info(Snapshot(export(directory=args.dir)))
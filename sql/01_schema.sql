@@ -6,9 +6,20 @@ DROP DATABASE IF EXISTS hackdavis_analytics;
 CREATE DATABASE hackdavis_analytics;
 USE hackdavis_analytics;
 
+-- One row per event (season). Every attendee, check-in and rollup row belongs to
+-- one event, and each of those tables' keys lead with event_id, so an event's
+-- rows are stored and indexed together and one season can be replaced or
+-- queried without touching the others.
+CREATE TABLE events (
+    event_id INT AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(100) NOT NULL UNIQUE,
+    event_date DATE
+);
+
 -- Main attendees table (matches your CSV structure)
 CREATE TABLE attendees (
-    number INT PRIMARY KEY,
+    event_id INT NOT NULL,
+    number INT NOT NULL,
     ticket_created_date DATETIME,
     ticket_last_updated_date DATETIME,
     ticket VARCHAR(100),
@@ -45,7 +56,7 @@ CREATE TABLE attendees (
     mentor_checkin TINYINT(1) DEFAULT 0,
     volunteer_checkin TINYINT(1) DEFAULT 0,
     -- Derived fields
-    university VARCHAR(100),
+    email_domain VARCHAR(100),  -- university_domains key; the school is looked up, not copied
     is_mentor BOOLEAN AS (ticket LIKE '%Mentor%') STORED,
     is_volunteer BOOLEAN AS (ticket LIKE '%Volunteer%') STORED,
     total_checkins INT AS (
@@ -55,20 +66,105 @@ CREATE TABLE attendees (
         COALESCE(saturday_dinner_checkin, 0) + 
         COALESCE(mentor_checkin, 0) + 
         COALESCE(volunteer_checkin, 0)
-    ) STORED
+    ) STORED,
+    PRIMARY KEY (event_id, number)
+);
+
+-- Indexes for performance, led by event_id so per-event queries read one event's entries
+CREATE INDEX idx_ticket_email ON attendees(event_id, ticket_email);
+CREATE INDEX idx_ticket_created_date ON attendees(event_id, ticket_created_date);
+CREATE INDEX idx_ticket ON attendees(event_id, ticket);
+CREATE INDEX idx_source ON attendees(event_id, source);
+CREATE INDEX idx_order_created_date ON attendees(event_id, order_created_date);
+CREATE INDEX idx_void_status ON attendees(event_id, void_status);
+CREATE INDEX idx_email_domain ON attendees(event_id, email_domain);
+
+-- Email domain -> university dimension, used instead of LIKE scans on emails.
+-- The importer adds any new .edu domain it sees; edit rows here (or in the
+-- table) to rename a school or move it to another school type/region; cached
+-- charts and the snapshot pick up the change (see the triggers below).
+CREATE TABLE university_domains (
+    email_domain VARCHAR(100) PRIMARY KEY,
+    university VARCHAR(100) NOT NULL,
+    school_type VARCHAR(50) NOT NULL,
+    region VARCHAR(50) NOT NULL
+);
+
+INSERT INTO university_domains (email_domain, university, school_type, region) VALUES
+    ('ucdavis.edu', 'UC Davis', 'UC Davis', 'Bay Area/Sac'),
+    ('berkeley.edu', 'UC Berkeley', 'Other UC Schools', 'Bay Area/Sac'),
+    ('stanford.edu', 'Stanford', 'Stanford', 'Bay Area/Sac'),
+    ('sjsu.edu', 'sjsu.edu', 'San Jose State', 'Bay Area/Sac');
+
+-- One row per attendee per checkpoint they checked in to. Populated from every
+-- "Check-ins: ..." column in the export, so new checkpoints need no schema change.
+CREATE TABLE attendee_checkins (
+    event_id INT NOT NULL,
+    attendee_number INT NOT NULL,
+    checkpoint VARCHAR(100) NOT NULL,
+    checked_in_at DATETIME,
+    PRIMARY KEY (event_id, attendee_number, checkpoint)
+);
+
+CREATE INDEX idx_checkpoint ON attendee_checkins(event_id, checkpoint);
+
+-- Pre-aggregated report tables, kept up to date by import_csv.py as rows are
+-- inserted or changed so reports never need to scan attendees
+CREATE TABLE rollup_daily_registrations (
+    event_id INT NOT NULL,
+    registration_date DATE NOT NULL,
+    registrations INT NOT NULL DEFAULT 0,
+    cumulative INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (event_id, registration_date)
+);
+
+CREATE TABLE rollup_university_domains (
+    event_id INT NOT NULL,
+    email_domain VARCHAR(100) NOT NULL,
+    attendees INT NOT NULL DEFAULT 0,
+    total_checkins INT NOT NULL DEFAULT 0,
+    venue_checkins INT NOT NULL DEFAULT 0,
+    revenue DECIMAL(12,2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (event_id, email_domain)
+);
+
+CREATE TABLE rollup_engagement_tiers (
+    event_id INT NOT NULL,
+    engagement_level VARCHAR(50) NOT NULL,
+    participants INT NOT NULL DEFAULT 0,
+    total_checkins INT NOT NULL DEFAULT 0,
+    priced_participants INT NOT NULL DEFAULT 0,
+    total_price DECIMAL(12,2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (event_id, engagement_level)
 );
 
--- Indexes for performance
-CREATE INDEX idx_ticket_email ON attendees(ticket_email);
-CREATE INDEX idx_ticket_created_date ON attendees(ticket_created_date);
-CREATE INDEX idx_ticket ON attendees(ticket);
-CREATE INDEX idx_source ON attendees(source);
-CREATE INDEX idx_order_created_date ON attendees(order_created_date);
-CREATE INDEX idx_void_status ON attendees(void_status);
+-- Single-row counter bumped in the same transaction as every write to the
+-- tables above, so the chart query cache and the columnar snapshot can tell
+-- whether the data changed with one primary key read. database_id tells
+-- databases (and recreated ones) apart, as their counters restart at 0.
+CREATE TABLE data_version (
+    id INT PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    database_id VARCHAR(36) NOT NULL
+);
+
+INSERT INTO data_version (id, version, database_id) VALUES (1, 0, UUID());
+
+-- Charts group attendees through university_domains, so any edit to it
+-- (including a manual rename or regrouping) is a new data version
+CREATE TRIGGER university_domains_insert AFTER INSERT ON university_domains
+FOR EACH ROW UPDATE data_version SET version = version + 1 WHERE id = 1;
+
+CREATE TRIGGER university_domains_update AFTER UPDATE ON university_domains
+FOR EACH ROW UPDATE data_version SET version = version + 1 WHERE id = 1;
+
+CREATE TRIGGER university_domains_delete AFTER DELETE ON university_domains
+FOR EACH ROW UPDATE data_version SET version = version + 1 WHERE id = 1;
 
 -- Views for analysis
 CREATE VIEW orders_analysis AS
 SELECT 
+    event_id,
     order_reference as order_id,
     number as attendee_number,
     order_created_date,
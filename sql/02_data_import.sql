@@ -4,6 +4,14 @@
 
 USE hackdavis_analytics;
 
+-- Event (season) the file belongs to: its previous rows are replaced and
+-- other events are left untouched
+SET @event_name = 'HackDavis 2025';
+INSERT IGNORE INTO events (name) VALUES (@event_name);
+SELECT event_id INTO @event_id FROM events WHERE name = @event_name;
+DELETE FROM attendee_checkins WHERE event_id = @event_id;
+DELETE FROM attendees WHERE event_id = @event_id;
+
 -- Import data from temp directory (no LOCAL needed)
 LOAD DATA INFILE '/path/to/your/event_data.csv'
 INTO TABLE attendees
@@ -20,23 +28,42 @@ IGNORE 1 ROWS
  order_created_date, order_completed_date, source, source_type,
  venue_checkin, saturday_lunch_checkin, sunday_brunch_checkin,
  saturday_dinner_checkin, sunday_midnight_snack_checkin,
- mentor_checkin, volunteer_checkin);
+ mentor_checkin, volunteer_checkin)
+SET event_id = @event_id;
 
 -- Post-import data cleaning
+-- Derive the lookup key once: .edu addresses keep their last two labels
+UPDATE attendees 
+SET email_domain = LOWER(SUBSTRING_INDEX(ticket_email, '@', -1))
+WHERE event_id = @event_id;
+
 UPDATE attendees 
-SET university = CASE 
-    WHEN ticket_email LIKE '%ucdavis.edu' THEN 'UC Davis'
-    WHEN ticket_email LIKE '%berkeley.edu' THEN 'UC Berkeley'
-    WHEN ticket_email LIKE '%stanford.edu' THEN 'Stanford'
-    WHEN ticket_email LIKE '%.edu' THEN SUBSTRING_INDEX(SUBSTRING_INDEX(ticket_email, '@', -1), '.', -2)
-    ELSE 'Non-University'
-END;
+SET email_domain = SUBSTRING_INDEX(email_domain, '.', -2)
+WHERE event_id = @event_id AND email_domain LIKE '%.edu';
+
+-- Register .edu domains not yet in the lookup with the default groupings
+INSERT IGNORE INTO university_domains (email_domain, university, school_type, region)
+SELECT DISTINCT 
+    email_domain,
+    email_domain,
+    CASE 
+        WHEN email_domain LIKE '%uc%' THEN 'Other UC Schools'
+        WHEN email_domain LIKE '%csu%' OR email_domain IN ('sfsu.edu', 'csus.edu') THEN 'Other CSU Schools'
+        ELSE 'Other Universities'
+    END,
+    CASE 
+        WHEN email_domain LIKE '%uc%' OR email_domain LIKE '%csu%' THEN 'Other California'
+        ELSE 'Out-of-State'
+    END
+FROM attendees 
+WHERE event_id = @event_id AND email_domain LIKE '%.edu';
 
 -- Verify import
 SELECT 
     COUNT(*) as total_records,
     COUNT(CASE WHEN void_status IS NULL THEN 1 END) as valid_records
-FROM attendees;
+FROM attendees
+WHERE event_id = @event_id;
 
 SELECT 'Data import completed!' as status;
 
@@ -44,22 +71,87 @@ SELECT 'Data import completed!' as status;
 -- File -> Import -> Table Data Import Wizard -> Select CSV -> Map columns
 
 -- Post-import data cleaning
+-- Derive the lookup key once: .edu addresses keep their last two labels
 UPDATE attendees 
-SET university = CASE 
-    WHEN ticket_email LIKE '%ucdavis.edu' THEN 'UC Davis'
-    WHEN ticket_email LIKE '%berkeley.edu' THEN 'UC Berkeley'
-    WHEN ticket_email LIKE '%stanford.edu' THEN 'Stanford'
-    WHEN ticket_email LIKE '%.edu' THEN SUBSTRING_INDEX(SUBSTRING_INDEX(ticket_email, '@', -1), '.', -2)
-    ELSE 'Non-University'
-END;
+SET email_domain = LOWER(SUBSTRING_INDEX(ticket_email, '@', -1))
+WHERE event_id = @event_id;
+
+UPDATE attendees 
+SET email_domain = SUBSTRING_INDEX(email_domain, '.', -2)
+WHERE event_id = @event_id AND email_domain LIKE '%.edu';
+
+-- Register .edu domains not yet in the lookup with the default groupings
+INSERT IGNORE INTO university_domains (email_domain, university, school_type, region)
+SELECT DISTINCT 
+    email_domain,
+    email_domain,
+    CASE 
+        WHEN email_domain LIKE '%uc%' THEN 'Other UC Schools'
+        WHEN email_domain LIKE '%csu%' OR email_domain IN ('sfsu.edu', 'csus.edu') THEN 'Other CSU Schools'
+        ELSE 'Other Universities'
+    END,
+    CASE 
+        WHEN email_domain LIKE '%uc%' OR email_domain LIKE '%csu%' THEN 'Other California'
+        ELSE 'Out-of-State'
+    END
+FROM attendees 
+WHERE event_id = @event_id AND email_domain LIKE '%.edu';
 
 -- Convert check-in fields from float to boolean if needed
-UPDATE attendees SET venue_checkin = 1 WHERE venue_checkin > 0;
-UPDATE attendees SET saturday_lunch_checkin = 1 WHERE saturday_lunch_checkin > 0;
-UPDATE attendees SET sunday_brunch_checkin = 1 WHERE sunday_brunch_checkin > 0;
-UPDATE attendees SET saturday_dinner_checkin = 1 WHERE saturday_dinner_checkin > 0;
-UPDATE attendees SET mentor_checkin = 1 WHERE mentor_checkin > 0;
-UPDATE attendees SET volunteer_checkin = 1 WHERE volunteer_checkin > 0;
+UPDATE attendees SET venue_checkin = 1 WHERE event_id = @event_id AND venue_checkin > 0;
+UPDATE attendees SET saturday_lunch_checkin = 1 WHERE event_id = @event_id AND saturday_lunch_checkin > 0;
+UPDATE attendees SET sunday_brunch_checkin = 1 WHERE event_id = @event_id AND sunday_brunch_checkin > 0;
+UPDATE attendees SET saturday_dinner_checkin = 1 WHERE event_id = @event_id AND saturday_dinner_checkin > 0;
+UPDATE attendees SET mentor_checkin = 1 WHERE event_id = @event_id AND mentor_checkin > 0;
+UPDATE attendees SET volunteer_checkin = 1 WHERE event_id = @event_id AND volunteer_checkin > 0;
+
+-- Normalize check-in flags into one row per attendee per checkpoint
+INSERT INTO attendee_checkins (event_id, attendee_number, checkpoint)
+SELECT event_id, number, 'Venue' FROM attendees WHERE event_id = @event_id AND venue_checkin > 0
+UNION ALL SELECT event_id, number, 'Saturday Lunch' FROM attendees WHERE event_id = @event_id AND saturday_lunch_checkin > 0
+UNION ALL SELECT event_id, number, 'Saturday Dinner' FROM attendees WHERE event_id = @event_id AND saturday_dinner_checkin > 0
+UNION ALL SELECT event_id, number, 'Sunday Brunch' FROM attendees WHERE event_id = @event_id AND sunday_brunch_checkin > 0
+UNION ALL SELECT event_id, number, 'Sunday Midnight Snack' FROM attendees WHERE event_id = @event_id AND sunday_midnight_snack_checkin > 0
+UNION ALL SELECT event_id, number, 'Mentor' FROM attendees WHERE event_id = @event_id AND mentor_checkin > 0
+UNION ALL SELECT event_id, number, 'Volunteer' FROM attendees WHERE event_id = @event_id AND volunteer_checkin > 0;
+
+-- Rebuild the event's rollup tables, which every chart reads (the same
+-- statements as rollups.rebuild; `python rollups.py --event NAME` does this too)
+DELETE FROM rollup_daily_registrations WHERE event_id = @event_id;
+DELETE FROM rollup_university_domains WHERE event_id = @event_id;
+DELETE FROM rollup_engagement_tiers WHERE event_id = @event_id;
+
+INSERT INTO rollup_daily_registrations (event_id, registration_date, registrations, cumulative)
+SELECT event_id, DATE(ticket_created_date), COUNT(*),
+       SUM(COUNT(*)) OVER (ORDER BY DATE(ticket_created_date))
+FROM attendees
+WHERE event_id = @event_id AND ticket_created_date IS NOT NULL
+GROUP BY event_id, DATE(ticket_created_date);
+
+INSERT INTO rollup_university_domains (event_id, email_domain, attendees, total_checkins,
+                                       venue_checkins, revenue)
+SELECT event_id, COALESCE(email_domain, ''), COUNT(*), COALESCE(SUM(total_checkins), 0),
+       COALESCE(SUM(venue_checkin), 0), ROUND(COALESCE(SUM(price), 0), 2)
+FROM attendees
+WHERE event_id = @event_id
+GROUP BY event_id, COALESCE(email_domain, '');
+
+INSERT INTO rollup_engagement_tiers (event_id, engagement_level, participants, total_checkins,
+                                     priced_participants, total_price)
+SELECT event_id, engagement_level, COUNT(*), SUM(checkins), COUNT(price), ROUND(COALESCE(SUM(price), 0), 2)
+FROM (
+    SELECT event_id, price, COALESCE(total_checkins, 0) AS checkins,
+           CASE WHEN COALESCE(total_checkins, 0) >= 4 THEN 'High (4+ meals)'
+                WHEN COALESCE(total_checkins, 0) >= 2 THEN 'Medium (2-3 meals)'
+                WHEN COALESCE(total_checkins, 0) >= 1 THEN 'Low (1 meal)'
+                ELSE 'None (0 meals)' END AS engagement_level
+    FROM attendees
+    WHERE event_id = @event_id
+) tiers
+GROUP BY event_id, engagement_level;
+
+-- Let cached charts and the snapshot see the new data
+UPDATE data_version SET version = version + 1 WHERE id = 1;
 
 -- Verify import
 SELECT 
@@ -67,7 +159,8 @@ SELECT
     COUNT(CASE WHEN void_status IS NULL THEN 1 END) as valid_records,
     MIN(ticket_created_date) as earliest_registration,
     MAX(ticket_created_date) as latest_registration
-FROM attendees;
+FROM attendees
+WHERE event_id = @event_id;
 
 SELECT 'Data import completed!' as status;
 sql/03_core_analytics.sql
@@ -191,12 +284,13 @@ SELECT
     'UNIVERSITY PARTICIPATION BREAKDOWN' as analysis_title;
 
 SELECT 
-    university,
+    COALESCE(d.university, 'Non-University') as university,
     COUNT(*) as students,
     ROUND(COUNT(*) * 100.0 / (SELECT COUNT(*) FROM attendees WHERE void_status IS NULL), 2) as percentage,
-    ROUND(AVG(total_checkins), 2) as avg_engagement,
-    SUM(price) as total_revenue
-FROM attendees
-WHERE void_status IS NULL
-GROUP BY university
+    ROUND(AVG(a.total_checkins), 2) as avg_engagement,
+    SUM(a.price) as total_revenue
+FROM attendees a
+LEFT JOIN university_domains d ON d.email_domain = a.email_domain
+WHERE a.void_status IS NULL
+GROUP BY COALESCE(d.university, 'Non-University')
 ORDER BY students DESC;
@@ -2,75 +2,74 @@
 -- CORE BUSINESS ANALYTICS QUERIES
 -- ============================================
 
--- 1. Executive Summary Dashboard
+-- 1. Executive Summary Dashboard (one row per event, in one scan)
 SELECT 
-    'HACKDAVIS 2025 EXECUTIVE SUMMARY' as report_title,
+    'EXECUTIVE SUMMARY BY EVENT' as report_title,
     '' as separator;
 
 SELECT 
-    'Total Registrations' as metric,
-    COUNT(*) as value,
-    '' as notes
-FROM attendees WHERE void_status IS NULL
-UNION ALL
-SELECT 
-    'Actual Venue Attendance',
-    SUM(venue_checkin),
-    CONCAT(ROUND(SUM(venue_checkin) * 100.0 / COUNT(*), 1), '% show rate')
-FROM attendees WHERE void_status IS NULL
-UNION ALL
-SELECT 
-    'Total Revenue',
-    SUM(price),
-    CONCAT('$', ROUND(SUM(price) / COUNT(*), 0), ' avg per ticket')
-FROM attendees WHERE void_status IS NULL
-UNION ALL
-SELECT 
-    'UC Davis Students',
-    SUM(CASE WHEN ticket_email LIKE '%ucdavis.edu' THEN 1 ELSE 0 END),
-    CONCAT(ROUND(SUM(CASE WHEN ticket_email LIKE '%ucdavis.edu' THEN 1 ELSE 0 END) * 100.0 / COUNT(*), 1), '% of total')
-FROM attendees WHERE void_status IS NULL;
+    e.name as event,
+    COUNT(*) as total_registrations,
+    SUM(a.venue_checkin) as venue_attendance,
+    ROUND(SUM(a.venue_checkin) * 100.0 / COUNT(*), 1) as show_rate,
+    SUM(a.price) as total_revenue,
+    ROUND(SUM(a.price) / COUNT(*), 0) as avg_ticket_price,
+    SUM(CASE WHEN a.email_domain = 'ucdavis.edu' THEN 1 ELSE 0 END) as uc_davis_students,
+    ROUND(SUM(CASE WHEN a.email_domain = 'ucdavis.edu' THEN 1 ELSE 0 END) * 100.0 / COUNT(*), 1) as uc_davis_share
+FROM attendees a
+JOIN events e ON e.event_id = a.event_id
+WHERE a.void_status IS NULL
+GROUP BY a.event_id, e.name
+ORDER BY a.event_id;
 
 -- 2. Registration Timeline Analysis
 SELECT 
     'REGISTRATION TIMELINE ANALYSIS' as analysis_title;
 
 SELECT 
-    DATE(ticket_created_date) as registration_date,
+    a.event_id,
+    DATE(a.ticket_created_date) as registration_date,
     COUNT(*) as daily_registrations,
-    SUM(COUNT(*)) OVER (ORDER BY DATE(ticket_created_date)) as cumulative_registrations,
-    ROUND(COUNT(*) * 100.0 / (SELECT COUNT(*) FROM attendees WHERE void_status IS NULL), 2) as daily_percentage
-FROM attendees 
-WHERE ticket_created_date IS NOT NULL AND void_status IS NULL
-GROUP BY DATE(ticket_created_date)
-ORDER BY registration_date;
+    SUM(COUNT(*)) OVER (PARTITION BY a.event_id ORDER BY DATE(a.ticket_created_date)) as cumulative_registrations,
+    ROUND(COUNT(*) * 100.0 / t.registrations, 2) as daily_percentage
+FROM attendees a
+JOIN (SELECT event_id, COUNT(*) as registrations FROM attendees WHERE void_status IS NULL GROUP BY event_id) t
+  ON t.event_id = a.event_id
+WHERE a.ticket_created_date IS NOT NULL AND a.void_status IS NULL
+GROUP BY a.event_id, DATE(a.ticket_created_date), t.registrations
+ORDER BY a.event_id, registration_date;
 
 -- 3. Revenue Analysis
 SELECT 
     'REVENUE ANALYSIS BY SOURCE' as analysis_title;
 
 SELECT 
-    source,
+    a.event_id,
+    a.source,
     COUNT(*) as registrations,
-    SUM(price) as total_revenue,
-    ROUND(AVG(price), 2) as avg_ticket_price,
-    ROUND(SUM(price) * 100.0 / (SELECT SUM(price) FROM attendees WHERE void_status IS NULL), 2) as revenue_share
-FROM attendees
-WHERE void_status IS NULL AND source IS NOT NULL
-GROUP BY source
-ORDER BY total_revenue DESC;
+    SUM(a.price) as total_revenue,
+    ROUND(AVG(a.price), 2) as avg_ticket_price,
+    ROUND(SUM(a.price) * 100.0 / t.revenue, 2) as revenue_share
+FROM attendees a
+JOIN (SELECT event_id, SUM(price) as revenue FROM attendees WHERE void_status IS NULL GROUP BY event_id) t
+  ON t.event_id = a.event_id
+WHERE a.void_status IS NULL AND a.source IS NOT NULL
+GROUP BY a.event_id, a.source, t.revenue
+ORDER BY a.event_id, total_revenue DESC;
 
 -- 4. Engagement Analysis
 SELECT 
     'PARTICIPANT ENGAGEMENT ANALYSIS' as analysis_title;
 
 SELECT 
+    engagement_data.event_id,
     engagement_level,
     participant_count,
-    ROUND(participant_count * 100.0 / total_participants, 2) as percentage,
+    ROUND(participant_count * 100.0 / t.total_participants, 2) as percentage,
     avg_ticket_price
 FROM (
     SELECT 
+        event_id,
         CASE 
             WHEN total_checkins >= 4 THEN 'High Engagement (4+ meals)'
             WHEN total_checkins >= 2 THEN 'Medium Engagement (2-3 meals)'
@@ -78,13 +77,15 @@ FROM (
             ELSE 'No Meal Participation'
         END as engagement_level,
         COUNT(*) as participant_count,
-        ROUND(AVG(price), 2) as avg_ticket_price,
-        (SELECT COUNT(*) FROM attendees WHERE void_status IS NULL) as total_participants
+        ROUND(AVG(price), 2) as avg_ticket_price
     FROM attendees 
     WHERE void_status IS NULL
-    GROUP BY engagement_level
+    GROUP BY event_id, engagement_level
 ) engagement_data
+JOIN (SELECT event_id, COUNT(*) as total_participants FROM attendees WHERE void_status IS NULL GROUP BY event_id) t
+  ON t.event_id = engagement_data.event_id
 ORDER BY 
+    engagement_data.event_id,
     CASE engagement_level
         WHEN 'High Engagement (4+ meals)' THEN 1
         WHEN 'Medium Engagement (2-3 meals)' THEN 2
@@ -97,33 +98,64 @@ SELECT
     'MEAL PLANNING OPTIMIZATION' as analysis_title;
 
 SELECT 
-    meal_name,
-    planned_portions,
-    actual_attendance,
-    ROUND(actual_attendance * 100.0 / planned_portions, 2) as attendance_rate,
-    planned_portions - actual_attendance as waste_estimate
-FROM (
-    SELECT 'Saturday Lunch' as meal_name, COUNT(*) as planned_portions, SUM(saturday_lunch_checkin) as actual_attendance
-    FROM attendees WHERE void_status IS NULL
-    UNION ALL
-    SELECT 'Saturday Dinner', COUNT(*), SUM(saturday_dinner_checkin)
-    FROM attendees WHERE void_status IS NULL
-    UNION ALL
-    SELECT 'Sunday Brunch', COUNT(*), SUM(sunday_brunch_checkin)
-    FROM attendees WHERE void_status IS NULL
-) meal_data;
+    t.event_id,
+    m.meal_name,
+    t.planned_portions,
+    COALESCE(c.attended, 0) as actual_attendance,
+    ROUND(COALESCE(c.attended, 0) * 100.0 / t.planned_portions, 2) as attendance_rate,
+    t.planned_portions - COALESCE(c.attended, 0) as waste_estimate
+FROM (SELECT event_id, COUNT(*) as planned_portions FROM attendees WHERE void_status IS NULL GROUP BY event_id) t
+-- Every meal of every event is listed, so a meal nobody checked in to shows 0
+CROSS JOIN (
+    SELECT 'Saturday Lunch' as meal_name, 1 as meal_order
+    UNION ALL SELECT 'Saturday Dinner', 2
+    UNION ALL SELECT 'Sunday Brunch', 3
+) m
+LEFT JOIN (
+    SELECT c.event_id, c.checkpoint, COUNT(*) as attended
+    FROM attendee_checkins c
+    JOIN attendees a ON a.event_id = c.event_id AND a.number = c.attendee_number
+    WHERE c.checkpoint IN ('Saturday Lunch', 'Saturday Dinner', 'Sunday Brunch')
+      AND a.void_status IS NULL
+    GROUP BY c.event_id, c.checkpoint
+) c ON c.event_id = t.event_id AND c.checkpoint = m.meal_name
+ORDER BY t.event_id, m.meal_order;
 
 -- 6. University Participation
 SELECT 
     'UNIVERSITY PARTICIPATION BREAKDOWN' as analysis_title;
 
 SELECT 
-    university,
+    a.event_id,
+    COALESCE(d.university, 'Non-University') as university,
     COUNT(*) as students,
-    ROUND(COUNT(*) * 100.0 / (SELECT COUNT(*) FROM attendees WHERE void_status IS NULL), 2) as percentage,
-    ROUND(AVG(total_checkins), 2) as avg_engagement,
-    SUM(price) as total_revenue
-FROM attendees
-WHERE void_status IS NULL
-GROUP BY university
-ORDER BY students DESC;
\ No newline at end of file
+    ROUND(COUNT(*) * 100.0 / t.total_students, 2) as percentage,
+    ROUND(AVG(a.total_checkins), 2) as avg_engagement,
+    SUM(a.price) as total_revenue
+FROM attendees a
+LEFT JOIN university_domains d ON d.email_domain = a.email_domain
+JOIN (SELECT event_id, COUNT(*) as total_students FROM attendees WHERE void_status IS NULL GROUP BY event_id) t
+  ON t.event_id = a.event_id
+WHERE a.void_status IS NULL
+GROUP BY a.event_id, COALESCE(d.university, 'Non-University'), t.total_students
+ORDER BY a.event_id, students DESC;
+
+-- 7. Season Comparison (one grouped pass over the per-event rollups)
+SELECT 
+    'SEASON-OVER-SEASON COMPARISON' as analysis_title;
+
+SELECT 
+    e.name as event,
+    e.event_date,
+    t.first_registration,
+    SUM(r.attendees) as registrations,
+    SUM(r.venue_checkins) as attendance,
+    ROUND(SUM(r.venue_checkins) * 100.0 / SUM(r.attendees), 1) as attendance_rate,
+    SUM(r.revenue) as total_revenue,
+    ROUND(SUM(r.total_checkins) * 1.0 / SUM(r.attendees), 2) as avg_engagement
+FROM events e
+JOIN rollup_university_domains r ON r.event_id = e.event_id
+LEFT JOIN (SELECT event_id, MIN(registration_date) as first_registration
+           FROM rollup_daily_registrations GROUP BY event_id) t ON t.event_id = e.event_id
+GROUP BY e.event_id, e.name, e.event_date, t.first_registration
+ORDER BY t.first_registration, e.event_id;
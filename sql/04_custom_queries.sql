@@ -17,6 +17,7 @@ SELECT
 -- Example Custom Query 1: Price Sensitivity Analysis
 -- Business Question: What's the optimal ticket price for maximum engagement?
 SELECT 
+    event_id,
     price_range,
     COUNT(*) as registrations,
     ROUND(AVG(total_checkins), 2) as avg_engagement,
@@ -33,51 +34,60 @@ FROM (
     FROM attendees 
     WHERE void_status IS NULL
 ) price_analysis
-GROUP BY price_range
-ORDER BY avg_engagement DESC;
+GROUP BY event_id, price_range
+ORDER BY event_id, avg_engagement DESC;
 
 -- Example Custom Query 2: Registration Timing vs Engagement
+-- Timing is measured to each event's own event_date; events without one are left out
+-- (set it with import_csv.py --event-date or events.py --set-date)
 -- Business Question: Do early registrants engage more than last-minute ones?
 SELECT 
+    event_id,
     registration_timing,
     COUNT(*) as registrations,
     ROUND(AVG(total_checkins), 2) as avg_engagement,
     ROUND(AVG(price), 2) as avg_price
 FROM (
-    SELECT *,
+    SELECT a.*,
         CASE 
-            WHEN DATEDIFF('2025-01-25', ticket_created_date) > 60 THEN 'Super Early (60+ days)'
-            WHEN DATEDIFF('2025-01-25', ticket_created_date) > 30 THEN 'Early (30-60 days)'
-            WHEN DATEDIFF('2025-01-25', ticket_created_date) > 7 THEN 'Regular (7-30 days)'
-            WHEN DATEDIFF('2025-01-25', ticket_created_date) > 1 THEN 'Last Week'
+            WHEN DATEDIFF(e.event_date, a.ticket_created_date) > 60 THEN 'Super Early (60+ days)'
+            WHEN DATEDIFF(e.event_date, a.ticket_created_date) > 30 THEN 'Early (30-60 days)'
+            WHEN DATEDIFF(e.event_date, a.ticket_created_date) > 7 THEN 'Regular (7-30 days)'
+            WHEN DATEDIFF(e.event_date, a.ticket_created_date) > 1 THEN 'Last Week'
             ELSE 'Last Minute'
         END as registration_timing
-    FROM attendees 
-    WHERE ticket_created_date IS NOT NULL AND void_status IS NULL
+    FROM attendees a
+    JOIN events e ON e.event_id = a.event_id
+    WHERE a.ticket_created_date IS NOT NULL AND a.void_status IS NULL AND e.event_date IS NOT NULL
 ) timing_analysis
-GROUP BY registration_timing
-ORDER BY avg_engagement DESC;
+GROUP BY event_id, registration_timing
+ORDER BY event_id, avg_engagement DESC;
 
---Registration categories Early-Bird -> Last Minute count
+-- Events without an event_date are left out (events.py --set-date sets it)
+--Registration categories Early-Bird -> Last Minute count, per event with an event_date
 
 SELECT 
+    e.event_id,
     timing_categories.category as registration_timing,
     COALESCE(COUNT(a.ticket_created_date), 0) as registrations,
     ROUND(AVG(a.total_checkins), 2) as avg_engagement,
     ROUND(AVG(a.price), 2) as avg_price_paid
-FROM (
+FROM events e
+CROSS JOIN (
     SELECT 'Early Bird (60+ days)' as category, 1 as sort_order
     UNION SELECT 'Regular (30-60 days)', 2
     UNION SELECT 'Late (7-30 days)', 3
     UNION SELECT 'Last Minute (< 7 days)', 4
 ) timing_categories
 LEFT JOIN attendees a ON 
-    timing_categories.category = CASE 
-        WHEN DATEDIFF(a.ticket_created_date, '2025-01-25') > 60 THEN 'Early Bird (60+ days)'
-        WHEN DATEDIFF(a.ticket_created_date, '2025-01-25') > 30 THEN 'Regular (30-60 days)'
-        WHEN DATEDIFF(a.ticket_created_date, '2025-01-25') > 7 THEN 'Late (7-30 days)'
+    a.event_id = e.event_id
+    AND timing_categories.category = CASE 
+        WHEN DATEDIFF(e.event_date, a.ticket_created_date) > 60 THEN 'Early Bird (60+ days)'
+        WHEN DATEDIFF(e.event_date, a.ticket_created_date) > 30 THEN 'Regular (30-60 days)'
+        WHEN DATEDIFF(e.event_date, a.ticket_created_date) > 7 THEN 'Late (7-30 days)'
         ELSE 'Last Minute (< 7 days)'
     END
     AND a.ticket_created_date IS NOT NULL
-GROUP BY timing_categories.category, timing_categories.sort_order
-ORDER BY timing_categories.sort_order;
\ No newline at end of file
+WHERE e.event_date IS NOT NULL
+GROUP BY e.event_id, timing_categories.category, timing_categories.sort_order
+ORDER BY e.event_id, timing_categories.sort_order;
\ No newline at end of file
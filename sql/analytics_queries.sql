@@ -131,10 +131,13 @@ UPDATE attendees SET volunteer_checkin = 1 WHERE volunteer_checkin > 0;
 
 -- Verify import
 SELECT 
+    event_id,
     COUNT(*) as total_records,
     COUNT(CASE WHEN void_status IS NULL THEN 1 END) as valid_records,
     MIN(ticket_created_date) as earliest_registration,
     MAX(ticket_created_date) as latest_registration
-FROM attendees;
+FROM attendees
+GROUP BY event_id
+ORDER BY event_id;
 
 SELECT 'Data import completed!' as status;
\ No newline at end of file
@@ -1,122 +1,152 @@
 -- Key Performance Indicators
 SELECT 
-    'HACKDAVIS 2025 EXECUTIVE SUMMARY' as report_section;
+    'EXECUTIVE SUMMARY BY EVENT' as report_section;
 
 SELECT 
+    e.name as event,
     COUNT(*) as total_registrations,
-    SUM(venue_checkin) as actual_attendance,
-    ROUND(SUM(venue_checkin) * 100.0 / COUNT(*), 1) as attendance_rate,
-    SUM(price) as total_revenue,
-    ROUND(SUM(price) / COUNT(*), 0) as avg_revenue_per_attendee,
-    COUNT(DISTINCT university) as universities_represented
-FROM attendees;
+    SUM(a.venue_checkin) as actual_attendance,
+    ROUND(SUM(a.venue_checkin) * 100.0 / COUNT(*), 1) as attendance_rate,
+    SUM(a.price) as total_revenue,
+    ROUND(SUM(a.price) / COUNT(*), 0) as avg_revenue_per_attendee,
+    COUNT(DISTINCT COALESCE(d.university, 'Non-University')) as universities_represented
+FROM attendees a
+JOIN events e ON e.event_id = a.event_id
+LEFT JOIN university_domains d ON d.email_domain = a.email_domain
+GROUP BY a.event_id, e.name
+ORDER BY a.event_id;
 
 -- Top recruiting targets and engagement
 SELECT 
-    university,
+    a.event_id,
+    COALESCE(d.university, 'Non-University') as university,
     COUNT(*) as students,
-    ROUND(AVG(total_checkins), 2) as avg_engagement,
-    SUM(price) as revenue_generated,
-    ROUND(COUNT(*) * 100.0 / (SELECT COUNT(*) FROM attendees), 1) as market_share
-FROM attendees 
-GROUP BY university 
-HAVING students >= 5
-ORDER BY students DESC;
+    ROUND(AVG(a.total_checkins), 2) as avg_engagement,
+    SUM(a.price) as revenue_generated,
+    ROUND(COUNT(*) * 100.0 / t.total_students, 1) as market_share
+FROM attendees a
+LEFT JOIN university_domains d ON d.email_domain = a.email_domain
+JOIN (SELECT event_id, COUNT(*) as total_students FROM attendees GROUP BY event_id) t
+  ON t.event_id = a.event_id
+GROUP BY a.event_id, COALESCE(d.university, 'Non-University'), t.total_students
+HAVING COUNT(*) >= 5
+ORDER BY a.event_id, students DESC;
 
 -- Peak registration periods (identify marketing campaign impact)
 SELECT 
+    event_id,
     DATE(ticket_created_date) as registration_date,
     COUNT(*) as daily_registrations,
-    SUM(COUNT(*)) OVER (ORDER BY DATE(ticket_created_date)) as cumulative_registrations,
-    DAYNAME(ticket_created_date) as day_of_week
-FROM attendees 
+    SUM(COUNT(*)) OVER (PARTITION BY event_id ORDER BY DATE(ticket_created_date)) as cumulative_registrations,
+    DAYNAME(DATE(ticket_created_date)) as day_of_week
+FROM attendees
 WHERE ticket_created_date IS NOT NULL
-GROUP BY DATE(ticket_created_date)
-ORDER BY registration_date;
+GROUP BY event_id, DATE(ticket_created_date)
+ORDER BY event_id, registration_date;
 
 -- Participant engagement segmentation
 SELECT 
+    a.event_id,
     CASE 
-        WHEN total_checkins >= 4 THEN 'High Engagement (4+ activities)'
-        WHEN total_checkins >= 2 THEN 'Medium Engagement (2-3 activities)'
-        WHEN total_checkins = 1 THEN 'Low Engagement (1 activity)'
+        WHEN a.total_checkins >= 4 THEN 'High Engagement (4+ activities)'
+        WHEN a.total_checkins >= 2 THEN 'Medium Engagement (2-3 activities)'
+        WHEN a.total_checkins = 1 THEN 'Low Engagement (1 activity)'
         ELSE 'Registered Only (0 activities)'
     END as engagement_tier,
     COUNT(*) as participants,
-    ROUND(COUNT(*) * 100.0 / (SELECT COUNT(*) FROM attendees), 1) as percentage,
-    ROUND(AVG(price), 2) as avg_ticket_price
-FROM attendees 
-GROUP BY engagement_tier
-ORDER BY AVG(total_checkins) DESC;
+    ROUND(COUNT(*) * 100.0 / t.total_participants, 1) as percentage,
+    ROUND(AVG(a.price), 2) as avg_ticket_price
+FROM attendees a
+JOIN (SELECT event_id, COUNT(*) as total_participants FROM attendees GROUP BY event_id) t
+  ON t.event_id = a.event_id
+GROUP BY a.event_id, engagement_tier, t.total_participants
+ORDER BY a.event_id, AVG(a.total_checkins) DESC;
 
 -- UC system vs other universities performance
 SELECT 
+    a.event_id,
     CASE 
-        WHEN university LIKE 'UC %' THEN 'UC System'
-        WHEN university LIKE '%.edu' AND university NOT LIKE 'UC %' THEN 'Other Universities'
+        WHEN d.university LIKE 'UC %' THEN 'UC System'
+        WHEN d.university != 'Non-University' THEN 'Other Universities'
         ELSE 'Non-University'
     END as institution_type,
     COUNT(*) as attendees,
-    ROUND(AVG(total_checkins), 2) as avg_engagement,
-    ROUND(AVG(price), 2) as avg_ticket_price,
-    SUM(price) as total_revenue
-FROM attendees 
-GROUP BY institution_type;
+    ROUND(AVG(a.total_checkins), 2) as avg_engagement,
+    ROUND(AVG(a.price), 2) as avg_ticket_price,
+    SUM(a.price) as total_revenue
+FROM attendees a
+LEFT JOIN university_domains d ON d.email_domain = a.email_domain
+GROUP BY a.event_id, institution_type
+ORDER BY a.event_id, institution_type;
 
 -- Food service optimization
 SELECT 
+    event_id,
     'Saturday Lunch' as meal_service,
     COUNT(*) as planned_attendees,
     SUM(saturday_lunch_checkin) as actual_attendees,
     ROUND(SUM(saturday_lunch_checkin) * 100.0 / COUNT(*), 1) as attendance_rate,
     COUNT(*) - SUM(saturday_lunch_checkin) as potential_waste
 FROM attendees
+GROUP BY event_id
 UNION ALL
 SELECT 
+    event_id,
     'Saturday Dinner',
     COUNT(*),
     SUM(saturday_dinner_checkin),
     ROUND(SUM(saturday_dinner_checkin) * 100.0 / COUNT(*), 1),
     COUNT(*) - SUM(saturday_dinner_checkin)
 FROM attendees
+GROUP BY event_id
 UNION ALL
 SELECT 
+    event_id,
     'Sunday Brunch',
     COUNT(*),
     SUM(sunday_brunch_checkin),
     ROUND(SUM(sunday_brunch_checkin) * 100.0 / COUNT(*), 1),
     COUNT(*) - SUM(sunday_brunch_checkin)
-FROM attendees;
+FROM attendees
+GROUP BY event_id
+ORDER BY event_id;
 
+-- Timing is measured to each event's own event_date; events without one are left out
+-- (set it with import_csv.py --event-date or events.py --set-date)
 -- Early registration vs engagement correlation
 SELECT 
+    a.event_id,
     CASE 
-        WHEN DATEDIFF('2025-01-25', ticket_created_date) > 60 THEN 'Early Bird (60+ days)'
-        WHEN DATEDIFF('2025-01-25', ticket_created_date) > 30 THEN 'Regular (30-60 days)'
-        WHEN DATEDIFF('2025-01-25', ticket_created_date) > 7 THEN 'Late (7-30 days)'
+        WHEN DATEDIFF(e.event_date, a.ticket_created_date) > 60 THEN 'Early Bird (60+ days)'
+        WHEN DATEDIFF(e.event_date, a.ticket_created_date) > 30 THEN 'Regular (30-60 days)'
+        WHEN DATEDIFF(e.event_date, a.ticket_created_date) > 7 THEN 'Late (7-30 days)'
         ELSE 'Last Minute (< 7 days)'
     END as registration_timing,
     COUNT(*) as registrations,
-    ROUND(AVG(total_checkins), 2) as avg_engagement,
-    ROUND(AVG(price), 2) as avg_price_paid
-FROM attendees 
-WHERE ticket_created_date IS NOT NULL
-GROUP BY registration_timing;
+    ROUND(AVG(a.total_checkins), 2) as avg_engagement,
+    ROUND(AVG(a.price), 2) as avg_price_paid
+FROM attendees a
+JOIN events e ON e.event_id = a.event_id
+WHERE a.ticket_created_date IS NOT NULL AND e.event_date IS NOT NULL
+GROUP BY a.event_id, registration_timing
+ORDER BY a.event_id;
 
 -- Identify underperforming vs high-potential schools
 SELECT 
-    university,
+    a.event_id,
+    d.university,
     COUNT(*) as current_participants,
-    ROUND(AVG(total_checkins), 2) as engagement_quality,
+    ROUND(AVG(a.total_checkins), 2) as engagement_quality,
     CASE 
-        WHEN COUNT(*) >= 30 AND AVG(total_checkins) >= 2.0 THEN 'Excellent Pipeline - Maintain'
-        WHEN COUNT(*) >= 30 AND AVG(total_checkins) < 2.0 THEN 'High Volume, Low Engagement - Improve Quality'
-        WHEN COUNT(*) BETWEEN 10 AND 29 AND AVG(total_checkins) >= 2.0 THEN 'Growth Opportunity - Scale Up'
+        WHEN COUNT(*) >= 30 AND AVG(a.total_checkins) >= 2.0 THEN 'Excellent Pipeline - Maintain'
+        WHEN COUNT(*) >= 30 AND AVG(a.total_checkins) < 2.0 THEN 'High Volume, Low Engagement - Improve Quality'
+        WHEN COUNT(*) BETWEEN 10 AND 29 AND AVG(a.total_checkins) >= 2.0 THEN 'Growth Opportunity - Scale Up'
         WHEN COUNT(*) BETWEEN 5 AND 9 THEN 'Emerging Pipeline - Nurture'
         ELSE 'Untapped Market - Explore'
     END as recruitment_strategy
-FROM attendees 
-WHERE university != 'Non-University'
-GROUP BY university 
+FROM attendees a
+JOIN university_domains d ON d.email_domain = a.email_domain
+WHERE d.university != 'Non-University'
+GROUP BY a.event_id, d.university
 HAVING COUNT(*) >= 5
-ORDER BY COUNT(*) DESC;
\ No newline at end of file
+ORDER BY a.event_id, COUNT(*) DESC;
@@ -0,0 +1,183 @@
+-- ============================================
+-- HACKDAVIS ANALYTICS SCHEMA (SQLite backend)
+-- Mirrors sql/01_schema.sql for the embedded DB_BACKEND=sqlite database.
+-- Applied automatically by db.py when the database file is created.
+-- ============================================
+
+-- One row per event (season). Every attendee, check-in and rollup row belongs to
+-- one event, and each of those tables' keys lead with event_id, so an event's
+-- rows are stored and indexed together and one season can be replaced or
+-- queried without touching the others.
+CREATE TABLE IF NOT EXISTS events (
+    event_id INTEGER PRIMARY KEY,
+    name VARCHAR(100) NOT NULL UNIQUE,
+    event_date DATE
+);
+
+CREATE TABLE IF NOT EXISTS attendees (
+    event_id INT NOT NULL,
+    number INT NOT NULL,
+    ticket_created_date DATETIME,
+    ticket_last_updated_date DATETIME,
+    ticket VARCHAR(100),
+    ticket_full_name VARCHAR(100),
+    ticket_first_name VARCHAR(50),
+    ticket_last_name VARCHAR(50),
+    ticket_email VARCHAR(100) NOT NULL,
+    ticket_company_name VARCHAR(100),
+    ticket_job_title VARCHAR(100),
+    ticket_phone_number VARCHAR(20),
+    event VARCHAR(100),
+    void_status VARCHAR(20),
+    price DECIMAL(10,2),
+    discount_status VARCHAR(50),
+    ticket_reference VARCHAR(50),
+    tags TEXT,
+    unique_ticket_url TEXT,
+    unique_order_url TEXT,
+    order_reference VARCHAR(50),
+    order_name VARCHAR(100),
+    order_email VARCHAR(100),
+    order_phone_number VARCHAR(20),
+    order_discount_code VARCHAR(50),
+    order_ip VARCHAR(50),
+    order_created_date DATETIME,
+    order_completed_date DATETIME,
+    source VARCHAR(100),
+    source_type VARCHAR(50),
+    venue_checkin TINYINT DEFAULT 0,
+    saturday_lunch_checkin TINYINT DEFAULT 0,
+    sunday_brunch_checkin TINYINT DEFAULT 0,
+    saturday_dinner_checkin TINYINT DEFAULT 0,
+    sunday_midnight_snack_checkin VARCHAR(10),
+    mentor_checkin TINYINT DEFAULT 0,
+    volunteer_checkin TINYINT DEFAULT 0,
+    -- Derived fields
+    email_domain VARCHAR(100),  -- university_domains key; the school is looked up, not copied
+    is_mentor BOOLEAN GENERATED ALWAYS AS (ticket LIKE '%Mentor%') STORED,
+    is_volunteer BOOLEAN GENERATED ALWAYS AS (ticket LIKE '%Volunteer%') STORED,
+    total_checkins INT GENERATED ALWAYS AS (
+        COALESCE(venue_checkin, 0) + 
+        COALESCE(saturday_lunch_checkin, 0) + 
+        COALESCE(sunday_brunch_checkin, 0) + 
+        COALESCE(saturday_dinner_checkin, 0) + 
+        COALESCE(mentor_checkin, 0) + 
+        COALESCE(volunteer_checkin, 0)
+    ) STORED,
+    PRIMARY KEY (event_id, number)
+);
+
+-- Indexes for performance, led by event_id so per-event queries read one event's entries
+CREATE INDEX IF NOT EXISTS idx_ticket_email ON attendees(event_id, ticket_email);
+CREATE INDEX IF NOT EXISTS idx_ticket_created_date ON attendees(event_id, ticket_created_date);
+CREATE INDEX IF NOT EXISTS idx_ticket ON attendees(event_id, ticket);
+CREATE INDEX IF NOT EXISTS idx_source ON attendees(event_id, source);
+CREATE INDEX IF NOT EXISTS idx_order_created_date ON attendees(event_id, order_created_date);
+CREATE INDEX IF NOT EXISTS idx_void_status ON attendees(event_id, void_status);
+CREATE INDEX IF NOT EXISTS idx_email_domain ON attendees(event_id, email_domain);
+
+-- Email domain -> university dimension, used instead of LIKE scans on emails.
+-- The importer adds any new .edu domain it sees; edit rows here (or in the
+-- table) to rename a school or move it to another school type/region; cached
+-- charts and the snapshot pick up the change (see the triggers below).
+CREATE TABLE IF NOT EXISTS university_domains (
+    email_domain VARCHAR(100) PRIMARY KEY,
+    university VARCHAR(100) NOT NULL,
+    school_type VARCHAR(50) NOT NULL,
+    region VARCHAR(50) NOT NULL
+);
+
+INSERT INTO university_domains (email_domain, university, school_type, region) VALUES
+    ('ucdavis.edu', 'UC Davis', 'UC Davis', 'Bay Area/Sac'),
+    ('berkeley.edu', 'UC Berkeley', 'Other UC Schools', 'Bay Area/Sac'),
+    ('stanford.edu', 'Stanford', 'Stanford', 'Bay Area/Sac'),
+    ('sjsu.edu', 'sjsu.edu', 'San Jose State', 'Bay Area/Sac');
+
+-- One row per attendee per checkpoint they checked in to. Populated from every
+-- "Check-ins: ..." column in the export, so new checkpoints need no schema change.
+CREATE TABLE IF NOT EXISTS attendee_checkins (
+    event_id INT NOT NULL,
+    attendee_number INT NOT NULL,
+    checkpoint VARCHAR(100) NOT NULL,
+    checked_in_at DATETIME,
+    PRIMARY KEY (event_id, attendee_number, checkpoint)
+);
+
+CREATE INDEX IF NOT EXISTS idx_checkpoint ON attendee_checkins(event_id, checkpoint);
+
+-- Pre-aggregated report tables, kept up to date by import_csv.py as rows are
+-- inserted or changed so reports never need to scan attendees
+CREATE TABLE IF NOT EXISTS rollup_daily_registrations (
+    event_id INT NOT NULL,
+    registration_date DATE NOT NULL,
+    registrations INT NOT NULL DEFAULT 0,
+    cumulative INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (event_id, registration_date)
+);
+
+CREATE TABLE IF NOT EXISTS rollup_university_domains (
+    event_id INT NOT NULL,
+    email_domain VARCHAR(100) NOT NULL,
+    attendees INT NOT NULL DEFAULT 0,
+    total_checkins INT NOT NULL DEFAULT 0,
+    venue_checkins INT NOT NULL DEFAULT 0,
+    revenue DECIMAL(12,2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (event_id, email_domain)
+);
+
+CREATE TABLE IF NOT EXISTS rollup_engagement_tiers (
+    event_id INT NOT NULL,
+    engagement_level VARCHAR(50) NOT NULL,
+    participants INT NOT NULL DEFAULT 0,
+    total_checkins INT NOT NULL DEFAULT 0,
+    priced_participants INT NOT NULL DEFAULT 0,
+    total_price DECIMAL(12,2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (event_id, engagement_level)
+);
+
+-- Single-row counter bumped in the same transaction as every write to the
+-- tables above, so the chart query cache and the columnar snapshot can tell
+-- whether the data changed with one primary key read. database_id tells
+-- databases (and recreated ones) apart, as their counters restart at 0.
+CREATE TABLE IF NOT EXISTS data_version (
+    id INT PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    database_id VARCHAR(36) NOT NULL
+);
+
+INSERT INTO data_version (id, version, database_id) VALUES (1, 0, lower(hex(randomblob(16))));
+
+-- Charts group attendees through university_domains, so any edit to it
+-- (including a manual rename or regrouping) is a new data version
+CREATE TRIGGER IF NOT EXISTS university_domains_insert AFTER INSERT ON university_domains
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS university_domains_update AFTER UPDATE ON university_domains
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS university_domains_delete AFTER DELETE ON university_domains
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE id = 1;
+END;
+
+-- Views for analysis
+CREATE VIEW IF NOT EXISTS orders_analysis AS
+SELECT 
+    event_id,
+    order_reference as order_id,
+    number as attendee_number,
+    order_created_date,
+    order_completed_date,
+    price as total_amount,
+    order_discount_code as discount_code,
+    source as registration_source,
+    source_type,
+    CASE 
+        WHEN void_status IS NULL OR void_status = '' THEN 'completed'
+        ELSE 'void'
+    END as payment_status
+FROM attendees;
@@ -0,0 +1,29 @@
+import os
+import sys
+
+# Tests run on the embedded backend, so they need no server and never touch a
+# configured MySQL database. config reads these when it is first imported.
+os.environ['DB_BACKEND'] = 'sqlite'
+os.environ['SNAPSHOT'] = '0'
+os.environ['QUERY_CACHE'] = '0'
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                      'data', 'sample', 'sample_event_data.csv')
+
+@pytest.fixture
+def sqlite_database(tmp_path, monkeypatch):
+    """Path of a new embedded database, used by every get_connection() in the test"""
+    import db
+    path = str(tmp_path / 'event_analytics.db')
+    monkeypatch.setattr(db, 'SQLITE_DATABASE', path)
+    return path
+
+@pytest.fixture
+def sample_database(sqlite_database):
+    """sqlite_database with the sample export imported"""
+    import import_csv
+    assert import_csv.import_event_data(SAMPLE)
+    return sqlite_database
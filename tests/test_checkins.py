@@ -0,0 +1,64 @@
+import sqlite3
+import pandas as pd
+import db
+import import_csv
+from conftest import SAMPLE
+
+UPDATED = 'Ticket Last Updated Date (-07:00 Pacific Time (US & Canada))'
+LUNCH = 'Check-ins: Saturday Lunch Check-in'
+
+def query(path, sql):
+    connection = sqlite3.connect(path)
+    try:
+        return connection.execute(sql).fetchall()
+    finally:
+        connection.close()
+
+def stored_checkins(path):
+    return query(path, "SELECT event_id, attendee_number, checkpoint FROM attendee_checkins "
+                       "ORDER BY event_id, attendee_number, checkpoint")
+
+def changed_export(tmp_path):
+    """The sample with ticket 1 newly checked in to lunch and ticket 3's lunch check-in removed"""
+    df = pd.read_csv(SAMPLE, dtype=str)
+    for number, lunch in (('1', '1.0'), ('3', None)):
+        row = df['Number'] == number
+        df.loc[row, LUNCH] = lunch
+        df.loc[row, UPDATED] = '2025-04-18 09:00:00 -0700'
+    path = str(tmp_path / 'changed.csv')
+    df.to_csv(path, index=False)
+    return path
+
+def test_checkins_match_the_export_flags(sample_database):
+    export = pd.read_csv(SAMPLE)
+    export = export[export['Ticket Email'].notna()]
+    expected = {import_csv.checkpoint_name(col): int((export[col] > 0).sum())
+                for col in export.columns if col.startswith(import_csv.CHECKIN_PREFIX)}
+    stored = dict(query(sample_database, "SELECT checkpoint, COUNT(*) FROM attendee_checkins GROUP BY checkpoint"))
+    assert stored == expected
+    # Unmapped checkpoint columns need no attendees column
+    assert stored['Hardware Lab'] > 0
+
+def lunch_attendees(path):
+    return {number for (number,) in query(
+        path, "SELECT attendee_number FROM attendee_checkins WHERE checkpoint = 'Saturday Lunch'")}
+
+def test_incremental_import_replaces_changed_checkins(tmp_path, sample_database):
+    before = lunch_attendees(sample_database)
+    assert 1 not in before and 3 in before
+    assert import_csv.import_event_data(changed_export(tmp_path), mode='incremental')
+    assert lunch_attendees(sample_database) == before - {3} | {1}
+
+def test_replace_and_incremental_imports_agree(tmp_path, monkeypatch, sample_database):
+    changed = changed_export(tmp_path)
+    assert import_csv.import_event_data(changed, mode='incremental')
+    incremental = (stored_checkins(sample_database),
+                   query(sample_database, "SELECT * FROM attendees ORDER BY event_id, number"))
+
+    replaced_path = str(tmp_path / 'replaced.db')
+    monkeypatch.setattr(db, 'SQLITE_DATABASE', replaced_path)
+    assert import_csv.import_event_data(SAMPLE)
+    assert import_csv.import_event_data(changed, mode='replace')
+    replaced = (stored_checkins(replaced_path),
+                query(replaced_path, "SELECT * FROM attendees ORDER BY event_id, number"))
+    assert incremental == replaced
@@ -0,0 +1,101 @@
+import argparse
+import os
+import re
+import pandas as pd
+import pytest
+import chart_data
+import create_visualizations
+import import_csv
+from conftest import SAMPLE
+
+def chart_files(directory, extension='.png'):
+    return sorted(name for name in os.listdir(directory) if name.endswith(extension))
+
+def top_schools():
+    """A small chart 6 dataset"""
+    return pd.DataFrame({'university': ['ucdavis.edu', 'csus.edu'], 'attendees': [40, 12],
+                         'engagement': [2.5, 1.75], 'revenue': [400.0, 90.0]})
+
+def test_chart_registry():
+    charts = create_visualizations.CHARTS
+    assert sorted(charts) == list(range(1, 9))
+    for number, (name, dataset, description) in charts.items():
+        assert name.startswith(f'chart{number}_') and callable(getattr(create_visualizations, name))
+        assert dataset in chart_data.DATASET_INPUTS
+        assert description
+
+def test_register_chart(monkeypatch):
+    monkeypatch.setattr(create_visualizations, 'CHARTS', {})
+    @create_visualizations.register_chart(9, 'meal_analysis')
+    def chart9_snacks(df=None, profile=None, event_id=None, event_name=None):
+        """Midnight snack turnout"""
+    assert create_visualizations.CHARTS == {9: ('chart9_snacks', 'meal_analysis', 'Midnight snack turnout')}
+    assert create_visualizations.parse_chart_numbers('9') == [9]
+
+def test_parse_chart_numbers():
+    assert create_visualizations.parse_chart_numbers('3,5') == [3, 5]
+    assert create_visualizations.parse_chart_numbers(' 7 ,') == [7]
+    for value in ('', ',', 'three', '3,x', '9', '0,1'):
+        with pytest.raises(argparse.ArgumentTypeError):
+            create_visualizations.parse_chart_numbers(value)
+
+def test_charts_leave_their_input_unchanged(tmp_path, monkeypatch):
+    monkeypatch.setattr(create_visualizations, 'CHART_DIR', str(tmp_path))
+    df = top_schools()
+    create_visualizations.chart6_top_schools(df, 'draft')
+    assert list(df.columns) == ['university', 'attendees', 'engagement', 'revenue']
+    assert chart_files(tmp_path) == ['6_top_schools.png']
+
+FILE_SIGNATURES = {'.png': b'\x89PNG', '.svg': b'<?xml', '.pdf': b'%PDF'}
+
+def png_width(path):
+    with open(path, 'rb') as f:
+        return int.from_bytes(f.read(24)[16:20], 'big')
+
+def pdf_pages(path):
+    with open(path, 'rb') as f:
+        return len(re.findall(rb'/Type\s*/Page\b(?!s)', f.read()))
+
+@pytest.mark.parametrize('profile', sorted(create_visualizations.RENDER_PROFILES))
+def test_render_profile_output_files(profile, tmp_path, monkeypatch):
+    monkeypatch.setattr(create_visualizations, 'CHART_DIR', str(tmp_path))
+    _, _, error = create_visualizations.render_chart('chart6_top_schools', top_schools(), profile=profile)
+    assert error is None
+    formats = create_visualizations.RENDER_PROFILES[profile]['formats']
+    assert sorted(os.listdir(tmp_path)) == sorted(f'6_top_schools.{extension}' for extension in formats)
+    for name in os.listdir(tmp_path):
+        with open(tmp_path / name, 'rb') as f:
+            assert f.read().startswith(FILE_SIGNATURES[os.path.splitext(name)[1]]), name
+
+def test_draft_renders_at_screen_resolution(tmp_path, monkeypatch):
+    monkeypatch.setattr(create_visualizations, 'CHART_DIR', str(tmp_path))
+    widths = {}
+    for profile in ('draft', 'final'):
+        create_visualizations.render_chart('chart6_top_schools', top_schools(), profile=profile)
+        widths[profile] = png_width(tmp_path / '6_top_schools.png')
+    assert widths['draft'] < widths['final']
+
+def test_pdf_has_one_page_per_chart(sample_database, tmp_path, monkeypatch):
+    monkeypatch.setattr(create_visualizations, 'CHART_DIR', str(tmp_path / 'charts'))
+    path = str(tmp_path / 'report' / 'charts.pdf')
+    create_visualizations.main(charts=[1, 5, 6], pdf=path, profile='draft')
+    assert pdf_pages(path) == 3
+    assert create_visualizations._pdf_pages is None
+    # The pages are not written as separate files
+    assert chart_files(tmp_path / 'charts', '') == []
+
+    results = create_visualizations.render_pdf(str(tmp_path / 'one.pdf'), [('chart6_top_schools', top_schools())])
+    assert [(name, error) for name, _, error in results] == [('chart6_top_schools', None)]
+    assert pdf_pages(tmp_path / 'one.pdf') == 1
+
+def test_banner_names_the_event(sqlite_database, tmp_path, monkeypatch, capsys):
+    assert import_csv.import_event_data(SAMPLE, event='Fall Hack')
+    monkeypatch.setattr(create_visualizations, 'CHART_DIR', str(tmp_path / 'charts'))
+    create_visualizations.main(charts=[6], profile='draft')
+    assert "Creating Fall Hack Analytics - 1 of 8 Charts" in capsys.readouterr().out
+
+def test_parallel_render(sample_database, tmp_path, monkeypatch):
+    monkeypatch.setattr(create_visualizations, 'CHART_DIR', str(tmp_path / 'charts'))
+    create_visualizations.main(jobs=2, charts=[1, 5, 6], profile='draft')
+    assert chart_files(tmp_path / 'charts') == \
+        ['1_university_breakdown.png', '5_meal_analysis.png', '6_top_schools.png']
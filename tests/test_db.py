@@ -0,0 +1,55 @@
+import sqlite3
+import db
+
+def test_connect_creates_the_schema(sqlite_database):
+    connection = db.get_connection()
+    try:
+        cursor = connection.cursor()
+        tables = {name for (name,) in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        assert {'events', 'attendees', 'attendee_checkins', 'university_domains', 'data_version'} <= tables
+        assert db.data_version(cursor).endswith(':0')
+    finally:
+        connection.close()
+
+def test_mysql_functions(sqlite_database):
+    connection = db.get_connection()
+    try:
+        row = connection.execute(
+            "SELECT DATEDIFF('2025-04-19', '2025-04-10 23:59:00'), DAYNAME('2025-04-19 12:00:00'), "
+            "SUBSTRING_INDEX('a@cs.ucdavis.edu', '@', -1), SUBSTRING_INDEX('cs.ucdavis.edu', '.', -2), "
+            "DATEDIFF(NULL, '2025-04-10'), CONCAT('a', 1, 'b')"
+        ).fetchone()
+    finally:
+        connection.close()
+    assert row == (9, 'Saturday', 'cs.ucdavis.edu', 'ucdavis.edu', None, 'a1b')
+
+def test_adapt_sql():
+    assert db.adapt_sql("INSERT IGNORE INTO t (a) VALUES (%s) -- 100%%") == \
+        "INSERT OR IGNORE INTO t (a) VALUES (?) -- 100%"
+
+def test_upsert_and_accumulate_clauses(sqlite_database):
+    connection = db.get_connection()
+    try:
+        cursor = connection.cursor()
+        columns, key = ['event_id', 'engagement_level', 'participants'], ['event_id', 'engagement_level']
+        insert = f"INSERT INTO rollup_engagement_tiers ({', '.join(columns)}) VALUES (%s, %s, %s)"
+        for count in (2, 3):
+            cursor.execute(db.adapt_sql(insert + db.accumulate_clause(columns, key)), (1, 'High (4+ meals)', count))
+        assert cursor.execute("SELECT participants FROM rollup_engagement_tiers").fetchall() == [(5,)]
+        cursor.execute(db.adapt_sql(insert + db.upsert_clause(columns, key)), (1, 'High (4+ meals)', 1))
+        assert cursor.execute("SELECT participants FROM rollup_engagement_tiers").fetchall() == [(1,)]
+    finally:
+        connection.close()
+
+def test_database_connection_rolls_back_on_error(sqlite_database):
+    try:
+        with db.database_connection() as connection:
+            connection.execute("INSERT INTO events (name) VALUES ('Rolled Back')")
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    connection = sqlite3.connect(sqlite_database)
+    try:
+        assert connection.execute("SELECT COUNT(*) FROM events").fetchone() == (0,)
+    finally:
+        connection.close()
@@ -0,0 +1,55 @@
+import sqlite3
+import pytest
+import db
+import events
+import import_csv
+from config import EVENT_CONFIG
+from conftest import SAMPLE
+
+def event_dates(path):
+    connection = sqlite3.connect(path)
+    try:
+        return dict(connection.execute("SELECT name, event_date FROM events").fetchall())
+    finally:
+        connection.close()
+
+def test_check_date():
+    assert events.check_date('2025-4-19') == '2025-04-19'
+    for value in ('19/04/2025', '2025-02-30', ''):
+        with pytest.raises(ValueError):
+            events.check_date(value)
+
+def test_undated_events_are_reported(sqlite_database, monkeypatch, capsys):
+    monkeypatch.setitem(EVENT_CONFIG, 'event_name', 'Configured Hack')
+    assert import_csv.import_event_data(SAMPLE, event='Configured Hack')
+    assert import_csv.import_event_data(SAMPLE, event='Fall Hack')
+    assert event_dates(sqlite_database) == {'Configured Hack': EVENT_CONFIG['event_date'], 'Fall Hack': None}
+    output = capsys.readouterr().out
+    assert "Event 'Fall Hack' has no event date" in output
+    assert "Event 'Configured Hack' has no event date" not in output
+
+def test_import_sets_the_event_date(sqlite_database):
+    assert import_csv.import_event_data(SAMPLE, event='Fall Hack', event_date='2024-11-02')
+    assert event_dates(sqlite_database) == {'Fall Hack': '2024-11-02'}
+    # Also for an event that is already stored
+    assert import_csv.import_event_files([SAMPLE], event='Fall Hack', event_date='2024-11-09', mode='incremental')
+    assert event_dates(sqlite_database) == {'Fall Hack': '2024-11-09'}
+    assert not import_csv.import_event_data(SAMPLE, event='Fall Hack', event_date='November')
+
+def test_set_date_includes_the_event_in_timing_reports(sample_database):
+    timing = ("SELECT COUNT(*) FROM attendees a JOIN events e ON e.event_id = a.event_id "
+              "WHERE e.event_date IS NOT NULL AND DATEDIFF(e.event_date, a.ticket_created_date) > 7")
+    with db.database_connection() as connection:
+        cursor = connection.cursor()
+        event_id, _ = events.resolve_event(cursor)
+        cursor.execute(timing)
+        assert cursor.fetchone()[0] == 0
+        version = db.data_version(cursor)
+        events.set_date(cursor, event_id, '2025-04-19')
+        connection.commit()
+        assert db.data_version(cursor) > version
+        cursor.execute(timing)
+        assert cursor.fetchone()[0] > 0
+        with pytest.raises(ValueError):
+            events.set_date(cursor, event_id, 'soon')
+        cursor.close()
@@ -0,0 +1,53 @@
+import sqlite3
+import pandas as pd
+import db
+import import_csv
+from conftest import SAMPLE
+from test_import_methods import stored_attendees
+
+def write_export(df, path):
+    df.to_csv(path, index=False)
+    return str(path)
+
+def event_counts(path):
+    connection = sqlite3.connect(path)
+    try:
+        return dict(connection.execute(
+            "SELECT e.name, COUNT(*) FROM attendees a JOIN events e ON e.event_id = a.event_id GROUP BY e.name"
+        ).fetchall())
+    finally:
+        connection.close()
+
+def test_overlapping_shards_skip_duplicate_tickets(sqlite_database, tmp_path, monkeypatch):
+    sample = pd.read_csv(SAMPLE, dtype=str)
+    shards = [write_export(sample.iloc[:600], tmp_path / 'part1.csv'),
+              write_export(sample.iloc[400:], tmp_path / 'part2.csv')]
+    assert import_csv.import_event_files(shards, workers=2)
+    batch = stored_attendees(sqlite_database)
+
+    monkeypatch.setattr(db, 'SQLITE_DATABASE', str(tmp_path / 'single.db'))
+    assert import_csv.import_event_data(SAMPLE)
+    assert batch == stored_attendees(str(tmp_path / 'single.db'))
+
+def test_blank_events_are_named_after_their_file(sqlite_database, tmp_path):
+    sample = pd.read_csv(SAMPLE, dtype=str).assign(Event=None)
+    write_export(sample.iloc[:500], tmp_path / 'Spring Hack.csv')
+    write_export(sample.iloc[500:], tmp_path / 'Fall Hack.csv')
+    assert import_csv.import_event_files([str(tmp_path)], workers=2)
+    counts = event_counts(sqlite_database)
+    assert set(counts) == {'Spring Hack', 'Fall Hack'}
+    assert sum(counts.values()) == len(stored_attendees(sqlite_database))
+
+def test_replace_leaves_other_events_untouched(sqlite_database, tmp_path):
+    sample = pd.read_csv(SAMPLE, dtype=str)
+    spring = write_export(sample.assign(Event='Spring Hack'), tmp_path / 'spring.csv')
+    fall = write_export(sample.assign(Event='Fall Hack'), tmp_path / 'fall.csv')
+    assert import_csv.import_event_files([spring, fall])
+    full = event_counts(sqlite_database)
+    assert full['Spring Hack'] == full['Fall Hack']
+
+    smaller = write_export(sample.iloc[:100].assign(Event='Spring Hack'), tmp_path / 'spring_fix.csv')
+    assert import_csv.import_event_files([smaller], mode='replace')
+    counts = event_counts(sqlite_database)
+    assert counts['Fall Hack'] == full['Fall Hack']
+    assert counts['Spring Hack'] == sample.iloc[:100]['Ticket Email'].notna().sum()
@@ -0,0 +1,104 @@
+import re
+import sqlite3
+import pandas as pd
+import pytest
+import db
+import import_csv
+from conftest import SAMPLE
+
+DATE_VALUE = re.compile(r'\d{4}-\d\d-\d\d \d\d:\d\d:\d\d')
+
+def stored_attendees(path):
+    connection = sqlite3.connect(path)
+    try:
+        return connection.execute(
+            f"SELECT {', '.join(import_csv.DB_COLUMNS)} FROM attendees ORDER BY event_id, number"
+        ).fetchall()
+    finally:
+        connection.close()
+
+def import_into(path, monkeypatch, **options):
+    monkeypatch.setattr(db, 'SQLITE_DATABASE', path)
+    assert import_csv.import_event_data(SAMPLE, **options)
+    return stored_attendees(path)
+
+def cleaned_sample(compact=True):
+    stats = {'read': 0, 'removed': 0}
+    chunks = import_csv.read_csv_chunks(SAMPLE, 0, compact)
+    chunks = import_csv.clean_records(import_csv.filter_invalid_records(import_csv.rename_columns(chunks), stats))
+    return pd.concat(chunks).assign(event_id=1)
+
+@pytest.mark.parametrize('compact', [True, False])
+@pytest.mark.parametrize('method', ['batch', 'row'])
+def test_import_methods_store_the_same_rows(tmp_path, monkeypatch, method, compact):
+    reference = import_into(str(tmp_path / 'reference.db'), monkeypatch, method='batch', compact=False)
+    rows = import_into(str(tmp_path / f'{method}.db'), monkeypatch, method=method, compact=compact)
+    assert rows == reference
+    assert len(rows) == pd.read_csv(SAMPLE)['Ticket Email'].notna().sum()
+    
+    dates = [import_csv.DB_COLUMNS.index(col) for col in import_csv.DATE_COLUMNS]
+    assert all(DATE_VALUE.fullmatch(row[i]) for row in rows for i in dates if row[i] is not None)
+
+@pytest.mark.parametrize('method', ['batch', 'row'])
+def test_incremental_reimport_changes_nothing(tmp_path, monkeypatch, method):
+    path = str(tmp_path / 'incremental.db')
+    first = import_into(path, monkeypatch, method=method)
+    assert import_into(path, monkeypatch, method=method, mode='incremental') == first
+
+def test_load_data_file_formats_dates(monkeypatch):
+    class RecordingCursor:
+        """Keeps the lines of each LOAD DATA file (which needs MySQL to run)"""
+        def __init__(self):
+            self.lines = []
+        
+        def execute(self, sql, params=None):
+            path = re.search(r"INFILE '([^']+)'", sql).group(1)
+            with open(path, encoding='utf-8') as f:
+                self.lines.extend(f.read().splitlines())
+    
+    df = cleaned_sample()
+    cursor = RecordingCursor()
+    import_csv.load_data_batch(cursor, import_csv.dataframe_to_rows(df, import_csv.DB_COLUMNS))
+    
+    assert len(cursor.lines) == len(df)
+    for col in import_csv.DATE_COLUMNS:
+        values = [line.split('\t')[import_csv.DB_COLUMNS.index(col)] for line in cursor.lines]
+        assert all(value == '\\N' or DATE_VALUE.fullmatch(value) for value in values), col
+
+def test_blank_categorical_checkin_column_is_null():
+    series = pd.Series([None, None, None], dtype='category')
+    assert import_csv.clean_checkin_column(series).isna().all()
+
+MESSY_DATES = ['2025-04-10 09:15:00', '2025-04-10 09:15:00 -0700', '2025-04-10 09:15:00-0800',
+               '04/10/2025 9:15 AM', 'April 10, 2025 9:15 PM', '2025-04-10', '2025-04-10T09:15:00',
+               '', '  ', 'not a date', '2025-02-30 10:00:00', '2025-13-01 00:00:00', None, float('nan')]
+
+def stored_values(series):
+    """Values as sent to the database"""
+    return [row[0] for row in import_csv.dataframe_to_rows(series.to_frame('value'), ['value'])]
+
+def test_vectorized_dates_match_row_wise_cleaning():
+    series = pd.Series(MESSY_DATES, dtype=object)
+    expected = [import_csv.clean_datetime(value) for value in MESSY_DATES]
+    assert stored_values(import_csv.clean_datetime_column(series)) == expected
+    assert expected.count(None) == 7
+
+@pytest.mark.parametrize('values', [
+    [1.0, 0.0, float('nan'), 1.0],                   # flags as read without --compact
+    [1.0, '', None, 0.0],                            # blanks
+    ['1.0', 'yes', '', 2.5, 0.0, None],              # mixed values keep the per-value behaviour
+])
+@pytest.mark.parametrize('dtype', [object, 'category'])
+def test_vectorized_checkins_match_row_wise_cleaning(values, dtype):
+    series = pd.Series(values, dtype=dtype)
+    assert stored_values(import_csv.clean_checkin_column(series)) == \
+        stored_values(series.astype(object).apply(import_csv.clean_numeric))
+
+def test_checkin_flags_read_as_text_become_integers():
+    # Compact imports read flags as categories of text ('1.0'); stored as the same numbers
+    series = pd.Series(['1.0', '0.0', None, '1.0'], dtype='category')
+    cleaned = import_csv.clean_checkin_column(series)
+    assert str(cleaned.dtype) == 'Int8'
+    assert stored_values(cleaned) == [1, 0, None, 1]
+    assert [None if value is None else float(value)
+            for value in stored_values(series.astype(object).apply(import_csv.clean_numeric))] == [1.0, 0.0, None, 1.0]
@@ -0,0 +1,61 @@
+import json
+import sqlite3
+import pytest
+import instrumentation
+from config import INSTRUMENTATION_CONFIG
+
+@pytest.fixture
+def output(monkeypatch):
+    """Enable span recording for the test, starting from no spans"""
+    monkeypatch.setitem(INSTRUMENTATION_CONFIG, 'output', 'summary')
+    monkeypatch.setattr(instrumentation, '_spans', [])
+    monkeypatch.setattr(instrumentation, '_run', {'id': None, 'script': None})
+    return monkeypatch
+
+def test_disabled_records_nothing(monkeypatch):
+    monkeypatch.setitem(INSTRUMENTATION_CONFIG, 'output', '')
+    monkeypatch.setattr(instrumentation, '_spans', [])
+    with instrumentation.span('read') as details:
+        details['rows'] = 10
+    instrumentation.record('write', 1.0)
+    assert instrumentation._spans == []
+    assert instrumentation.instrument_cursor('cursor') == 'cursor'
+
+def test_summarize_totals_spans_by_name(output):
+    with instrumentation.span('read', rows=5):
+        pass
+    with instrumentation.span('clean') as details:
+        details['rows'] = 3
+    instrumentation.record('read', 0.5, rows=7, nbytes=100)
+    totals = instrumentation.summarize()
+    assert [total['name'] for total in totals] == ['read', 'clean']
+    read, clean = totals
+    assert (read['calls'], read['rows'], read['bytes']) == (2, 12, 100)
+    assert read['seconds'] >= 0.5
+    assert (clean['calls'], clean['rows'], clean['bytes']) == (1, 3, None)
+
+def test_instrumented_cursor_times_statements(output):
+    connection = sqlite3.connect(':memory:')
+    cursor = instrumentation.instrument_cursor(connection.cursor())
+    cursor.execute("CREATE TABLE attendees (number INTEGER)")
+    cursor.executemany("INSERT INTO attendees VALUES (?)", ((number,) for number in range(4)))
+    cursor.execute("SELECT number FROM attendees WHERE number > ?", (1,))
+    assert [row for row, in cursor] == [2, 3]
+    connection.close()
+    totals = {total['name']: total for total in instrumentation.summarize()}
+    assert totals['sql INSERT INTO attendees']['rows'] == 4
+    assert 'sql SELECT ... FROM attendees' in totals
+    assert 'sql CREATE TABLE attendees' in totals
+
+def test_run_writes_json_lines(output, tmp_path):
+    path = str(tmp_path / 'spans.jsonl')
+    output.setitem(INSTRUMENTATION_CONFIG, 'output', 'jsonl')
+    output.setitem(INSTRUMENTATION_CONFIG, 'log_path', path)
+    output.setitem(INSTRUMENTATION_CONFIG, 'profile', '')
+    with instrumentation.run('import_csv'):
+        instrumentation.record('read', 0.1, rows=2)
+    with open(path) as f:
+        spans = [json.loads(line) for line in f]
+    assert [span['name'] for span in spans] == ['read', 'total']
+    assert {span['script'] for span in spans} == {'import_csv'}
+    assert len({span['run'] for span in spans}) == 1
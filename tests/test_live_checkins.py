@@ -0,0 +1,90 @@
+import json
+import sqlite3
+from datetime import datetime
+import db
+import live_checkins
+import rollups
+from import_csv import DATETIME_FORMAT
+
+def lunch_flags(path, numbers):
+    connection = sqlite3.connect(path)
+    try:
+        placeholders = ', '.join('?' * len(numbers))
+        return dict(connection.execute(
+            f"SELECT number, saturday_lunch_checkin FROM attendees WHERE number IN ({placeholders})", numbers
+        ).fetchall())
+    finally:
+        connection.close()
+
+def test_parse_event_formats():
+    assert live_checkins.parse_event('12,Saturday Lunch,2025-04-19 12:03:00 -0700') == \
+        (12, 'Saturday Lunch', '2025-04-19 12:03:00')
+    assert live_checkins.parse_event(
+        '{"number": 12, "checkpoint": "saturday_lunch_checkin", "at": "2025-04-19T12:03:00"}'
+    ) == (12, 'Saturday Lunch', '2025-04-19 12:03:00')
+
+def test_parse_event_timestamps():
+    number, checkpoint, at = live_checkins.parse_event('12,Saturday Lunch')
+    assert datetime.strptime(at, DATETIME_FORMAT)
+    assert live_checkins.parse_event('{"number": 12, "checkpoint": "Saturday Lunch", "at": ""}')[2]
+    assert live_checkins.parse_event('12,Saturday Lunch,soon') is None
+    assert live_checkins.parse_event('{"number": 12, "checkpoint": "Saturday Lunch", "at": "soon"}') is None
+
+def test_parse_event_rejects_malformed_lines():
+    for line in ('', 'x,Saturday Lunch', '12', '12,', '{"number": 12}', '{not json'):
+        assert live_checkins.parse_event(line) is None
+
+def test_ingest_drops_duplicates_and_unknown_attendees(sample_database, tmp_path):
+    metrics_path = str(tmp_path / 'live_metrics.json')
+    lines = [
+        '1,Saturday Lunch,2025-04-19 12:01:00',
+        '1,saturday_lunch_checkin,2025-04-19 12:02:00',  # same check-in, by column name
+        '3,Saturday Lunch,2025-04-19 12:03:00',          # already imported
+        '99999,Saturday Lunch,2025-04-19 12:04:00',
+        'garbage',
+    ]
+    stats = live_checkins.ingest(lines, metrics_path=metrics_path)
+    assert stats == {'received': 5, 'invalid': 1, 'recorded': 1, 'duplicates': 2, 'unknown': 1,
+                     'write_errors': 0}
+    assert lunch_flags(sample_database, [1, 3]) == {1: 1, 3: 1}
+    with open(metrics_path) as f:
+        metrics = json.load(f)
+    connection = sqlite3.connect(sample_database)
+    stored, = connection.execute(
+        "SELECT COUNT(*) FROM attendee_checkins WHERE checkpoint = 'Saturday Lunch'").fetchone()
+    connection.close()
+    assert metrics['checkpoints']['Saturday Lunch'] == stored
+
+def test_failed_write_keeps_the_batch_pending(sample_database, monkeypatch):
+    monkeypatch.setattr(live_checkins, 'RETRY_INTERVAL', 0)
+    stored = ("SELECT (SELECT COUNT(*) FROM attendee_checkins), "
+              "(SELECT SUM(venue_checkins) FROM rollup_university_domains)")
+    with db.database_connection() as connection:
+        # Every sample attendee entered the venue; take attendee 1's entry back out
+        connection.execute("DELETE FROM attendee_checkins WHERE attendee_number = 1 AND checkpoint = 'Venue'")
+        connection.execute("UPDATE attendees SET venue_checkin = 0 WHERE number = 1")
+        rollups.rebuild(connection, connection.cursor(), 1)
+        counters = live_checkins.LiveCounters.load(connection, 1)
+        before = counters.attendance
+        writer = live_checkins.CheckinWriter(connection, counters, 1)
+        rows = connection.execute(stored).fetchone()
+        accumulate = rollups.accumulate
+        def fail(cursor, deltas):
+            # The rollup rows are written, then the batch fails before its one commit
+            accumulate(cursor, deltas)
+            monkeypatch.setattr(rollups, 'accumulate', accumulate)
+            raise sqlite3.OperationalError('database is locked')
+        monkeypatch.setattr(rollups, 'accumulate', fail)
+        writer.add(live_checkins.parse_event('1,Venue,2025-04-19 09:01:00'))
+        writer.add(live_checkins.parse_event('99999,Venue,2025-04-19 09:02:00'))
+        assert writer.flush() == 0
+        assert writer.pending == [(1, 'Venue', '2025-04-19 09:01:00')]
+        assert writer.stats['write_errors'] == writer.stats['unknown'] == 1
+        assert counters.attendance == before
+        assert connection.execute(stored).fetchone() == rows
+        assert writer.flush() == 1
+        assert writer.pending == []
+        assert writer.stats['unknown'] == 1
+        assert counters.attendance == before + 1
+        assert connection.execute(stored).fetchone() == (rows[0] + 1, rows[1] + 1)
+        writer.close()
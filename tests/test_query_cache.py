@@ -0,0 +1,82 @@
+import os
+import pandas as pd
+import pytest
+import db
+import create_visualizations
+import query_cache
+from config import QUERY_CACHE_CONFIG
+
+QUERY = "SELECT email_domain, attendees FROM rollup_university_domains WHERE event_id = 1 ORDER BY email_domain"
+
+@pytest.fixture
+def cache_directory(tmp_path, monkeypatch):
+    """Cache enabled, in a new directory"""
+    directory = str(tmp_path / 'queries')
+    monkeypatch.setitem(QUERY_CACHE_CONFIG, 'enabled', True)
+    monkeypatch.setitem(QUERY_CACHE_CONFIG, 'directory', directory)
+    return directory
+
+def entries(directory):
+    if not os.path.isdir(directory):
+        return []
+    return sorted(name for name in os.listdir(directory) if name.endswith(query_cache.ENTRY_SUFFIX))
+
+def test_feather_round_trip(cache_directory):
+    df = pd.DataFrame({
+        'university': ['UC Davis', None, 'Stanford'],
+        'attendees': [332, 0, 48],
+        'revenue': [1520.5, float('nan'), 310.0],
+        'first_registration': pd.to_datetime(['2025-03-01 10:00:00', None, '2025-03-02 08:30:00']),
+    }, index=[5, 6, 7])
+    query_cache.store('key', df)
+    pd.testing.assert_frame_equal(query_cache.load('key'), df.reset_index(drop=True))
+    assert query_cache.load('missing') is None
+    # Feather can't store a column mixing value types; such results are not cached
+    query_cache.store('mixed', pd.DataFrame({'value': [1, 'one']}))
+    assert entries(cache_directory) == ['key.feather']
+
+def test_key_changes_with_the_data_version(sample_database):
+    with db.database_connection() as connection:
+        version = query_cache.data_fingerprint(connection)
+        key = query_cache.cache_key(QUERY, version)
+        # Formatting doesn't change the key
+        assert query_cache.cache_key(QUERY.replace(' FROM', '\n    FROM') + ';\n', version) == key
+        cursor = connection.cursor()
+        db.bump_data_version(cursor)
+        connection.commit()
+        cursor.close()
+        assert query_cache.cache_key(QUERY, query_cache.data_fingerprint(connection)) != key
+
+def test_least_recently_used_entries_are_evicted(cache_directory):
+    df = pd.DataFrame({'value': range(100)})
+    for number, key in enumerate(['a', 'b', 'c']):
+        query_cache.store(key, df)
+        os.utime(os.path.join(cache_directory, f'{key}.feather'), (1000 + number, 1000 + number))
+    size = os.path.getsize(os.path.join(cache_directory, 'a.feather'))
+    assert query_cache.load('a') is not None
+    query_cache.store('d', df, max_bytes=3 * size)
+    assert entries(cache_directory) == ['a.feather', 'c.feather', 'd.feather']
+
+def test_cached_results_follow_the_data(sample_database, cache_directory):
+    first = create_visualizations.get_data(QUERY)
+    assert len(entries(cache_directory)) == 1
+    pd.testing.assert_frame_equal(create_visualizations.get_data(QUERY), first)
+    assert len(entries(cache_directory)) == 1
+    with db.database_connection() as connection:
+        cursor = connection.cursor()
+        cursor.execute("UPDATE rollup_university_domains SET attendees = attendees + 1 WHERE event_id = 1")
+        db.bump_data_version(cursor)
+        connection.commit()
+        cursor.close()
+    assert (create_visualizations.get_data(QUERY)['attendees'] == first['attendees'] + 1).all()
+    assert len(entries(cache_directory)) == 2
+
+def test_no_cache_bypasses_the_cache(sample_database, cache_directory, tmp_path, monkeypatch):
+    create_visualizations.get_data(QUERY, use_cache=False)
+    assert entries(cache_directory) == []
+    # --no-cache
+    monkeypatch.setattr(create_visualizations, 'CHART_DIR', str(tmp_path / 'charts'))
+    create_visualizations.main(charts=[6], use_cache=False, profile='draft')
+    assert entries(cache_directory) == []
+    create_visualizations.main(charts=[6], profile='draft', force=True)
+    assert entries(cache_directory) != []
@@ -0,0 +1,63 @@
+import inspect
+import os
+import pandas as pd
+import pytest
+import create_visualizations
+import render_cache
+
+CHART = 'chart6_top_schools'
+
+@pytest.fixture
+def chart_dir(tmp_path, monkeypatch):
+    directory = str(tmp_path / 'charts')
+    os.makedirs(directory)
+    monkeypatch.setattr(create_visualizations, 'CHART_DIR', directory)
+    return directory
+
+def top_schools(attendees=40):
+    return pd.DataFrame({'university': ['ucdavis.edu', 'csus.edu'], 'attendees': [attendees, 12],
+                         'engagement': [2.5, 1.75], 'revenue': [400.0, 90.0]})
+
+def signature(df=None, profile='draft', event_name='HackDavis 2025'):
+    return create_visualizations.chart_signature(CHART, top_schools() if df is None else df, profile, event_name)
+
+def render(chart_dir, key):
+    _, _, error = create_visualizations.render_chart(CHART, top_schools(), key, 'draft', 'HackDavis 2025')
+    assert error is None
+    return render_cache.is_current(CHART, key, chart_dir)
+
+def test_current_after_store(chart_dir):
+    key = signature()
+    assert not render_cache.is_current(CHART, key, chart_dir)
+    assert render(chart_dir, key)
+    assert signature() == key
+
+def test_stale_when_the_signature_changes(chart_dir, monkeypatch):
+    key = signature()
+    assert render(chart_dir, key)
+    changed = [
+        signature(top_schools(attendees=41)),  # data
+        signature(profile='final'),            # render profile
+        signature(event_name='Fall Hack'),     # event named in the titles
+    ]
+    getsource = inspect.getsource
+    monkeypatch.setattr(inspect, 'getsource', lambda obj: getsource(obj) + '\n# edited')
+    changed.append(signature())                # chart source
+    assert len(set(changed)) == len(changed) and key not in changed
+    assert not any(render_cache.is_current(CHART, other, chart_dir) for other in changed)
+    assert render_cache.is_current(CHART, key, chart_dir)
+
+def test_stale_when_a_file_is_missing(chart_dir):
+    key = signature()
+    assert render(chart_dir, key)
+    os.remove(os.path.join(chart_dir, '6_top_schools.png'))
+    assert not render_cache.is_current(CHART, key, chart_dir)
+
+def test_failed_render_is_forgotten(chart_dir):
+    key = signature()
+    assert render(chart_dir, key)
+    _, _, error = create_visualizations.render_chart(CHART, top_schools().drop(columns='revenue'), key, 'draft')
+    assert error.startswith('KeyError')
+    assert not render_cache.is_current(CHART, key, chart_dir)
+    # Already forgotten: a no-op
+    render_cache.invalidate(CHART, chart_dir)
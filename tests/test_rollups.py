@@ -0,0 +1,70 @@
+import sqlite3
+import pandas as pd
+import db
+import import_csv
+import rollups
+from conftest import SAMPLE
+
+CREATED = 'Ticket Created Date (-07:00 Pacific Time (US & Canada))'
+UPDATED = 'Ticket Last Updated Date (-07:00 Pacific Time (US & Canada))'
+LUNCH = 'Check-ins: Saturday Lunch Check-in'
+
+def rollup_rows(path):
+    connection = sqlite3.connect(path)
+    try:
+        return {table: connection.execute(f"SELECT * FROM {table} ORDER BY 1, 2").fetchall()
+                for table in rollups.ROLLUP_TABLES}
+    finally:
+        connection.close()
+
+def rebuilt_rows(path):
+    with db.database_connection() as connection:
+        cursor = connection.cursor()
+        cursor.execute("SELECT DISTINCT event_id FROM attendees")
+        for (event_id,) in cursor.fetchall():
+            rollups.rebuild(connection, cursor, event_id)
+        cursor.close()
+    return rollup_rows(path)
+
+def edited_export(tmp_path):
+    """The sample with ticket 1 moved to another day, domain, price and tier, plus one new ticket"""
+    df = pd.read_csv(SAMPLE, dtype=str)
+    row = df['Number'] == '1'
+    df.loc[row, CREATED] = '2025-02-01 10:00:00 -0800'
+    df.loc[row, 'Ticket Email'] = 'aisha.singh1@berkeley.edu'
+    df.loc[row, 'Price'] = '25.0'
+    df.loc[row, LUNCH] = '1.0'
+    df.loc[row, UPDATED] = '2025-04-18 09:00:00 -0700'
+    added = df[df['Number'] == '2'].copy()
+    added['Number'] = str(int(pd.to_numeric(df['Number']).max()) + 1)
+    added[UPDATED] = '2025-04-18 09:00:00 -0700'
+    df = pd.concat([df, added])
+    path = str(tmp_path / 'edited.csv')
+    df.to_csv(path, index=False)
+    return path
+
+def test_imported_rollups_match_rebuild(sample_database):
+    imported = rollup_rows(sample_database)
+    assert all(imported.values())
+    assert imported == rebuilt_rows(sample_database)
+
+def test_incremental_deltas_match_rebuild(sample_database, tmp_path):
+    before = rollup_rows(sample_database)
+    assert import_csv.import_event_data(edited_export(tmp_path), mode='incremental')
+    updated = rollup_rows(sample_database)
+    assert updated != before
+    assert updated == rebuilt_rows(sample_database)
+
+def test_opposite_deltas_cancel():
+    attendees = pd.read_csv(SAMPLE, nrows=50)
+    attendees = pd.DataFrame({
+        'event_id': 1,
+        'ticket_created_date': pd.to_datetime(attendees[CREATED].str[:19]),
+        'email_domain': attendees['Ticket Email'].str.split('@').str[1],
+        'total_checkins': [number % 5 for number in attendees['Number']],
+        'price': attendees['Price'],
+        'venue_checkin': 1,
+    })
+    combined = rollups.combine([rollups.aggregate(attendees), rollups.aggregate(attendees, sign=-1)])
+    for table, (_, counters) in rollups.ROLLUP_TABLES.items():
+        assert (combined[table][counters] == 0).all().all()
@@ -0,0 +1,90 @@
+import os
+import sqlite3
+import run_reports
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+INDEXES = {
+    'attendees': {'sqlite_autoindex_attendees_1': ['event_id', 'number'],
+                  'idx_attendees_created': ['event_id', 'ticket_created_date']},
+    'university_domains': {'sqlite_autoindex_university_domains_1': ['email_domain']},
+}
+
+def flags(sql, full_scans=('attendees',), plan=()):
+    return run_reports.scan_flags(sql, list(plan), list(full_scans), INDEXES)
+
+def test_split_statements_titles_and_lines():
+    script = (
+        "-- Revenue\n"
+        "SELECT 'a;b' AS label; /* not ; a statement */\n"
+        "\n"
+        "-- Explanatory note\n"
+        "-- Daily registrations\n"
+        "SELECT event_id,\n"
+        "       COUNT(*) -- per event; per day\n"
+        "FROM attendees GROUP BY event_id;\n"
+        "SELECT 1"
+    )
+    statements = run_reports.split_statements(script)
+    assert [(line, title) for line, title, _ in statements] == \
+        [(2, 'Revenue'), (6, 'Daily registrations'), (9, None)]
+    assert statements[0][2] == "SELECT 'a;b' AS label"
+    assert '--' not in statements[1][2] and 'FROM attendees' in statements[1][2]
+
+def test_binds_partition():
+    names = ['attendees', 'a']
+    assert run_reports.binds_partition("SELECT * FROM attendees a WHERE a.event_id = 3", names)
+    assert run_reports.binds_partition("SELECT * FROM attendees WHERE event_id IN (1, 2)", names)
+    assert run_reports.binds_partition("SELECT * FROM attendees WHERE %s = event_id", names)
+    assert not run_reports.binds_partition(
+        "SELECT * FROM attendees a JOIN events e ON e.event_id = a.event_id", names)
+    assert not run_reports.binds_partition("SELECT * FROM attendees WHERE number = 3", names)
+
+def test_unbound_partition_scan_is_flagged():
+    assert flags("SELECT DATE(ticket_created_date), COUNT(*) FROM attendees GROUP BY 1") == \
+        ["full scan of attendees without an event_id predicate (indexed with it: ticket_created_date)"]
+    assert flags("SELECT e.name, COUNT(*) FROM attendees a JOIN events e ON e.event_id = a.event_id "
+                 "GROUP BY e.name") == ["full scan of attendees without an event_id predicate"]
+
+def test_bound_partition_scan_is_flagged_on_second_index_column():
+    sql = "SELECT COUNT(*) FROM attendees WHERE event_id = 1 AND DATE(ticket_created_date) = '2025-04-01'"
+    assert flags(sql) == ["full scan of attendees despite index on ticket_created_date"]
+    assert flags("SELECT COUNT(*) FROM attendees WHERE event_id = 1 AND price > 0") == []
+
+def test_unpartitioned_scan_is_flagged_on_leading_index_column():
+    sql = "SELECT university FROM university_domains WHERE LOWER(email_domain) = 'ucdavis.edu'"
+    assert flags(sql, ['university_domains']) == ["full scan of university_domains despite index on email_domain"]
+    assert flags("SELECT university FROM university_domains", ['university_domains']) == []
+
+def test_correlated_subquery_is_flagged():
+    sql = "SELECT number FROM attendees a WHERE a.event_id = 1"
+    assert flags(sql, [], [{'detail': 'CORRELATED SCALAR SUBQUERY 1'}]) == ["correlated subquery"]
+    assert flags(sql, [], [{'select_type': 'DEPENDENT SUBQUERY', 'table': 'attendees'}]) == ["correlated subquery"]
+
+def test_report_files_use_the_partition_indexes(sample_database):
+    connection = sqlite3.connect(sample_database)
+    indexes = run_reports.load_indexes(connection)
+    connection.close()
+    assert ['event_id', 'ticket_created_date'] in indexes['attendees'].values()
+
+    paths = [os.path.join(ROOT, path) for path in run_reports.REPORT_FILES]
+    entries = [entry for entry in run_reports.collect_statements(paths) if entry['report']]
+    results = [run_reports.run_statement(entry, indexes) for entry in entries]
+    assert [result['error'] for result in results if result['status'] != 'ok'] == []
+    assert [(result['title'], result['flags']) for result in results if result['flags']] == []
+
+    unbound = {'file': 'test', 'line': 1, 'title': 'unbound', 'id': 'test', 'report': True,
+               'sql': "SELECT DATE(ticket_created_date), SUM(price) FROM attendees GROUP BY 1"}
+    assert run_reports.run_statement(unbound, indexes)['flags'] == \
+        ["full scan of attendees without an event_id predicate (indexed with it: ticket_created_date)"]
+
+def test_meal_report_lists_meals_without_checkins(sample_database):
+    path = os.path.join(ROOT, 'sql', '03_core_analytics.sql')
+    meals, = [entry['sql'] for entry in run_reports.collect_statements([path]) if 'waste_estimate' in entry['sql']]
+    connection = sqlite3.connect(sample_database)
+    connection.execute("DELETE FROM attendee_checkins WHERE checkpoint = 'Sunday Brunch'")
+    rows = connection.execute(meals).fetchall()
+    connection.close()
+    assert [row[:2] for row in rows] == [(1, 'Saturday Lunch'), (1, 'Saturday Dinner'), (1, 'Sunday Brunch')]
+    assert rows[0][3] > 0
+    assert rows[2][3:] == (0, 0.0, rows[2][2])
@@ -0,0 +1,76 @@
+import json
+import os
+import sqlite3
+import numpy as np
+import pandas as pd
+import db
+import import_csv
+import rollups
+import snapshot
+from conftest import SAMPLE
+
+def stored_frame(path, table, columns):
+    connection = sqlite3.connect(path)
+    try:
+        return pd.read_sql(f"SELECT {', '.join(columns)} FROM {table} ORDER BY {columns[0]}, {columns[1]}",
+                           connection)
+    finally:
+        connection.close()
+
+def nullable(values):
+    return [None if pd.isna(value) else value for value in values]
+
+def test_snapshot_matches_the_database(sample_database, tmp_path):
+    directory = snapshot.export(directory=str(tmp_path / 'snapshot'))
+    view = snapshot.Snapshot(directory)
+    for table, layout in snapshot.TABLES.items():
+        stored = stored_frame(sample_database, table, list(layout))
+        assert view.columns(table) == list(layout)
+        assert view.rows(table) == len(stored)
+        for column, kind in layout.items():
+            values = view.decoded(column, table)
+            if kind == 'dictionary':
+                assert nullable(values) == nullable(stored[column])
+            elif kind.startswith('datetime64'):
+                expected = pd.to_datetime(stored[column]).to_numpy(kind)
+                np.testing.assert_array_equal(values, expected)
+            else:
+                # sunday_midnight_snack_checkin is a VARCHAR column holding '1.0'
+                expected = pd.to_numeric(stored[column])
+                np.testing.assert_array_equal(values, expected if kind == 'float64' else expected.fillna(0))
+
+def test_event_partitions_are_contiguous_slices(sample_database, tmp_path):
+    assert import_csv.import_event_data(SAMPLE, event='Fall Hack')
+    view = snapshot.Snapshot(snapshot.export(directory=str(tmp_path / 'snapshot')))
+    stored = stored_frame(sample_database, 'attendees', ['event_id', 'number'])
+    assert [event['name'] for event in view.events()] == ['HackDavis 2025', 'Fall Hack']
+    for event in view.events():
+        event_id = event['event_id']
+        numbers = stored.loc[stored['event_id'] == event_id, 'number'].to_numpy()
+        assert view.rows('attendees', event_id) == len(numbers)
+        np.testing.assert_array_equal(view.column('number', event_id=event_id), numbers)
+        assert set(view.column('event_id', event_id=event_id)) == {event_id}
+    assert view.rows('attendees', 99) == 0
+
+def test_is_current_until_the_data_changes(sample_database, tmp_path):
+    directory = snapshot.export(directory=str(tmp_path / 'snapshot'))
+    with db.database_connection() as connection:
+        assert snapshot.Snapshot(directory).is_current(connection)
+        cursor = connection.cursor()
+        rollups.rebuild(connection, cursor, 1)
+        cursor.close()
+        assert not snapshot.Snapshot(directory).is_current(connection)
+        snapshot.export(connection, directory)
+        assert snapshot.Snapshot(directory).is_current(connection)
+    assert sorted(os.listdir(tmp_path)) == ['event_analytics.db', 'snapshot']
+
+def test_open_snapshot_skips_missing_and_old_formats(sample_database, tmp_path):
+    assert snapshot.open_snapshot(str(tmp_path / 'missing')) is None
+    directory = snapshot.export(directory=str(tmp_path / 'snapshot'))
+    path = os.path.join(directory, snapshot.MANIFEST)
+    with open(path) as f:
+        manifest = json.load(f)
+    manifest['version'] = snapshot.FORMAT_VERSION - 1
+    with open(path, 'w') as f:
+        json.dump(manifest, f)
+    assert snapshot.open_snapshot(directory) is None
@@ -0,0 +1,81 @@
+import sqlite3
+import numpy as np
+import pandas as pd
+import pytest
+import snapshot
+import timeseries
+from config import SNAPSHOT_CONFIG
+
+def epochs(*stamps):
+    return timeseries.to_epoch([stamp or None for stamp in stamps])
+
+def test_parse_granularity():
+    assert timeseries.parse_granularity('15min') == 900
+    assert timeseries.parse_granularity('h') == 3600
+    assert timeseries.parse_granularity('1w') == 7 * 86400
+    assert timeseries.parse_granularity('90') == timeseries.parse_granularity(90) == 90
+    for value in ('', 'fortnight', '1y', '0h', '-1d'):
+        with pytest.raises(ValueError):
+            timeseries.parse_granularity(value)
+
+def test_to_epoch_keeps_missing_values():
+    values = epochs('1970-01-02 00:00:00', None, 'not a date')
+    assert values.tolist() == [86400, timeseries.NAT, timeseries.NAT]
+    stored = np.array(['1970-01-01T00:01:00', 'NaT'], dtype='datetime64[s]')
+    assert timeseries.to_epoch(stored).tolist() == [60, timeseries.NAT]
+
+def test_bucket_counts_align_and_fill_empty_buckets():
+    stamps = epochs('2025-04-10 09:59:59', '2025-04-10 10:00:00', '2025-04-10 10:59:00',
+                    None, '2025-04-10 12:30:00')
+    starts, counts = timeseries.bucket_counts(stamps, '1h')
+    assert timeseries.to_datetime(starts).astype(str).tolist() == \
+        ['2025-04-10T09:00:00', '2025-04-10T10:00:00', '2025-04-10T11:00:00', '2025-04-10T12:00:00']
+    assert counts.tolist() == [1, 2, 0, 1]
+
+    starts, counts = timeseries.bucket_counts(stamps, '1h', weights=[1, 2, 3, 4, 5])
+    assert counts.tolist() == [1, 5, 0, 5]
+
+def test_bucket_counts_start_end_window():
+    stamps = epochs('2025-04-10 09:00:00', '2025-04-10 10:00:00', '2025-04-10 11:00:00')
+    start, end = epochs('2025-04-10 10:00:00', '2025-04-10 11:00:00')
+    starts, counts = timeseries.bucket_counts(stamps, '1h', start=start, end=end)
+    assert (starts.tolist(), counts.tolist()) == ([start], [1])
+    starts, counts = timeseries.bucket_counts(stamps, '1h', start=end + 1)
+    assert (len(starts), len(counts)) == (0, 0)
+
+def test_rolling_windows():
+    counts = np.array([2, 4, 0, 6])
+    assert timeseries.rolling_sum(counts, 2).tolist() == [2, 6, 4, 6]
+    assert timeseries.rolling_mean(counts, 2).tolist() == [2.0, 3.0, 2.0, 3.0]
+    assert timeseries.rolling_mean(counts, 0).tolist() == counts.tolist()
+    assert timeseries.cumulative(counts).tolist() == [2, 6, 6, 12]
+
+def test_lag_histogram():
+    created = epochs('2025-04-10 10:00:00', '2025-04-10 10:00:00', '2025-04-10 10:00:00',
+                     '2025-04-10 10:00:00', None)
+    completed = epochs('2025-04-10 10:00:30', '2025-04-10 10:02:00', '2025-04-10 09:59:00',
+                       '2025-04-10 12:00:00', '2025-04-10 10:00:00')
+    bins, counts, lags = timeseries.lag_histogram(created, completed, '1min', '5min')
+    assert bins.tolist() == [0, 60, 120, 180, 240, 300]
+    assert counts.tolist() == [2, 0, 1, 0, 0, 1]
+    assert lags.tolist() == [30, 120, -60, 7200]
+
+def test_daily_curve_matches_the_rollup(sample_database, tmp_path, monkeypatch):
+    monkeypatch.setitem(SNAPSHOT_CONFIG, 'directory', str(tmp_path / 'snapshot'))
+    from_database = timeseries.load_timestamps(['ticket_created_date'], 1)
+    snapshot.export()
+    from_snapshot = timeseries.load_timestamps(['ticket_created_date'], 1)
+    # Same timestamps; the snapshot holds them in primary key order
+    np.testing.assert_array_equal(np.sort(from_snapshot['ticket_created_date']),
+                                  np.sort(from_database['ticket_created_date']))
+
+    curve = timeseries.registration_curve(from_database['ticket_created_date'], '1d', window='7d')
+    connection = sqlite3.connect(sample_database)
+    rollup = pd.read_sql("SELECT registration_date, registrations, cumulative FROM rollup_daily_registrations "
+                         "WHERE event_id = 1 ORDER BY registration_date", connection)
+    connection.close()
+    busy = curve[curve['registrations'] > 0]
+    assert busy['date'].dt.strftime('%Y-%m-%d').tolist() == rollup['registration_date'].tolist()
+    assert busy['registrations'].tolist() == rollup['registrations'].tolist()
+    assert busy['cumulative'].tolist() == rollup['cumulative'].tolist()
+    assert len(curve) == (curve['date'].iloc[-1] - curve['date'].iloc[0]).days + 1
@@ -0,0 +1,57 @@
+import sqlite3
+import pandas as pd
+import pytest
+import import_csv
+from conftest import SAMPLE
+
+def test_extract_email_domain():
+    emails = pd.Series(['ada@ucdavis.edu', 'Grace@UCDavis.EDU', 'linus@cs.ucdavis.edu', ' alan@Math.Berkeley.Edu ',
+                        'barbara@gmail.com', 'ken@Mail.Example.co.uk', 'first.last@mit.edu', None])
+    assert import_csv.extract_email_domain(emails).tolist()[:-1] == [
+        'ucdavis.edu', 'ucdavis.edu', 'ucdavis.edu', 'berkeley.edu',
+        'gmail.com', 'mail.example.co.uk', 'mit.edu',
+    ]
+    assert pd.isna(import_csv.extract_email_domain(emails).iloc[-1])
+
+@pytest.mark.parametrize('university, grouping', [
+    ('UC Davis', ('UC Davis', 'Bay Area/Sac')),
+    ('UC Berkeley', ('Other UC Schools', 'Bay Area/Sac')),
+    ('ucla.edu', ('Other UC Schools', 'Other California')),
+    ('sjsu.edu', ('San Jose State', 'Bay Area/Sac')),
+    ('csulb.edu', ('Other CSU Schools', 'Other California')),
+    ('csus.edu', ('Other CSU Schools', 'Other California')),
+    ('Stanford', ('Stanford', 'Bay Area/Sac')),
+    ('mit.edu', ('Other Universities', 'Out-of-State')),
+    ('Non-University', ('General Public', 'General Public')),
+])
+def test_classify_university(university, grouping):
+    assert import_csv.classify_university(university) == grouping
+
+def test_only_unknown_edu_domains_are_collected():
+    domains = {'ucdavis.edu': 'UC Davis'}
+    new_domains = []
+    chunks = [pd.DataFrame({'ticket_email': ['a@UCDavis.edu', 'b@cs.mit.edu', 'c@MIT.EDU', 'd@gmail.com']}),
+              pd.DataFrame({'ticket_email': ['e@mit.edu', 'f@csus.edu']})]
+    chunks = list(import_csv.assign_universities(chunks, domains, new_domains))
+    assert new_domains == ['mit.edu', 'csus.edu']
+    assert domains == {'ucdavis.edu': 'UC Davis', 'mit.edu': 'mit.edu', 'csus.edu': 'csus.edu'}
+    assert chunks[0]['email_domain'].tolist() == ['ucdavis.edu', 'mit.edu', 'mit.edu', 'gmail.com']
+
+def test_import_adds_unknown_edu_domains(sqlite_database, tmp_path):
+    export = pd.read_csv(SAMPLE)
+    export = export[export['Ticket Email'].notna()].head(4)
+    export['Ticket Email'] = ['Ada@CS.UCDavis.EDU', 'grace@physics.mit.edu', 'alan@Mit.Edu', 'linus@Example.COM']
+    path = str(tmp_path / 'export.csv')
+    export.to_csv(path, index=False)
+    assert import_csv.import_event_data(path)
+
+    connection = sqlite3.connect(sqlite_database)
+    stored = connection.execute(
+        "SELECT email_domain, university, school_type, region FROM university_domains "
+        "WHERE email_domain IN ('mit.edu', 'example.com')").fetchall()
+    universities = connection.execute(
+        "SELECT COALESCE(d.university, 'Non-University') FROM attendees a "
+        "LEFT JOIN university_domains d ON d.email_domain = a.email_domain ORDER BY a.number").fetchall()
+    connection.close()
+    assert stored == [('mit.edu', 'mit.edu', 'Other Universities', 'Out-of-State')]
+    assert sorted(university for university, in universities) == ['Non-University', 'UC Davis', 'mit.edu', 'mit.edu']
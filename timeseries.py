@@ -0,0 +1,234 @@
+import os
+import re
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from config import TIMELINE_CONFIG
+
+# Timestamps are int64 seconds since the epoch; NULL/NaT is int64's minimum,
+# which is what a NaT datetime64 holds, so datetime columns convert without a copy
+NAT = np.iinfo(np.int64).min
+
+UNIT_SECONDS = {'s': 1, 'min': 60, 'h': 3600, 'd': 86400, 'w': 7 * 86400}
+
+TIMESERIES_DIR = 'results/timeseries'
+
+def parse_granularity(value):
+    """Seconds in a bucket size like '15min', '1h', '6h', '1d' or '1w' (a plain number is seconds)"""
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    match = re.fullmatch(r'\s*(\d+)?\s*(s|min|h|d|w)?\s*', str(value).lower())
+    if not match or not (match.group(1) or match.group(2)):
+        raise ValueError(f"Unknown granularity '{value}' (expected e.g. 15min, 1h, 1d)")
+    seconds = int(match.group(1) or 1) * UNIT_SECONDS[match.group(2) or 's']
+    if seconds <= 0:
+        raise ValueError(f"Granularity must be positive, got '{value}'")
+    return seconds
+
+def whole_days(granularity):
+    """True if buckets of this size can be built from the daily registration rollup"""
+    return parse_granularity(granularity) % UNIT_SECONDS['d'] == 0
+
+def to_epoch(values):
+    """
+    Convert timestamps to int64 epoch seconds (NAT for missing values)
+
+    datetime64[s] arrays, such as snapshot columns, are reinterpreted in place;
+    anything else (strings, datetime objects, other resolutions) is parsed once.
+    """
+    if isinstance(values, np.ndarray) and values.dtype == 'datetime64[s]':
+        return values.view(np.int64)
+    if not (isinstance(values, (np.ndarray, pd.Series, pd.Index)) and values.dtype.kind == 'M'):
+        values = pd.to_datetime(pd.Series(values), errors='coerce')
+    return np.asarray(values).astype('datetime64[s]').view(np.int64)
+
+def to_datetime(epochs):
+    """int64 epoch seconds back to datetime64[s]"""
+    return np.asarray(epochs, dtype=np.int64).view('datetime64[s]')
+
+def bucket_counts(epochs, granularity, weights=None, start=None, end=None):
+    """
+    Count timestamps per fixed-size bucket
+
+    Buckets are aligned to multiples of the granularity since the epoch (so
+    days start at midnight and hours on the hour) and cover every bucket from
+    the first timestamp to the last, empty ones included.
+
+    Args:
+        epochs (ndarray): int64 epoch seconds, NAT for missing values
+        granularity: Bucket size (see parse_granularity)
+        weights (array): Count each timestamp this many times (e.g. rollup row counts)
+        start, end (int): Only count timestamps in [start, end), epoch seconds
+
+    Returns:
+        tuple: (bucket start times as int64 epoch seconds, counts)
+    """
+    step = parse_granularity(granularity)
+    epochs = np.asarray(epochs, dtype=np.int64)
+    keep = epochs != NAT
+    if start is not None:
+        keep &= epochs >= start
+    if end is not None:
+        keep &= epochs < end
+    epochs = epochs[keep]
+    if not len(epochs):
+        return np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+    buckets = epochs // step
+    first = buckets.min()
+    if weights is None:
+        counts = np.bincount(buckets - first)
+    else:
+        counts = np.bincount(buckets - first, weights=np.asarray(weights)[keep]).round().astype(np.int64)
+    return (np.arange(len(counts), dtype=np.int64) + first) * step, counts
+
+def cumulative(counts):
+    """Running total of bucket counts"""
+    return np.cumsum(counts)
+
+def rolling_sum(counts, window):
+    """Trailing sum over `window` buckets (fewer at the start of the series)"""
+    window = max(int(window), 1)
+    totals = np.concatenate([[0], np.cumsum(counts)])
+    ends = np.arange(1, len(counts) + 1)
+    return totals[ends] - totals[np.maximum(ends - window, 0)]
+
+def rolling_mean(counts, window):
+    """Trailing mean over `window` buckets (over the buckets so far at the start)"""
+    window = max(int(window), 1)
+    sizes = np.minimum(np.arange(1, len(counts) + 1), window)
+    return rolling_sum(counts, window) / sizes
+
+def lag_histogram(start, end, bin_size, max_lag):
+    """
+    Histogram of the time between two timestamps of the same rows
+
+    Rows missing either timestamp are ignored; negative lags count as 0 and
+    lags of max_lag or more fall in the last bin.
+
+    Args:
+        start, end (ndarray): int64 epoch seconds, aligned row for row
+        bin_size: Bin width (see parse_granularity)
+        max_lag: Lag at which the open-ended last bin starts
+
+    Returns:
+        tuple: (bin start in seconds, counts, the lags themselves in seconds)
+    """
+    step = parse_granularity(bin_size)
+    limit = parse_granularity(max_lag)
+    start, end = np.asarray(start, dtype=np.int64), np.asarray(end, dtype=np.int64)
+    both = (start != NAT) & (end != NAT)
+    lags = end[both] - start[both]
+    bins = np.clip(lags, 0, limit) // step
+    counts = np.bincount(bins, minlength=limit // step + 1)
+    return np.arange(len(counts), dtype=np.int64) * step, counts, lags
+
+def registration_curve(epochs, granularity='1d', window=None, weights=None, start=None, end=None):
+    """
+    Registrations per bucket with their running total and trailing average
+
+    Args:
+        epochs (ndarray): Registration times as int64 epoch seconds
+        granularity: Bucket size (see parse_granularity)
+        window: Rolling average span, e.g. '7d' (rounded to whole buckets; none if omitted)
+        weights (array): Registrations per timestamp, when epochs are pre-aggregated
+        start, end (int): Only registrations in [start, end), epoch seconds
+
+    Returns:
+        DataFrame: date, registrations, cumulative and rolling_avg per bucket
+    """
+    starts, counts = bucket_counts(epochs, granularity, weights, start, end)
+    df = pd.DataFrame({
+        'date': to_datetime(starts),
+        'registrations': counts,
+        'cumulative': cumulative(counts),
+    })
+    if window:
+        df['rolling_avg'] = rolling_mean(counts, parse_granularity(window) // parse_granularity(granularity))
+    return df
+
+def load_timestamps(columns, event_id, connection=None):
+    """
+    Read one event's attendees timestamp columns once, as aligned int64 epoch arrays
+
+    Uses the event's slice of the columnar snapshot when it is current (no
+    copy is made), and otherwise reads just these columns of the event's rows
+    from the database.
+
+    Returns:
+        dict: column -> int64 epoch seconds
+    """
+    import snapshot
+    from db import database_connection
+    if connection is None:
+        with database_connection() as connection:
+            return load_timestamps(columns, event_id, connection)
+    current = snapshot.open_snapshot()
+    if current is not None and current.is_current(connection):
+        return {column: to_epoch(current.column(column, event_id=event_id)) for column in columns}
+    df = pd.read_sql(f"SELECT {', '.join(columns)} FROM attendees WHERE event_id = {int(event_id)}", connection)
+    return {column: to_epoch(df[column]) for column in columns}
+
+def main(granularity=None, window=None, start=None, end=None, lag_bin='1min', max_lag='1d',
+         output_dir=TIMESERIES_DIR, event=None):
+    """
+    Print and save an event's registration curve and order completion lags
+
+    Args:
+        granularity: Bucket size. Defaults to TIMELINE_CONFIG['granularity'].
+        window: Rolling average span. Defaults to TIMELINE_CONFIG['window'].
+        start, end (str): Only registrations in [start, end), e.g. '2025-04-10 08:00'
+        lag_bin, max_lag: Lag histogram bin width and last (open-ended) bin
+        output_dir (str): Directory the CSVs are written to
+        event (str): Event to analyse. Defaults to the event with the latest registrations.
+    """
+    import events
+    granularity = granularity or TIMELINE_CONFIG['granularity']
+    window = window or TIMELINE_CONFIG['window']
+    event_id, event_name = events.current_event(event)
+    started = time.perf_counter()
+    stamps = load_timestamps(['ticket_created_date', 'order_created_date', 'order_completed_date'], event_id)
+    loaded = time.perf_counter()
+
+    bounds = to_epoch([start, end])
+    curve = registration_curve(stamps['ticket_created_date'], granularity, window,
+                               start=bounds[0] if start else None, end=bounds[1] if end else None)
+    bins, counts, raw_lags = lag_histogram(stamps['order_created_date'], stamps['order_completed_date'],
+                                           lag_bin, max_lag)
+    lags = pd.DataFrame({'lag_minutes': bins / 60, 'orders': counts})
+    computed = time.perf_counter()
+
+    print(f"📈 {event_name}: {int(curve['registrations'].sum()):,} registrations in {len(curve):,} buckets of {granularity} "
+          f"(loaded in {loaded - started:.2f}s, computed in {computed - loaded:.3f}s)")
+    busiest = curve.nlargest(5, 'registrations')
+    for _, row in busiest.iterrows():
+        print(f"  {row['date']}  {int(row['registrations']):>8,}")
+    if len(raw_lags):
+        p50, p90, p99 = np.percentile(raw_lags, [50, 90, 99]) / 60
+        print(f"⏳ Order completion lag over {len(raw_lags):,} orders: "
+              f"median {p50:.1f} min, p90 {p90:.1f} min, p99 {p99:.1f} min")
+
+    os.makedirs(output_dir, exist_ok=True)
+    curve_path = os.path.join(output_dir, f"registrations_{granularity}.csv")
+    lags_path = os.path.join(output_dir, 'order_lags.csv')
+    curve.to_csv(curve_path, index=False)
+    lags.to_csv(lags_path, index=False)
+    print(f"📁 Saved {curve_path} and {lags_path}")
+    return curve, lags
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Registration time series and order completion lags")
+    parser.add_argument('--granularity', help=f"bucket size, e.g. 15min, 1h, 1d (default {TIMELINE_CONFIG['granularity']})")
+    parser.add_argument('--window', help=f"rolling average span (default {TIMELINE_CONFIG['window']})")
+    parser.add_argument('--from', dest='start', help="first registration time to include, e.g. '2025-04-10 08:00'")
+    parser.add_argument('--to', dest='end', help="registrations before this time only")
+    parser.add_argument('--lag-bin', default='1min', help="lag histogram bin width (default 1min)")
+    parser.add_argument('--max-lag', default='1d', help="lags at or above this share the last bin (default 1d)")
+    parser.add_argument('--output-dir', default=TIMESERIES_DIR)
+    parser.add_argument('--event', help="event to analyse (default: the event with the latest registrations)")
+    args = parser.parse_args()
+    try:
+        main(args.granularity, args.window, args.start, args.end, args.lag_bin, args.max_lag, args.output_dir,
+             args.event)
+    except ValueError as e:
+        parser.error(str(e))